@@ -0,0 +1,64 @@
+"""Add content_hash dedup fingerprint to job_offers
+
+Revision ID: add_offer_content_hash_001
+Revises: create_user_limits_001
+Create Date: 2026-02-05 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_offer_content_hash_001'
+down_revision = 'create_user_limits_001'
+branch_labels = None
+depends_on = None
+
+
+# Même normalisation que SearchService._generate_offer_hash :
+# md5(titre | entreprise | url), titre et entreprise en minuscules avec espaces normalisés
+CONTENT_HASH_SQL = """
+    md5(
+        lower(btrim(regexp_replace(coalesce(job_title, ''), '\\s+', ' ', 'g'))) || '|' ||
+        lower(btrim(regexp_replace(coalesce(company_name, ''), '\\s+', ' ', 'g'))) || '|' ||
+        btrim(coalesce(source_url, ''))
+    )
+"""
+
+
+def upgrade() -> None:
+    # Add content_hash column (NULL for manually created offers)
+    op.add_column('job_offers',
+        sa.Column('content_hash', sa.String(length=32), nullable=True)
+    )
+    
+    # Backfill scraped offers: the oldest row of each fingerprint keeps the hash,
+    # later duplicates stay NULL so that the unique index can be created
+    op.execute(f"""
+        UPDATE job_offers AS j
+        SET content_hash = h.content_hash
+        FROM (
+            SELECT id, content_hash,
+                   row_number() OVER (
+                       PARTITION BY content_hash ORDER BY created_at NULLS LAST, id
+                   ) AS rn
+            FROM (
+                SELECT id, created_at, {CONTENT_HASH_SQL} AS content_hash
+                FROM job_offers
+                WHERE scraped_at IS NOT NULL
+            ) AS s
+        ) AS h
+        WHERE j.id = h.id AND h.rn = 1
+    """)
+    
+    # Unique index used by INSERT ... ON CONFLICT (content_hash) DO NOTHING
+    op.create_index(op.f('ix_job_offers_content_hash'), 'job_offers', ['content_hash'], unique=True)
+
+
+def downgrade() -> None:
+    # Remove index first
+    op.drop_index(op.f('ix_job_offers_content_hash'), table_name='job_offers')
+    
+    # Remove content_hash column
+    op.drop_column('job_offers', 'content_hash')
@@ -0,0 +1,43 @@
+"""Restore user_feed_cache with its (user, profile, offer) unique constraint
+
+La migration 29ca0abe9c64 (autogénérée) a supprimé la table user_feed_cache.
+Le feed personnalisé y écrit ses scores par INSERT ... ON CONFLICT sur
+uq_user_profile_offer_cache : la table est recréée si elle n'existe plus.
+
+Revision ID: restore_user_feed_cache_001
+Revises: add_offer_content_hash_001
+Create Date: 2026-02-06 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'restore_user_feed_cache_001'
+down_revision = 'add_offer_content_hash_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Idempotent : les bases créées avant 29ca0abe9c64 ont encore la table
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS user_feed_cache (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            profile_id UUID NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+            job_offer_id UUID NOT NULL REFERENCES job_offers(id) ON DELETE CASCADE,
+            compatibility_score DOUBLE PRECISION NOT NULL,
+            calculated_at TIMESTAMP NOT NULL DEFAULT now(),
+            expires_at TIMESTAMP NOT NULL,
+            CONSTRAINT uq_user_profile_offer_cache UNIQUE (user_id, profile_id, job_offer_id)
+        )
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS idx_user_feed_cache_user_profile ON user_feed_cache (user_id, profile_id)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_user_feed_cache_expires ON user_feed_cache (expires_at)")
+
+
+def downgrade() -> None:
+    op.drop_index('idx_user_feed_cache_expires', table_name='user_feed_cache')
+    op.drop_index('idx_user_feed_cache_user_profile', table_name='user_feed_cache')
+    op.drop_table('user_feed_cache')
@@ -0,0 +1,34 @@
+"""Restore HNSW index on job_offers.embedding
+
+La migration 9f3e15511125 (autogénérée) a supprimé job_offer_embedding_idx.
+AnalysisService.get_recommendations classe les offres par distance cosinus
+(opérateur <=>) : l'index est recréé avec vector_cosine_ops, sans bloquer les
+écritures (CONCURRENTLY).
+
+Revision ID: restore_offer_hnsw_001
+Revises: restore_user_feed_cache_001
+Create Date: 2026-02-06 10:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'restore_offer_hnsw_001'
+down_revision = 'restore_user_feed_cache_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS job_offer_embedding_idx ON job_offers "
+            "USING hnsw (embedding vector_cosine_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS job_offer_embedding_idx")
@@ -0,0 +1,39 @@
+"""Add partial indexes on rows without embedding (backfill backlog)
+
+Le backfill des embeddings parcourt `embedding IS NULL ORDER BY id` par lots
+et le backlog est compté à chaque exécution : des index partiels ne contenant
+que les lignes à traiter rendent ces requêtes indépendantes de la taille des
+tables (les lignes sortent de l'index dès que leur embedding est écrit).
+
+Revision ID: add_embedding_backlog_idx_001
+Revises: restore_offer_hnsw_001
+Create Date: 2026-02-06 11:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_embedding_backlog_idx_001'
+down_revision = 'restore_offer_hnsw_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_job_offers_embedding_missing "
+            "ON job_offers (id) WHERE embedding IS NULL"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_profiles_embedding_missing "
+            "ON profiles (id) WHERE embedding IS NULL"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_profiles_embedding_missing")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_job_offers_embedding_missing")
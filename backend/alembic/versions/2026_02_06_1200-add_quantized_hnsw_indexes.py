@@ -0,0 +1,63 @@
+"""Add quantized HNSW indexes on job_offers.embedding (halfvec / binary)
+
+Index d'expression sur la colonne embedding existante (pas de nouvelle colonne
+ni de double écriture) : les vecteurs restent stockés en float32 et servent au
+re-classement exact, seuls les index sont quantifiés.
+- job_offer_embedding_half_idx : embedding::halfvec(384), ~2x plus petit
+- job_offer_embedding_bit_idx  : binary_quantize(embedding)::bit(384), ~32x plus petit
+
+Bascule : créer les index, mesurer (scripts/measure_vector_recall.py), passer
+VECTOR_SEARCH_MODE à "half" ou "binary", puis éventuellement supprimer
+job_offer_embedding_idx une fois le mode float abandonné.
+
+halfvec et binary_quantize existent à partir de pgvector 0.7.0 : sur une
+extension plus ancienne, la migration ne crée rien (VECTOR_SEARCH_MODE doit
+alors rester "float").
+
+Revision ID: add_quantized_hnsw_idx_001
+Revises: add_embedding_backlog_idx_001
+Create Date: 2026-02-06 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_quantized_hnsw_idx_001'
+down_revision = 'add_embedding_backlog_idx_001'
+branch_labels = None
+depends_on = None
+
+
+def _pgvector_supports_quantization() -> bool:
+    version = op.get_bind().execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not version:
+        return False
+    parts = tuple(int(part) for part in version.split(".")[:2] if part.isdigit())
+    return parts >= (0, 7)
+
+
+def upgrade() -> None:
+    if not _pgvector_supports_quantization():
+        print("⚠️ pgvector < 0.7.0 : index halfvec / binaire non créés (VECTOR_SEARCH_MODE=float)")
+        return
+    
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS job_offer_embedding_half_idx ON job_offers "
+            "USING hnsw ((embedding::halfvec(384)) halfvec_cosine_ops)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS job_offer_embedding_bit_idx ON job_offers "
+            "USING hnsw ((binary_quantize(embedding)::bit(384)) bit_hamming_ops)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS job_offer_embedding_bit_idx")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS job_offer_embedding_half_idx")
@@ -0,0 +1,65 @@
+"""Add full-text search_vector (FR + EN) on job_offers with GIN index
+
+Remplace les ilike('%mot%') de JobOfferService.search_job_offers et de
+/api/v1/search/offers (parcours séquentiels des colonnes texte) :
+- search_vector : tsvector généré (STORED) à partir du titre (poids A), des
+  compétences requises (B) et de la description (C), en français et en anglais
+- ix_job_offers_search_vector : index GIN, créé sans bloquer les écritures
+
+L'ajout d'une colonne générée réécrit la table (verrou exclusif le temps de
+la réécriture) : à appliquer en période creuse sur une grosse table.
+
+Revision ID: add_offer_search_vector_001
+Revises: add_quantized_hnsw_idx_001
+Create Date: 2026-02-06 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_offer_search_vector_001'
+down_revision = 'add_quantized_hnsw_idx_001'
+branch_labels = None
+depends_on = None
+
+
+def _weighted(column: str, weight: str) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('{config}'::regconfig, coalesce({column}, '')), '{weight}')"
+        for config in ("french", "english")
+    )
+
+
+SEARCH_VECTOR_EXPRESSION = " || ".join([
+    _weighted("job_title", "A"),
+    _weighted("requirements", "B"),
+    _weighted("description", "C"),
+])
+
+
+def upgrade() -> None:
+    op.add_column(
+        'job_offers',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True
+        )
+    )
+    
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_job_offers_search_vector "
+            "ON job_offers USING gin (search_vector)"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_job_offers_search_vector")
+    op.drop_column('job_offers', 'search_vector')
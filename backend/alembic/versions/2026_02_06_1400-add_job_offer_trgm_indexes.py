@@ -0,0 +1,44 @@
+"""Add pg_trgm GIN indexes on job_offers.company_name and job_offers.location
+
+Les filtres entreprise / lieu (veille entreprise, recherche, recommandations)
+sont des « contient » (ILIKE '%valeur%') complétés par la similarité par mots
+(%>) : voir app/core/fuzzy_match.py. Les deux sont servis par un index GIN
+gin_trgm_ops, créé sans bloquer les écritures.
+
+Revision ID: add_trgm_indexes_001
+Revises: add_offer_search_vector_001
+Create Date: 2026-02-06 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_trgm_indexes_001'
+down_revision = 'add_offer_search_vector_001'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_job_offers_company_name_trgm": "company_name",
+    "ix_job_offers_location_trgm": "location",
+}
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES.items():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON job_offers "
+                f"USING gin ({column} gin_trgm_ops)"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
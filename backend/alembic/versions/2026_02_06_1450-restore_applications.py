@@ -0,0 +1,43 @@
+"""Restore the applications table
+
+La migration 29ca0abe9c64 (autogénérée) a supprimé la table applications,
+toujours utilisée par le modèle Application et les routes /applications : la
+table est recréée si elle n'existe plus, avant les index de pagination
+(add_keyset_pagination_idx_001) et par statut (add_hot_path_indexes_001).
+
+Revision ID: restore_applications_001
+Revises: add_trgm_indexes_001
+Create Date: 2026-02-06 14:50:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'restore_applications_001'
+down_revision = 'add_trgm_indexes_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Idempotent : les bases créées avant 29ca0abe9c64 ont encore la table
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS applications (
+            id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+            user_id UUID NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+            job_offer_id UUID REFERENCES job_offers(id) ON DELETE SET NULL,
+            company_name VARCHAR(255) NOT NULL,
+            job_title VARCHAR(255) NOT NULL,
+            email_to VARCHAR(255) NOT NULL,
+            status VARCHAR(50) NOT NULL DEFAULT 'pending',
+            notes TEXT,
+            documents_sent JSONB,
+            applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+            updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('applications')
@@ -0,0 +1,36 @@
+"""Add composite indexes for keyset (cursor) pagination
+
+Les listes (offres, candidatures, documents, /search/offers) sont paginées
+par curseur sur (horodatage de création, id) : voir app/core/pagination.py.
+Chaque index couvre le filtre d'appartenance puis l'ordre de tri, la page
+suivante est une simple lecture d'index à partir du curseur.
+
+Revision ID: add_keyset_pagination_idx_001
+Revises: restore_applications_001
+Create Date: 2026-02-06 15:00:00.000000
+
+"""
+from app.core.migration_helpers import create_indexes_concurrently, drop_indexes_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_keyset_pagination_idx_001'
+down_revision = 'restore_applications_001'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_job_offers_user_created_id": ("job_offers", "user_id, created_at, id"),
+    "ix_job_offers_created_id": ("job_offers", "created_at, id"),
+    "ix_applications_user_applied_id": ("applications", "user_id, applied_at, id"),
+    "ix_generated_documents_user_generated_id": ("generated_documents", "user_id, generated_at, id"),
+}
+
+
+def upgrade() -> None:
+    create_indexes_concurrently(INDEXES)
+
+
+def downgrade() -> None:
+    drop_indexes_concurrently(INDEXES)
@@ -0,0 +1,45 @@
+"""Add hot-path indexes on job_offers and per-user listings (CONCURRENTLY)
+
+- ix_job_offers_source_url : dédoublonnage à l'ingestion (source_url = ...)
+- ix_job_offers_scraped_at : feed (get_feed), veille entreprise
+  (get_company_offers), nettoyage (cleanup_old_job_offers)
+- ix_applications_user_status_applied_id : candidatures filtrées par statut
+  (get_user_applications(status=...)) et comptes par statut
+  (get_applications_stats)
+
+Requêtes par utilisateur déjà couvertes, aucun index supplémentaire :
+- job_offers (liste, comptes, recherche de get_user_job_offers /
+  search_job_offers / count_user_job_offers) : ix_job_offers_user_created_id
+- applications sans filtre de statut (liste, total) :
+  ix_applications_user_applied_id (add_keyset_pagination_idx_001)
+
+Vérification des plans : python test_query_plans.py
+
+Revision ID: add_hot_path_indexes_001
+Revises: add_keyset_pagination_idx_001
+Create Date: 2026-02-06 16:00:00.000000
+
+"""
+from app.core.migration_helpers import create_indexes_concurrently, drop_indexes_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_hot_path_indexes_001'
+down_revision = 'add_keyset_pagination_idx_001'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = {
+    "ix_job_offers_source_url": ("job_offers", "source_url"),
+    "ix_job_offers_scraped_at": ("job_offers", "scraped_at"),
+    "ix_applications_user_status_applied_id": ("applications", "user_id, status, applied_at, id"),
+}
+
+
+def upgrade() -> None:
+    create_indexes_concurrently(INDEXES)
+
+
+def downgrade() -> None:
+    drop_indexes_concurrently(INDEXES)
@@ -0,0 +1,196 @@
+"""Partition job_offers by month of scraped_at
+
+job_offers devient une table partitionnée RANGE (scraped_at) :
+- job_offers_pAAAA_MM : une partition par mois (bornes UTC), du mois de la
+  plus ancienne offre jusqu'à JOB_OFFER_PARTITIONS_AHEAD mois à l'avance ;
+  les suivantes sont créées par la tâche de nettoyage quotidienne
+- job_offers_default : offres sans scraped_at (saisies manuellement) et
+  offres conservées par la rétention (référencées par une candidature ou un
+  document)
+
+Contraintes PostgreSQL d'une table partitionnée :
+- pas de clé primaire ni d'index unique sans scraped_at : id est indexé
+  (ix_job_offers_id), l'unicité de content_hash passe dans la nouvelle
+  table job_offer_fingerprints
+- pas de clé étrangère vers job_offers : celles de applications,
+  generated_documents et user_feed_cache sont supprimées (relations gérées
+  par l'ORM, lignes liées nettoyées par la rétention)
+
+⚠️ Migration bloquante : la table est recopiée sous verrou exclusif, à
+lancer pendant une fenêtre de maintenance.
+
+Revision ID: partition_job_offers_001
+Revises: add_hot_path_indexes_001
+Create Date: 2026-02-06 17:00:00.000000
+
+"""
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import settings
+from app.core.migration_helpers import table_exists
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_job_offers_001'
+down_revision = 'add_hot_path_indexes_001'
+branch_labels = None
+depends_on = None
+
+
+REFERENCING = ("applications", "generated_documents", "user_feed_cache")
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _copied_columns(table: str) -> str:
+    """Colonnes à recopier (les colonnes générées, ex. search_vector, sont recalculées)"""
+    rows = op.get_bind().execute(
+        sa.text("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = :table AND is_generated = 'NEVER'
+            ORDER BY ordinal_position
+        """),
+        {"table": table}
+    )
+    return ", ".join(f'"{row[0]}"' for row in rows)
+
+
+def _index_definitions(table: str):
+    """CREATE INDEX des index de la table, hors clé primaire et contraintes uniques"""
+    rows = op.get_bind().execute(
+        sa.text("""
+            SELECT i.indexname, i.indexdef FROM pg_indexes i
+            WHERE i.schemaname = current_schema() AND i.tablename = :table
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint c
+                  WHERE c.conname = i.indexname AND c.contype IN ('p', 'u')
+              )
+        """),
+        {"table": table}
+    )
+    return rows.fetchall()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    
+    # 1. Unicité de content_hash portée par job_offer_fingerprints
+    op.create_table(
+        'job_offer_fingerprints',
+        sa.Column('content_hash', sa.String(length=32), nullable=False),
+        sa.Column('job_offer_id', sa.UUID(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('content_hash'),
+    )
+    op.create_index('ix_job_offer_fingerprints_job_offer_id', 'job_offer_fingerprints', ['job_offer_id'])
+    op.execute("""
+        INSERT INTO job_offer_fingerprints (content_hash, job_offer_id)
+        SELECT DISTINCT ON (content_hash) content_hash, id FROM job_offers
+        WHERE content_hash IS NOT NULL
+        ORDER BY content_hash, created_at
+    """)
+    
+    # 2. Clés étrangères vers job_offers (impossibles vers une table partitionnée)
+    op.execute("""
+        DO $$
+        DECLARE fk record;
+        BEGIN
+            FOR fk IN
+                SELECT conrelid::regclass AS tbl, conname FROM pg_constraint
+                WHERE contype = 'f' AND confrelid = 'job_offers'::regclass
+            LOOP
+                EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', fk.tbl, fk.conname);
+            END LOOP;
+        END $$;
+    """)
+    
+    # 3. Nouvelle table partitionnée, même structure
+    indexes = _index_definitions("job_offers")
+    op.execute("ALTER TABLE job_offers RENAME TO job_offers_legacy")
+    for name, _ in indexes:
+        op.execute(f'ALTER INDEX "{name}" RENAME TO "{name}_legacy"')
+    op.execute("""
+        CREATE TABLE job_offers (
+            LIKE job_offers_legacy INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE
+        ) PARTITION BY RANGE (scraped_at)
+    """)
+    op.execute("CREATE TABLE job_offers_default PARTITION OF job_offers DEFAULT")
+    
+    oldest = bind.execute(sa.text(
+        "SELECT date_trunc('month', min(scraped_at) AT TIME ZONE 'UTC')::date FROM job_offers_legacy"
+    )).scalar()
+    current = date.today().replace(day=1)
+    month = min(oldest, _add_months(current, -1)) if oldest else _add_months(current, -1)
+    last = _add_months(current, settings.JOB_OFFER_PARTITIONS_AHEAD)
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE job_offers_p{month:%Y_%m} PARTITION OF job_offers "
+            f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') TO ('{following.isoformat()} 00:00:00+00')"
+        )
+        month = following
+    
+    # 4. Recopie puis suppression de l'ancienne table
+    columns = _copied_columns("job_offers_legacy")
+    op.execute(f"INSERT INTO job_offers ({columns}) SELECT {columns} FROM job_offers_legacy")
+    op.execute("DROP TABLE job_offers_legacy")
+    
+    # 5. Index (propagés à chaque partition) et clé étrangère vers users
+    for name, definition in indexes:
+        op.execute(definition.replace("CREATE UNIQUE INDEX", "CREATE INDEX"))
+    op.create_index('ix_job_offers_id', 'job_offers', ['id'])
+    op.create_foreign_key(
+        'job_offers_user_id_fkey', 'job_offers', 'users', ['user_id'], ['id'], ondelete='CASCADE'
+    )
+    op.execute("ANALYZE job_offers")
+
+
+def downgrade() -> None:
+    indexes = _index_definitions("job_offers")
+    op.execute("ALTER TABLE job_offers RENAME TO job_offers_partitioned")
+    for name, _ in indexes:
+        op.execute(f'ALTER INDEX "{name}" RENAME TO "{name}_partitioned"')
+    op.execute("""
+        CREATE TABLE job_offers (
+            LIKE job_offers_partitioned INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING STORAGE
+        )
+    """)
+    columns = _copied_columns("job_offers_partitioned")
+    op.execute(f"INSERT INTO job_offers ({columns}) SELECT {columns} FROM job_offers_partitioned")
+    op.execute("DROP TABLE job_offers_partitioned CASCADE")
+    
+    # Les offres conservées peuvent partager une empreinte : seule la plus ancienne reste unique
+    op.execute("""
+        UPDATE job_offers o SET content_hash = NULL
+        FROM job_offers d
+        WHERE d.content_hash = o.content_hash AND d.created_at < o.created_at
+    """)
+    for name, definition in indexes:
+        # pg_indexes décrit les index d'une table partitionnée avec "ON ONLY"
+        definition = definition.replace(" ON ONLY ", " ON ")
+        if name == "ix_job_offers_content_hash":
+            definition = definition.replace("CREATE INDEX", "CREATE UNIQUE INDEX")
+        if name != "ix_job_offers_id":
+            op.execute(definition)
+    op.execute("ALTER TABLE job_offers ADD PRIMARY KEY (id)")
+    op.create_foreign_key(
+        'job_offers_user_id_fkey', 'job_offers', 'users', ['user_id'], ['id'], ondelete='CASCADE'
+    )
+    
+    # Clés étrangères restaurées sans revalider l'existant (offres supprimées entre-temps)
+    for table in REFERENCING:
+        if table_exists(table):
+            on_delete = "SET NULL" if table == "applications" else "CASCADE"
+            op.execute(
+                f"ALTER TABLE {table} ADD CONSTRAINT {table}_job_offer_id_fkey FOREIGN KEY (job_offer_id) "
+                f"REFERENCES job_offers (id) ON DELETE {on_delete} NOT VALID"
+            )
+    
+    op.drop_index('ix_job_offer_fingerprints_job_offer_id', table_name='job_offer_fingerprints')
+    op.drop_table('job_offer_fingerprints')
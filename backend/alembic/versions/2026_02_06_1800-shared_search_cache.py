@@ -0,0 +1,36 @@
+"""Share search_results_cache entries across users (one entry per query and source)
+
+Les entrées ne dépendent plus de l'utilisateur ni des filtres : clé =
+md5(mots-clés | localisation | source | limite). user_id devient facultatif
+(NULL pour les entrées partagées) et la source de l'entrée est enregistrée.
+
+Les anciennes entrées (une par utilisateur et par jeu de filtres) ne sont plus
+jamais lues : elles sont supprimées.
+
+Revision ID: shared_search_cache_001
+Revises: partition_job_offers_001
+Create Date: 2026-02-06 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'shared_search_cache_001'
+down_revision = 'partition_job_offers_001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("DELETE FROM search_results_cache")
+    op.alter_column('search_results_cache', 'user_id', existing_type=sa.UUID(), nullable=True)
+    op.add_column('search_results_cache', sa.Column('source', sa.String(length=100), nullable=True))
+
+
+def downgrade() -> None:
+    # Les entrées partagées n'ont pas d'utilisateur
+    op.execute("DELETE FROM search_results_cache WHERE user_id IS NULL")
+    op.drop_column('search_results_cache', 'source')
+    op.alter_column('search_results_cache', 'user_id', existing_type=sa.UUID(), nullable=False)
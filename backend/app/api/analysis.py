@@ -5,7 +5,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 from app.database import get_db
@@ -86,14 +86,19 @@ async def analyze_job_compatibility(
 @router.get("/recommendations", response_model=List[JobRecommendation])
 async def get_job_recommendations(
     limit: int = Query(10, ge=1, le=50, description="Nombre de recommandations"),
+    max_age_days: Optional[int] = Query(None, ge=1, le=365, description="Âge maximum des offres en jours"),
+    location: Optional[str] = Query(None, description="Filtre localisation (sous-chaîne)"),
+    job_type: Optional[str] = Query(None, description="Filtre type de contrat (CDI, CDD, Stage...)"),
+    work_mode: Optional[str] = Query(None, description="Filtre mode de travail (remote, hybrid, onsite)"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     Recommande les offres d'emploi les plus compatibles avec le profil de l'utilisateur
     
-    Utilise la recherche vectorielle pgvector pour trouver les offres
-    dont l'embedding est le plus proche de celui du profil.
+    Utilise la recherche vectorielle pgvector (index HNSW) pour trouver les offres
+    dont l'embedding est le plus proche de celui du profil, parmi les offres
+    correspondant aux filtres (récence, localisation, type de contrat, mode de travail).
     
     Les offres sont triées par score de compatibilité décroissant.
     """
@@ -120,7 +125,12 @@ async def get_job_recommendations(
     recommendations = await AnalysisService.get_recommendations(
         db=db,
         profile_id=profile.id,
-        limit=limit
+        user_id=current_user.id,
+        limit=limit,
+        max_age_days=max_age_days,
+        location=location,
+        job_type=job_type,
+        work_mode=work_mode
     )
     
     return recommendations
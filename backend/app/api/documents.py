@@ -1,12 +1,12 @@
 """
 Routes API pour la génération de documents (CV, Lettres)
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.responses import FileResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import os
 
@@ -22,6 +22,7 @@ from app.schemas.document import (
 )
 from app.services.ai_service import ai_service
 from app.services.document_service import DocumentService
+from app.core.pagination import set_page_headers
 from app.api.auth import get_current_user
 
 
@@ -131,25 +132,33 @@ async def generate_document(
 
 @router.get("/", response_model=List[DocumentResponse])
 async def list_documents(
+    response: Response,
     document_type: str = None,
-    limit: int = 50,
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
-    Liste les documents générés par l'utilisateur
+    Liste les documents générés par l'utilisateur (plus récents d'abord)
     
     Query params:
     - document_type: Filtre par type ("resume" ou "cover_letter")
     - limit: Nombre maximum de résultats
+    - cursor: Curseur de la page suivante (en-tête X-Next-Cursor de la page précédente)
+    - include_total: Ajouter le total estimé (en-tête X-Total-Estimate)
     """
-    documents = await DocumentService.list_user_documents(
+    page = await DocumentService.list_user_documents(
         db=db,
         user_id=current_user.id,
         document_type=document_type,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total
     )
-    return documents
+    set_page_headers(response, page)
+    return page.items
 
 
 @router.get("/stats", response_model=DocumentStatsResponse)
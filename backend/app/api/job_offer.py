@@ -1,7 +1,7 @@
 """
 Routes API pour les offres d'emploi
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from uuid import UUID
@@ -18,6 +18,7 @@ from app.schemas.job_offer import (
 from app.services.job_offer_service import JobOfferService
 from app.services.limit_service import LimitService
 from app.core.dependencies import get_current_user
+from app.core.pagination import set_page_headers
 
 
 router = APIRouter(prefix="/api/v1/jobs", tags=["Job Offers"])
@@ -25,19 +26,23 @@ router = APIRouter(prefix="/api/v1/jobs", tags=["Job Offers"])
 
 @router.get("", response_model=List[JobOfferResponse])
 async def get_user_job_offers(
+    response: Response,
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante (en-tête X-Next-Cursor)"),
+    include_total: bool = Query(False, description="Ajouter le total estimé (en-tête X-Total-Estimate)"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Récupérer toutes les offres d'emploi de l'utilisateur connecté"""
-    offers = await JobOfferService.get_user_job_offers(
+    """Récupérer les offres d'emploi de l'utilisateur connecté (plus récentes d'abord)"""
+    page = await JobOfferService.get_user_job_offers(
         db, 
         user_id=current_user.id,
         limit=limit,
-        offset=offset
+        cursor=cursor,
+        include_total=include_total
     )
-    return offers
+    set_page_headers(response, page)
+    return page.items
 
 
 @router.post("", response_model=JobOfferResponse, status_code=status.HTTP_201_CREATED)
@@ -13,6 +13,11 @@ from app.models.user import User
 from app.models.user_limits import UserLimits
 from app.api.dependencies.admin import require_admin
 from app.services.limit_service import LimitService
+from app.services.scraping_service import scraping_service
+from app.services.embedding_executor import embedding_executor
+from app.services.embedding_cache import embedding_cache
+from app.services.embedding_backfill import embedding_backfill
+from app.services.search_cache_service import search_cache_service
 from app.schemas.admin import (
     UserListResponse,
     UserDetailResponse,
@@ -293,3 +298,25 @@ async def get_admin_stats(
         "users_near_limit": users_near_limit,  # Temporairement vide
         "registrations_last_7_days": registrations_last_7_days
     }
+
+
+@router.get("/performance", response_model=dict)
+async def get_performance_metrics(
+    current_admin: User = Depends(require_admin),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Métriques de performance du processus API courant
+    (connexions HTTP des scrapers, réutilisation keep-alive, cache DNS,
+    micro-batching et cache des embeddings, niveaux du cache de recherche)
+    et backlog des embeddings restant à générer (file "embeddings").
+    """
+    return {
+        "scraping": scraping_service.get_metrics(),
+        "search_cache": search_cache_service.get_metrics(),
+        "embeddings": {
+            "executor": embedding_executor.get_metrics(),
+            "cache": embedding_cache.get_metrics(),
+            "backlog": await embedding_backfill.backlog(db)
+        }
+    }
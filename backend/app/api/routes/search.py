@@ -3,14 +3,17 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from datetime import datetime
-from sqlalchemy import select, and_, or_, func
+from sqlalchemy import select, and_
 
 from app.database import get_db
 from app.core.dependencies import get_current_user
+from app.core.fuzzy_match import fuzzy_match
+from app.core.pagination import InvalidCursor, build_page, estimate_count, keyset_paginate
 from app.models.user import User
 from app.models.job_offer import JobOffer
 from app.schemas.search import SearchRequest, SearchResponse, FeedResponse, OfferResponse
 from app.services.search_service import search_service
+from app.services.job_offer_service import JobOfferService
 from app.services.limit_service import LimitService
 
 router = APIRouter(prefix="/search", tags=["search"])
@@ -61,9 +64,10 @@ async def search_with_scraping(
         return SearchResponse(
             success=result["success"], offers=formatted_offers, count=result["count"],
             scraped_count=result.get("scraped_count"), deduplicated_count=result.get("deduplicated_count"),
-            saved_count=result.get("saved_count"), 
+            saved_count=result.get("saved_count"), skipped_count=result.get("skipped_count"),
             platforms_scraped=result.get("platforms_scraped"),  # Deprecated
             sources_used=result.get("sources_used"),  # New multi-source field
+            timed_out_sources=result.get("timed_out_sources"),  # Sources hors délai
             cached=result.get("cached", False),  # Cache indicator
             search_params=result.get("search_params"), scraped_at=result.get("scraped_at"),
             duration_seconds=result.get("duration_seconds"),
@@ -105,42 +109,50 @@ async def get_personalized_feed(
 async def list_offers(
     keywords: Optional[str] = None, location: Optional[str] = None,
     job_type: Optional[str] = None, work_mode: Optional[str] = None,
-    page: int = Query(1, ge=1), per_page: int = Query(20, ge=1, le=100),
+    per_page: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante (next_cursor)"),
+    include_total: bool = Query(False, description="Ajouter le total estimé (total_estimate)"),
     db: AsyncSession = Depends(get_db), current_user: User = Depends(get_current_user)
 ):
-    """Liste des offres sauvegardées avec filtres"""
+    """
+    Liste des offres sauvegardées avec filtres, pagination par curseur
+    
+    Sans mots-clés : plus récentes d'abord. Avec mots-clés : recherche plein
+    texte classée par pertinence (ts_rank), puis par date.
+    """
     try:
-        query = select(JobOffer)
         filters = []
+        sort_keys = [JobOffer.created_at, JobOffer.id]
         if keywords:
-            filters.append(or_(JobOffer.title.ilike(f"%{keywords}%"), JobOffer.description.ilike(f"%{keywords}%")))
+            keyword_filter, rank = JobOfferService.full_text_filter(keywords)
+            filters.append(keyword_filter)
+            sort_keys.insert(0, rank)
         if location:
-            filters.append(JobOffer.location.ilike(f"%{location}%"))
+            filters.append(fuzzy_match(JobOffer.location, location))
         if job_type:
             filters.append(JobOffer.job_type == job_type)
         if work_mode:
             filters.append(JobOffer.work_mode == work_mode)
+        
+        query = select(JobOffer, *sort_keys)
         if filters:
             query = query.where(and_(*filters))
         
-        offset = (page - 1) * per_page
-        query = query.offset(offset).limit(per_page).order_by(JobOffer.created_at.desc())
-        result = await db.execute(query)
-        offers = result.scalars().all()
-        
-        count_query = select(func.count(JobOffer.id))
-        if filters:
-            count_query = count_query.where(and_(*filters))
-        total = (await db.execute(count_query)).scalar()
+        result = await db.execute(keyset_paginate(query, sort_keys, cursor, per_page))
+        page = build_page(result.all(), per_page, lambda row: list(row[1:]))
+        total = await estimate_count(db, select(JobOffer.id).where(*filters)) if include_total else None
         
         formatted_offers = [OfferResponse(
-            id=str(o.id), title=o.job_title, company=o.company_name, location=o.location,
-            description=(o.description or "")[:500], url=o.source_url or "",
-            source_platform=o.source_platform or "unknown", job_type=o.job_type,
-            work_mode=o.work_mode, scraped_at=o.scraped_at.isoformat() if o.scraped_at else None
-        ) for o in offers]
+            id=str(o.id), job_title=o.job_title, company_name=o.company_name or "",
+            location=o.location or "", description=(o.description or "")[:500],
+            source_url=o.source_url or "", source_platform=o.source_platform or "unknown",
+            job_type=o.job_type, work_mode=o.work_mode,
+            scraped_at=o.scraped_at.isoformat() if o.scraped_at else None
+        ) for o, *_ in page.items]
         
         return SearchResponse(success=True, offers=formatted_offers, count=len(formatted_offers),
-                            message=f"Page {page}/{(total + per_page - 1) // per_page}, Total: {total}")
+                            next_cursor=page.next_cursor, total_estimate=total)
+    except InvalidCursor:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Erreur: {str(e)}")
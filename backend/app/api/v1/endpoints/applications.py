@@ -2,11 +2,12 @@
 Applications API endpoints
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.dependencies import get_db, get_current_user
+from app.core.pagination import set_page_headers
 from app.models.user import User
 from app.models.application import ApplicationStatus
 from app.schemas.application import (
@@ -58,21 +59,25 @@ async def create_application(
 
 @router.get("/", response_model=List[ApplicationResponse])
 async def get_applications(
+    response: Response,
     status: Optional[ApplicationStatus] = None,
-    skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante (en-tête X-Next-Cursor)"),
+    include_total: bool = Query(False, description="Ajouter le total estimé (en-tête X-Total-Estimate)"),
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Récupérer toutes les candidatures"""
-    applications = await ApplicationService.get_user_applications(
+    """Récupérer les candidatures (plus récentes d'abord)"""
+    page = await ApplicationService.get_user_applications(
         db=db,
         user_id=current_user.id,
         status=status,
-        skip=skip,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        include_total=include_total
     )
-    return applications
+    set_page_headers(response, page)
+    return page.items
 
 
 @router.get("/stats", response_model=ApplicationStats)
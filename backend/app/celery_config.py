@@ -5,9 +5,18 @@ Celery est utilisé pour :
 - Scraping périodique des entreprises surveillées
 - Scraping des sources custom
 - Génération asynchrone de documents
+- Inférence des embeddings (file dédiée "embeddings", modèle préchargé)
+- Purges par lots des lignes expirées (file "maintenance")
 """
+import asyncio
+import gc
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown
+from celery.utils.log import get_task_logger
 from app.config import settings
 
 # Créer l'application Celery
@@ -17,6 +26,8 @@ celery_app = Celery(
     backend=settings.CELERY_RESULT_BACKEND,
     include=[
         'app.tasks.scraping_tasks',
+        'app.tasks.embedding_tasks',
+        'app.tasks.maintenance_tasks',
     ]
 )
 
@@ -43,6 +54,8 @@ celery_app.conf.update(
     task_routes={
         'app.tasks.scraping_tasks.*': {'queue': 'scraping'},
         'app.tasks.generation_tasks.*': {'queue': 'generation'},
+        'app.tasks.embedding_tasks.*': {'queue': 'embeddings'},
+        'app.tasks.maintenance_tasks.*': {'queue': 'maintenance'},
     },
     
     # Retry policy
@@ -66,12 +79,47 @@ celery_app.conf.beat_schedule = {
         'options': {'queue': 'scraping'}
     },
     
-    # Nettoyage des vieilles offres (tous les jours à 3h du matin)
+    # Nettoyage des vieilles offres : partitions à venir + rétention (tous les jours à 3h du matin)
     'cleanup-old-offers': {
         'task': 'app.tasks.scraping_tasks.cleanup_old_job_offers',
         'schedule': crontab(minute=0, hour=3),  # Tous les jours à 3h
         'options': {'queue': 'scraping'}
     },
+    
+    # Rafraîchissement du snapshot du flux RemoteOK (requête conditionnelle)
+    'refresh-remoteok-snapshot': {
+        'task': 'app.tasks.scraping_tasks.refresh_remoteok_snapshot',
+        'schedule': settings.REMOTEOK_SNAPSHOT_REFRESH_MINUTES * 60,  # secondes
+        'options': {'queue': 'scraping'}
+    },
+    
+    # Rattrapage des embeddings manquants (offres puis profils)
+    'backfill-embeddings-job-offers': {
+        'task': 'app.tasks.embedding_tasks.backfill_embeddings',
+        'schedule': settings.EMBEDDING_BACKFILL_INTERVAL_MINUTES * 60,  # secondes
+        'kwargs': {'table': 'job_offers'},
+        'options': {'queue': 'embeddings'}
+    },
+    'backfill-embeddings-profiles': {
+        'task': 'app.tasks.embedding_tasks.backfill_embeddings',
+        'schedule': settings.EMBEDDING_BACKFILL_INTERVAL_MINUTES * 60,  # secondes
+        'kwargs': {'table': 'profiles'},
+        'options': {'queue': 'embeddings'}
+    },
+    
+    # Purges par lots des caches expirés
+    'purge-search-results-cache': {
+        'task': 'app.tasks.maintenance_tasks.purge_expired',
+        'schedule': settings.PURGE_INTERVAL_MINUTES * 60,  # secondes
+        'kwargs': {'job': 'search_results_cache'},
+        'options': {'queue': 'maintenance'}
+    },
+    'purge-user-feed-cache': {
+        'task': 'app.tasks.maintenance_tasks.purge_expired',
+        'schedule': settings.PURGE_INTERVAL_MINUTES * 60,  # secondes
+        'kwargs': {'job': 'user_feed_cache'},
+        'options': {'queue': 'maintenance'}
+    },
 }
 
 # Logging
@@ -80,3 +128,125 @@ celery_app.conf.update(
     worker_log_format='[%(asctime)s: %(levelname)s/%(processName)s] %(message)s',
     worker_task_log_format='[%(asctime)s: %(levelname)s/%(processName)s] [%(task_name)s(%(task_id)s)] %(message)s',
 )
+
+
+# ===================================
+# CYCLE DE VIE DES PROCESSUS WORKER
+# ===================================
+# Chaque processus worker garde une boucle asyncio persistante : les ressources
+# liées à une boucle (session HTTP partagée des scrapers, pool asyncpg) sont
+# ainsi réutilisées d'une tâche à l'autre au lieu d'être recréées à chaque
+# asyncio.run().
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_worker_loop() -> asyncio.AbstractEventLoop:
+    """Retourne la boucle asyncio persistante du processus courant"""
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop
+
+
+def run_async(coro):
+    """Exécute une coroutine sur la boucle persistante du worker (remplace asyncio.run)"""
+    return get_worker_loop().run_until_complete(coro)
+
+
+def run_resumable_batches(
+    task,
+    checkpoints,
+    name: str,
+    lock_ttl: int,
+    run_batches: Callable[[], Awaitable[Dict]],
+    requeue_kwargs: Dict
+) -> Optional[Dict]:
+    """
+    Corps commun des tâches par lots reprenables (backfill des embeddings, purges)
+    
+    Sous le verrou `name` (checkpoints : BatchCheckpoints), run_batches() traite
+    au plus max_batches lots depuis le checkpoint et retourne ses stats avec
+    "done". En cas d'erreur la tâche est rejouée ; si le traitement n'est pas
+    terminé, elle se remet en file avec requeue_kwargs : les exécutions restent
+    courtes et un worker arrêté reprend au dernier lot validé.
+    
+    Returns:
+        Stats de run_batches (+ started_at, completed_at), None si un passage
+        est déjà en cours
+    """
+    logger = get_task_logger(task.name)
+    
+    async def _run():
+        token = await checkpoints.acquire_lock(name, ttl=lock_ttl)
+        if token is None:
+            return None
+        started_at = datetime.now().isoformat()
+        try:
+            stats = await run_batches()
+        finally:
+            await checkpoints.release_lock(name, token)
+        stats["started_at"] = started_at
+        stats["completed_at"] = datetime.now().isoformat()
+        return stats
+    
+    try:
+        stats = run_async(_run())
+    except Exception as e:
+        logger.error(f"❌ Erreur {name}: {str(e)}")
+        raise task.retry(exc=e)
+    
+    if stats is None:
+        logger.info(f"⏭️  {name} déjà en cours")
+    elif not stats["done"]:
+        # Lots suivants dans une nouvelle exécution (reprend au checkpoint)
+        task.apply_async(kwargs=requeue_kwargs)
+    return stats
+
+
+@worker_init.connect
+def init_worker(**kwargs):
+    """
+    Processus principal du worker, avant le fork des processus enfants
+    
+    En EMBEDDING_MODE=eager, le modèle est chargé une seule fois ici : les
+    enfants (prefork) partagent ses pages mémoire en copy-on-write au lieu de
+    charger chacun leur copie. gc.freeze() évite que le ramasse-miettes des
+    enfants ne touche (et donc ne copie) les objets hérités.
+    
+    EMBEDDING_MODE=remote est réservé à l'API : les tâches encodent localement.
+    """
+    from app.services.embedding_service import EmbeddingService
+    EmbeddingService.use_local_inference()
+    
+    if settings.EMBEDDING_MODE == "eager":
+        EmbeddingService.preload(warmup=False)
+        gc.freeze()
+
+
+@worker_process_init.connect
+def init_worker_process(**kwargs):
+    """Démarrage d'un processus worker : ouvre les ressources partagées"""
+    from app.services.scraping_service import scraping_service
+    from app.services.search_cache_service import search_cache_service
+    run_async(scraping_service.startup())
+    # Cache de recherche sans LRU local (invalidations non écoutées entre deux tâches),
+    # report des hits de search_with_scraping
+    run_async(search_cache_service.startup(local_cache=False))
+    
+    if settings.EMBEDDING_MODE == "eager":
+        from app.services.embedding_service import EmbeddingService
+        EmbeddingService.preload(warmup=True)
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_process(**kwargs):
+    """Arrêt d'un processus worker : ferme proprement les ressources partagées"""
+    from app.services.scraping_service import scraping_service
+    from app.services.search_cache_service import search_cache_service
+    loop = get_worker_loop()
+    try:
+        loop.run_until_complete(search_cache_service.shutdown())
+        loop.run_until_complete(scraping_service.shutdown())
+    finally:
+        loop.close()
@@ -42,9 +42,89 @@ class Settings(BaseSettings):
     MAX_UPLOAD_SIZE: int = 10 * 1024 * 1024  # 10 MB
     
     # Scraping
-    SCRAPING_TIMEOUT: int = 30  # secondes
+    SCRAPING_TIMEOUT: int = 30  # secondes (deadline par source)
+    SCRAPING_TOTAL_TIMEOUT: int = 60  # secondes (deadline globale d'une recherche multi-sources)
+    SCRAPING_MAX_CONCURRENCY: int = 4  # nombre max de sources scrapées en parallèle
     USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     
+    # Client HTTP partagé (scrapers API)
+    HTTP_POOL_LIMIT: int = 100  # connexions simultanées max (toutes plateformes)
+    HTTP_POOL_LIMIT_PER_HOST: int = 10  # connexions simultanées max par hôte
+    HTTP_DNS_CACHE_TTL: int = 300  # secondes
+    HTTP_KEEPALIVE_TIMEOUT: int = 30  # secondes
+    
+    # Rate limiting distribué par plateforme (limites dans platforms_config/platforms.py)
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_MAX_WAIT: float = 20.0  # secondes d'attente max d'un jeton avant abandon
+    
+    # Single-flight : une seule exécution des scrapings identiques simultanés
+    SINGLE_FLIGHT_ENABLED: bool = True
+    SINGLE_FLIGHT_LOCK_TTL: int = 90  # secondes (bail du leader, > SCRAPING_TOTAL_TIMEOUT)
+    SINGLE_FLIGHT_RESULT_TTL: int = 30  # secondes de conservation du résultat partagé
+    
+    # Snapshot du flux RemoteOK (recherche locale, rafraîchi par Celery Beat)
+    REMOTEOK_SNAPSHOT_MAX_AGE: int = 1800  # secondes avant rafraîchissement à la demande
+    REMOTEOK_SNAPSHOT_REFRESH_MINUTES: int = 10  # période du rafraîchissement en tâche de fond
+    
+    # Cycle de vie du modèle d'embeddings
+    # - "local"  : chargé à la première utilisation dans ce processus
+    # - "eager"  : chargé + warm-up au démarrage (API : /health prêt après warm-up ;
+    #              Celery : chargé avant fork, partagé copy-on-write)
+    # - "remote" : API uniquement, l'inférence est déléguée à la file Celery "embeddings"
+    #              (dans un worker Celery, où result.get() est interdit, elle reste locale)
+    EMBEDDING_MODE: str = "local"
+    EMBEDDING_REMOTE_TIMEOUT: int = 30  # secondes d'attente max d'un encodage délégué
+    
+    # Backend d'inférence des embeddings (voir services/embedding_backends.py)
+    EMBEDDING_BACKEND: str = "torch"  # "torch" (SentenceTransformer) ou "onnx" (ONNX Runtime, CPU)
+    EMBEDDING_ONNX_DIR: str = "/app/storage/models/all-MiniLM-L6-v2-onnx"  # sortie de scripts/export_onnx_model.py
+    EMBEDDING_ONNX_QUANTIZED: bool = True  # graphe int8 (quantification dynamique) plutôt que fp32
+    EMBEDDING_NUM_THREADS: int = 0  # threads d'inférence par processus (0 = défaut du runtime)
+    
+    # Inférence des embeddings (pool dédié + micro-batching, voir embedding_executor.py)
+    EMBEDDING_EXECUTOR_WORKERS: int = 1  # threads d'inférence (PyTorch parallélise déjà chaque batch)
+    EMBEDDING_BATCH_MAX_SIZE: int = 32  # textes max par micro-batch
+    EMBEDDING_BATCH_MAX_WAIT_MS: int = 10  # attente max pour compléter un micro-batch
+    
+    # Cache des embeddings (clé = sha256(modèle + texte normalisé))
+    EMBEDDING_CACHE_LRU_SIZE: int = 10000  # vecteurs max en mémoire par processus (~1,5 Ko chacun)
+    EMBEDDING_CACHE_REDIS_ENABLED: bool = True  # niveau partagé entre processus
+    EMBEDDING_CACHE_TTL: int = 30 * 24 * 3600  # secondes de conservation dans Redis
+    
+    # Backfill des embeddings (file Celery "embeddings")
+    EMBEDDING_BACKFILL_BATCH_SIZE: int = 256  # lignes encodées + écrites par lot
+    EMBEDDING_BACKFILL_MAX_BATCHES: int = 20  # lots par exécution avant remise en file
+    EMBEDDING_BACKFILL_INTERVAL_MINUTES: int = 15  # période du rattrapage (Celery Beat)
+    
+    # Recommandations (recherche vectorielle HNSW sur job_offers.embedding)
+    RECOMMENDATION_EF_SEARCH_MIN: int = 40  # hnsw.ef_search minimal (défaut pgvector)
+    RECOMMENDATION_EF_SEARCH_MAX: int = 1000  # plafond de hnsw.ef_search (filtres très sélectifs)
+    RECOMMENDATION_EXACT_THRESHOLD: int = 2000  # en dessous de ce nombre de candidats : recherche exacte
+    VECTOR_SEARCH_MODE: str = "float"  # index parcouru : "float", "half" (halfvec) ou "binary" (+ re-classement)
+    VECTOR_RERANK_FACTOR: int = 4  # candidats quantifiés re-classés en float32 = limit × facteur
+    
+    # Cache des recherches : LRU du processus + Redis devant la table search_results_cache
+    SEARCH_CACHE_LRU_SIZE: int = 256  # réponses max en mémoire par processus
+    SEARCH_CACHE_LRU_TTL: int = 300  # secondes max d'une réponse en mémoire (invalidation manquée)
+    SEARCH_CACHE_REDIS_ENABLED: bool = True  # niveau partagé + invalidations publiées entre processus
+    SEARCH_CACHE_HITS_FLUSH_SECONDS: int = 30  # période du report groupé des hits dans hit_count
+    
+    # Purges par lots des lignes expirées (file Celery "maintenance", voir services/batched_delete.py)
+    PURGE_BATCH_SIZE: int = 1000  # lignes supprimées par lot (un COMMIT par lot)
+    PURGE_SLEEP_SECONDS: float = 0.2  # pause entre deux lots
+    PURGE_MAX_BATCHES: int = 100  # lots par exécution avant remise en file
+    PURGE_INTERVAL_MINUTES: int = 60  # période des purges de caches expirés (Celery Beat)
+    
+    # Partitions mensuelles de job_offers (par scraped_at, voir services/job_offer_partitions.py)
+    JOB_OFFER_RETENTION_DAYS: int = 30  # partitions entièrement plus anciennes : retirées
+    JOB_OFFER_PARTITIONS_AHEAD: int = 3  # mois futurs dont la partition est créée à l'avance
+    JOB_OFFER_PARTITION_RETENTION: str = "drop"  # "drop" (supprimée) ou "detach" (conservée hors table)
+    
+    # Pool de navigateurs Playwright (scrapers HTML)
+    BROWSER_POOL_SIZE: int = 2  # navigateurs Chromium max par processus
+    BROWSER_MAX_CONTEXTS_PER_BROWSER: int = 3  # contextes simultanés max par navigateur
+    BROWSER_MAX_PAGES_PER_BROWSER: int = 50  # contextes servis avant recyclage du navigateur
+    
     # Email (SMTP) - Optionnel
     SMTP_HOST: str | None = None
     SMTP_PORT: int = 587
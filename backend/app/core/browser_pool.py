@@ -0,0 +1,232 @@
+"""
+Pool de navigateurs Playwright persistants pour les scrapers HTML
+
+Au lieu de lancer un driver Playwright et un Chromium par appel à scrape(),
+le processus garde quelques navigateurs ouverts et prête à chaque scraping un
+contexte isolé (cookies, cache et stockage séparés) :
+- taille bornée : au plus BROWSER_POOL_SIZE navigateurs et
+  BROWSER_MAX_CONTEXTS_PER_BROWSER contextes simultanés par navigateur ;
+  au-delà, les scrapers attendent qu'un contexte se libère
+- recyclage : un navigateur est remplacé après BROWSER_MAX_PAGES_PER_BROWSER
+  contextes servis (limite la dérive mémoire de Chromium)
+- health check : un navigateur déconnecté (crash) est retiré du pool
+
+Un navigateur retiré qui prête encore des contextes reste ouvert jusqu'au
+dernier release() ; close() ferme aussi ces navigateurs en cours de retrait.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Playwright
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PooledBrowser:
+    """Navigateur du pool et ses compteurs d'utilisation"""
+    browser: Browser
+    active_contexts: int = 0
+    contexts_served: int = 0
+    retiring: bool = False
+
+
+@dataclass
+class BrowserLease:
+    """Contexte isolé emprunté au pool (à rendre via BrowserPool.release)"""
+    pooled: PooledBrowser
+    context: BrowserContext
+    released: bool = field(default=False)
+    
+    @property
+    def browser(self) -> Browser:
+        return self.pooled.browser
+
+
+class BrowserPool:
+    """Pool borné de navigateurs Chromium partagés par le processus"""
+    
+    def __init__(self):
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[PooledBrowser] = []
+        self._retired: List[PooledBrowser] = []  # Retirés, contextes encore actifs
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._metrics: Dict[str, int] = {
+            "browsers_launched": 0,
+            "browsers_recycled": 0,
+            "browsers_unhealthy": 0,
+            "contexts_served": 0,
+        }
+    
+    @property
+    def max_browsers(self) -> int:
+        return max(1, settings.BROWSER_POOL_SIZE)
+    
+    @property
+    def max_contexts_per_browser(self) -> int:
+        return max(1, settings.BROWSER_MAX_CONTEXTS_PER_BROWSER)
+    
+    def _ensure_loop(self):
+        """
+        Les objets Playwright et asyncio sont liés à la boucle qui les a créés :
+        si la boucle a changé, l'état du pool est réinitialisé.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        if self._browsers:
+            logger.warning("[BrowserPool] Boucle d'événements changée, réinitialisation du pool")
+        self._playwright = None
+        self._browsers = []
+        self._retired = []
+        self._loop = loop
+        self._lock = asyncio.Lock()
+        self._slots = asyncio.Semaphore(self.max_browsers * self.max_contexts_per_browser)
+    
+    async def _launch_browser(self) -> PooledBrowser:
+        """Lance un nouveau Chromium (démarre le driver Playwright si besoin)"""
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        browser = await self._playwright.chromium.launch(
+            headless=True,
+            args=['--no-sandbox', '--disable-setuid-sandbox', '--disable-dev-shm-usage']
+        )
+        self._metrics["browsers_launched"] += 1
+        pooled = PooledBrowser(browser=browser)
+        self._browsers.append(pooled)
+        logger.info(f"[BrowserPool] Navigateur lancé ({len(self._browsers)}/{self.max_browsers})")
+        return pooled
+    
+    async def _close_browser(self, pooled: PooledBrowser):
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.warning(f"[BrowserPool] Erreur fermeture navigateur: {e}")
+    
+    async def _retire(self, pooled: PooledBrowser):
+        """
+        Retire un navigateur du pool et le ferme s'il n'a plus de contexte actif
+        
+        Sinon il est suivi dans _retired et fermé au dernier release() (ou par close()).
+        """
+        pooled.retiring = True
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+        if pooled.active_contexts > 0:
+            if pooled not in self._retired:
+                self._retired.append(pooled)
+            return
+        if pooled in self._retired:
+            self._retired.remove(pooled)
+        await self._close_browser(pooled)
+    
+    async def _pick_browser(self) -> PooledBrowser:
+        """Choisit le navigateur sain le moins chargé, en lance un si nécessaire"""
+        # Health check : retirer les navigateurs déconnectés (crash Chromium)
+        for pooled in list(self._browsers):
+            if not pooled.browser.is_connected():
+                self._metrics["browsers_unhealthy"] += 1
+                await self._retire(pooled)
+        
+        candidates = [
+            b for b in self._browsers
+            if not b.retiring and b.active_contexts < self.max_contexts_per_browser
+        ]
+        least_loaded = min(candidates, key=lambda b: b.active_contexts, default=None)
+        
+        # Réutiliser un navigateur inactif plutôt que d'en lancer un nouveau
+        if least_loaded is not None and least_loaded.active_contexts == 0:
+            return least_loaded
+        if len(self._browsers) < self.max_browsers or least_loaded is None:
+            return await self._launch_browser()
+        return least_loaded
+    
+    async def acquire(self, user_agent: Optional[str] = None) -> BrowserLease:
+        """
+        Emprunte un contexte de navigation isolé (attend si le pool est saturé)
+        
+        Args:
+            user_agent: User-Agent du contexte (défaut: settings.USER_AGENT)
+        
+        Returns:
+            BrowserLease à rendre avec release()
+        """
+        self._ensure_loop()
+        await self._slots.acquire()
+        try:
+            async with self._lock:
+                pooled = await self._pick_browser()
+                pooled.active_contexts += 1
+                pooled.contexts_served += 1
+            self._metrics["contexts_served"] += 1
+            try:
+                context = await pooled.browser.new_context(
+                    user_agent=user_agent or settings.USER_AGENT
+                )
+            except Exception:
+                pooled.active_contexts -= 1
+                raise
+            return BrowserLease(pooled=pooled, context=context)
+        except Exception:
+            self._slots.release()
+            raise
+    
+    async def release(self, lease: BrowserLease):
+        """Rend un contexte au pool (ferme le contexte, recycle le navigateur si usé)"""
+        if lease.released:
+            return
+        lease.released = True
+        pooled = lease.pooled
+        try:
+            await lease.context.close()
+        except Exception as e:
+            logger.warning(f"[BrowserPool] Erreur fermeture contexte: {e}")
+        finally:
+            pooled.active_contexts -= 1
+            try:
+                async with self._lock:
+                    if pooled.retiring:
+                        if pooled.active_contexts == 0:
+                            await self._retire(pooled)
+                    elif pooled.contexts_served >= settings.BROWSER_MAX_PAGES_PER_BROWSER:
+                        self._metrics["browsers_recycled"] += 1
+                        await self._retire(pooled)
+            finally:
+                self._slots.release()
+    
+    async def close(self):
+        """Ferme tous les navigateurs (y compris en cours de retrait) et le driver Playwright (shutdown)"""
+        if self._loop is not None and self._loop is not asyncio.get_running_loop():
+            # Ressources d'une autre boucle : on ne peut que les abandonner
+            self._browsers = []
+            self._retired = []
+            self._playwright = None
+            return
+        for pooled in self._browsers + self._retired:
+            await self._close_browser(pooled)
+        self._browsers = []
+        self._retired = []
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        logger.info("[BrowserPool] Pool de navigateurs fermé")
+    
+    def get_metrics(self) -> Dict:
+        """État du pool et compteurs cumulés"""
+        metrics = dict(self._metrics)
+        metrics["browsers_open"] = len(self._browsers)
+        metrics["browsers_retiring"] = len(self._retired)
+        metrics["active_contexts"] = sum(b.active_contexts for b in self._browsers + self._retired)
+        metrics["max_browsers"] = self.max_browsers
+        metrics["max_contexts_per_browser"] = self.max_contexts_per_browser
+        return metrics
+
+
+# Instance globale (une par processus)
+browser_pool = BrowserPool()
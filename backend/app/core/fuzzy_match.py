@@ -0,0 +1,41 @@
+"""
+Correspondance approchée sur les colonnes texte courtes (entreprise, lieu)
+
+Les filtres « contient » (ILIKE '%valeur%') ne peuvent pas utiliser un index
+B-tree : sans index adapté, chaque filtre par entreprise ou par lieu parcourt
+toute la table job_offers. Les index GIN pg_trgm (gin_trgm_ops) servent à la
+fois :
+- ILIKE '%valeur%' (valeurs d'au moins 3 caractères)
+- l'opérateur de similarité par mots  colonne %> valeur  : « ACME » retrouve
+  « Acme Corp. », « Société Générale » retrouve « Societe Generale SA »
+  (seuil pg_trgm.word_similarity_threshold, 0.6 par défaut)
+
+Les deux conditions portent sur la colonne nue (pas de lower()/unaccent())
+pour rester servies par l'index.
+"""
+from sqlalchemy import func, or_
+
+LIKE_ESCAPE = "\\"
+
+
+def escape_like(value: str) -> str:
+    """Échappe les jokers LIKE saisis par l'utilisateur"""
+    return (
+        value.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2)
+        .replace("%", f"{LIKE_ESCAPE}%")
+        .replace("_", f"{LIKE_ESCAPE}_")
+    )
+
+
+def fuzzy_match(column, value: str):
+    """Condition « contient ou ressemble à » servie par l'index trigramme de la colonne"""
+    value = value.strip()
+    return or_(
+        column.ilike(f"%{escape_like(value)}%", escape=LIKE_ESCAPE),
+        column.op("%>")(value)
+    )
+
+
+def similarity_score(column, value: str):
+    """Score de ressemblance [0, 1] de la valeur avec la colonne (tri par pertinence)"""
+    return func.word_similarity(value.strip(), column)
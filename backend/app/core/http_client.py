@@ -0,0 +1,129 @@
+"""
+Client HTTP partagé (aiohttp) pour les scrapers basés sur des API
+
+Une seule ClientSession par processus et par boucle d'événements :
+- keep-alive : les connexions TCP/TLS sont réutilisées entre les recherches
+- limites de connexions globales et par hôte
+- cache DNS
+- métriques (handshakes, taux de réutilisation des connexions, cache DNS)
+
+Le cycle de vie est piloté par ScrapingService.startup()/shutdown(), appelés
+depuis le lifespan FastAPI et les signaux du worker Celery.
+"""
+import asyncio
+import logging
+from typing import Dict, Optional
+
+import aiohttp
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClientManager:
+    """Gestionnaire de la session aiohttp partagée du processus"""
+    
+    def __init__(self):
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._metrics: Dict[str, int] = {
+            "sessions_created": 0,
+            "requests": 0,
+            "connections_created": 0,  # = handshakes TCP (+ TLS)
+            "connections_reused": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+        }
+    
+    def _build_trace_config(self) -> aiohttp.TraceConfig:
+        """Hooks aiohttp pour alimenter les métriques"""
+        trace_config = aiohttp.TraceConfig()
+        
+        async def on_request_start(session, ctx, params):
+            self._metrics["requests"] += 1
+        
+        async def on_connection_create_end(session, ctx, params):
+            self._metrics["connections_created"] += 1
+        
+        async def on_connection_reuseconn(session, ctx, params):
+            self._metrics["connections_reused"] += 1
+        
+        async def on_dns_cache_hit(session, ctx, params):
+            self._metrics["dns_cache_hits"] += 1
+        
+        async def on_dns_cache_miss(session, ctx, params):
+            self._metrics["dns_cache_misses"] += 1
+        
+        trace_config.on_request_start.append(on_request_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+        trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+        trace_config.on_dns_cache_miss.append(on_dns_cache_miss)
+        return trace_config
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """
+        Retourne la session partagée (créée à la demande)
+        
+        Une session aiohttp est liée à la boucle d'événements qui l'a créée :
+        si la boucle courante a changé, une nouvelle session est créée.
+        Les appelants ne doivent jamais fermer la session empruntée.
+        """
+        loop = asyncio.get_running_loop()
+        
+        if self._session is not None and not self._session.closed and self._loop is loop:
+            return self._session
+        
+        if self._session is not None and not self._session.closed:
+            # Session orpheline d'une boucle précédente : impossible de la fermer proprement
+            logger.warning("[HTTPClient] Boucle d'événements changée, recréation de la session")
+        
+        connector = aiohttp.TCPConnector(
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=settings.HTTP_DNS_CACHE_TTL,
+            use_dns_cache=True,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            enable_cleanup_closed=True,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=settings.SCRAPING_TIMEOUT),
+            headers={"User-Agent": settings.USER_AGENT},
+            trace_configs=[self._build_trace_config()],
+        )
+        self._loop = loop
+        self._metrics["sessions_created"] += 1
+        logger.info("[HTTPClient] Nouvelle session HTTP partagée créée")
+        return self._session
+    
+    async def startup(self):
+        """Pré-crée la session sur la boucle courante"""
+        await self.get_session()
+    
+    async def close(self):
+        """Ferme la session et ses connexions (shutdown)"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            logger.info("[HTTPClient] Session HTTP partagée fermée")
+        self._session = None
+        self._loop = None
+    
+    def get_metrics(self) -> Dict:
+        """Métriques de connexion (cumulées depuis le démarrage du processus)"""
+        metrics = dict(self._metrics)
+        acquired = metrics["connections_created"] + metrics["connections_reused"]
+        dns_lookups = metrics["dns_cache_hits"] + metrics["dns_cache_misses"]
+        metrics["connection_reuse_ratio"] = (
+            round(metrics["connections_reused"] / acquired, 3) if acquired else 0.0
+        )
+        metrics["dns_cache_hit_ratio"] = (
+            round(metrics["dns_cache_hits"] / dns_lookups, 3) if dns_lookups else 0.0
+        )
+        metrics["session_open"] = self._session is not None and not self._session.closed
+        return metrics
+
+
+# Instance globale (une par processus)
+http_client_manager = HTTPClientManager()
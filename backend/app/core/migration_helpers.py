@@ -0,0 +1,35 @@
+"""
+Utilitaires partagés par les migrations Alembic (alembic/versions)
+
+Les migrations importent app (voir alembic/env.py) : les opérations répétées
+d'une migration à l'autre sont regroupées ici plutôt que recopiées.
+"""
+from typing import Dict, Iterable, Tuple
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def table_exists(table: str) -> bool:
+    """La table existe dans le schéma courant"""
+    return op.get_bind().execute(sa.text("SELECT to_regclass(:table)"), {"table": table}).scalar() is not None
+
+
+def create_indexes_concurrently(indexes: Dict[str, Tuple[str, str]]) -> None:
+    """
+    Crée les index {nom: (table, colonnes)} sans bloquer les écritures
+    
+    CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction :
+    la création se fait dans un bloc autocommit. Un index déjà présent est
+    conservé (IF NOT EXISTS).
+    """
+    with op.get_context().autocommit_block():
+        for name, (table, columns) in indexes.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def drop_indexes_concurrently(names: Iterable[str]) -> None:
+    """Supprime les index sans bloquer les écritures (downgrade de create_indexes_concurrently)"""
+    with op.get_context().autocommit_block():
+        for name in names:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
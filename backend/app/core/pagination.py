@@ -0,0 +1,194 @@
+"""
+Pagination par clé (keyset / curseur)
+
+OFFSET n oblige PostgreSQL à produire puis jeter les n premières lignes : plus
+la page est lointaine, plus elle est lente. Ici la page suivante repart de la
+dernière ligne vue :
+    
+    WHERE (created_at, id) < (:dernier_created_at, :dernier_id)
+    ORDER BY created_at DESC, id DESC
+    LIMIT :limit + 1
+
+servi par un index composite (user_id, created_at, id) : chaque page coûte le
+même prix quelle que soit sa profondeur. `id` départage les lignes de même
+horodatage, l'ordre est donc total et stable.
+
+Le curseur est un jeton opaque (JSON encodé en base64 url-safe) contenant les
+valeurs des clés de tri de la dernière ligne. Un jeton modifié ou tronqué, ou
+dont une valeur n'a pas le type de sa clé de tri (ex. texte à la place d'une
+date), lève InvalidCursor (→ 400 côté API) avant d'atteindre la base ; un jeton
+valide ne peut qu'aboutir à une autre page des mêmes lignes : les filtres
+d'appartenance restent appliqués par l'appelant.
+
+Le total exact (COUNT(*)) est remplacé par une estimation optionnelle, lue
+dans le plan de PostgreSQL (EXPLAIN), de coût constant.
+"""
+import base64
+import binascii
+import json
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.query_plan import explain
+
+T = TypeVar("T")
+
+# En-têtes des listes paginées (le corps de la réponse reste une liste)
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_ESTIMATE_HEADER = "X-Total-Estimate"
+
+
+class InvalidCursor(ValueError):
+    """Jeton de pagination illisible"""
+
+
+@dataclass
+class Page(Generic[T]):
+    """Une page de résultats et le curseur de la suivante (None = dernière page)"""
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+    total_estimate: Optional[int] = None
+
+
+# ------------------------------------------------------------------
+# Jetons
+# ------------------------------------------------------------------
+
+def _dump_value(value: Any) -> List:
+    if isinstance(value, datetime):
+        return ["dt", value.isoformat()]
+    if isinstance(value, uuid.UUID):
+        return ["uuid", str(value)]
+    return ["raw", value]
+
+
+def _load_value(item: List) -> Any:
+    kind, value = item
+    if kind == "dt":
+        return datetime.fromisoformat(value)
+    if kind == "uuid":
+        return uuid.UUID(value)
+    if kind == "raw":
+        return value
+    raise InvalidCursor(f"Type de valeur inconnu: {kind}")
+
+
+def _matches_type(value: Any, expected: Optional[type]) -> bool:
+    """Valeur compatible avec le type Python de sa clé de tri (None = type inconnu, non vérifié)"""
+    if expected is None or value is None:
+        return True
+    if isinstance(value, bool):
+        return expected is bool
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def _key_python_type(key) -> Optional[type]:
+    try:
+        return key.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_dump_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, types: Sequence[Optional[type]]) -> List[Any]:
+    """
+    Valeurs des clés de tri contenues dans le jeton
+    
+    types donne le type Python attendu de chaque clé, dans l'ordre du tri
+    (None = non vérifié) : une valeur d'un autre type lève InvalidCursor.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        items = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(items, list) or len(items) != len(types):
+            raise InvalidCursor("Curseur incompatible avec ce tri")
+        values = [_load_value(item) for item in items]
+        for value, expected in zip(values, types):
+            if not _matches_type(value, expected):
+                raise InvalidCursor(f"Valeur de curseur invalide: {type(value).__name__} au lieu de {expected.__name__}")
+        return values
+    except InvalidCursor:
+        raise
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as e:
+        raise InvalidCursor(f"Curseur invalide: {e}") from e
+
+
+# ------------------------------------------------------------------
+# Requêtes
+# ------------------------------------------------------------------
+
+def keyset_paginate(query, sort_keys: Sequence, cursor: Optional[str], limit: int):
+    """
+    Applique tri décroissant, condition de curseur et LIMIT limit + 1
+    
+    La ligne supplémentaire indique s'il existe une page suivante (voir
+    build_page). sort_keys doit se terminer par une clé unique (id), et chaque
+    clé porter un type SQL (type_=...) pour que le curseur soit vérifié.
+    """
+    if cursor:
+        values = decode_cursor(cursor, [_key_python_type(key) for key in sort_keys])
+        query = query.where(tuple_(*sort_keys) < tuple_(*values))
+    return query.order_by(*[key.desc() for key in sort_keys]).limit(limit + 1)
+
+
+def build_page(rows: Sequence[T], limit: int, key_values) -> Page[T]:
+    """
+    Découpe le résultat de keyset_paginate en page + curseur suivant
+    
+    key_values(row) retourne les valeurs des clés de tri d'une ligne, dans
+    l'ordre passé à keyset_paginate.
+    """
+    items = list(rows[:limit])
+    next_cursor = encode_cursor(key_values(items[-1])) if len(rows) > limit and items else None
+    return Page(items=items, next_cursor=next_cursor)
+
+
+async def estimate_count(db: AsyncSession, query) -> int:
+    """
+    Nombre de lignes estimé par le planificateur pour cette requête
+    
+    Coût constant (aucune ligne lue) ; précision dépendant des statistiques
+    de la table (ANALYZE / autovacuum). Tri et LIMIT sont retirés.
+    """
+    plan = await explain(db, query.order_by(None).limit(None))
+    return int(plan["Plan Rows"])
+
+
+async def paginate(
+    db: AsyncSession,
+    query,
+    sort_keys: Sequence,
+    cursor: Optional[str],
+    limit: int,
+    include_total: bool = False
+) -> Page:
+    """
+    Page d'entités ORM triées par des attributs du modèle (ex. created_at, id)
+    
+    Le total n'est calculé que sur demande, et estimé (estimate_count).
+    """
+    result = await db.execute(keyset_paginate(query, sort_keys, cursor, limit))
+    rows = result.scalars().all()
+    page = build_page(rows, limit, lambda row: [getattr(row, key.key) for key in sort_keys])
+    if include_total:
+        page.total_estimate = await estimate_count(db, query)
+    return page
+
+
+def set_page_headers(response, page: Page):
+    """Expose curseur suivant et total estimé d'une page dans les en-têtes de la réponse"""
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+    if page.total_estimate is not None:
+        response.headers[TOTAL_ESTIMATE_HEADER] = str(page.total_estimate)
@@ -0,0 +1,47 @@
+"""
+Plans d'exécution PostgreSQL (EXPLAIN) pour les requêtes SQLAlchemy
+
+- explain(db, query) : plan JSON de la requête, paramètres liés conservés
+- plan_nodes(plan)   : parcours à plat des nœuds du plan
+
+Utilisé pour l'estimation des totaux de pagination (app.core.pagination) et
+par test_query_plans.py, qui vérifie que les requêtes chaudes passent par
+leurs index.
+"""
+import json
+from typing import Dict, Iterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) d'une requête"""
+    inherit_cache = False
+    
+    def __init__(self, statement, analyze: bool = False):
+        self.statement = statement
+        self.analyze = analyze
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    options = "ANALYZE, FORMAT JSON" if element.analyze else "FORMAT JSON"
+    return f"EXPLAIN ({options}) " + compiler.process(element.statement, **kw)
+
+
+async def explain(db: AsyncSession, query, analyze: bool = False) -> Dict:
+    """Plan de la requête (nœud racine « Plan » de la sortie JSON)"""
+    result = await db.execute(Explain(query, analyze=analyze))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def plan_nodes(plan: Dict) -> Iterator[Dict]:
+    """Tous les nœuds du plan, racine comprise"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
@@ -0,0 +1,231 @@
+"""
+Rate limiter distribué par plateforme (token bucket dans Redis)
+
+Les limites de chaque plateforme (requêtes/heure + burst) sont déclarées dans
+platforms_config/platforms.py. L'état des buckets vit dans Redis : la limite est
+donc globale à tous les workers API et Celery, et non plus par processus.
+
+Principe (script Lua atomique, horloge du serveur Redis) :
+- le bucket se remplit à `rate_limit / 3600` jetons par seconde, jusqu'à `burst`
+- chaque appel réserve ses jetons immédiatement, quitte à rendre le solde négatif,
+  et reçoit le délai à attendre avant d'envoyer sa requête
+- les réservations étant ordonnées par Redis, les appelants sont servis dans
+  l'ordre d'arrivée (file équitable, pas de famine ni de rafales de retry)
+- si l'attente dépasse max_wait, rien n'est réservé et RateLimitExceeded est levée
+
+Si Redis est indisponible, un bucket local au processus prend le relais
+(limite appliquée par processus, en mode dégradé) et Redis est retenté plus tard.
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.core.redis_client import get_redis
+from app.platforms_config.platforms import get_platform_config
+
+logger = logging.getLogger(__name__)
+
+
+# KEYS[1] = clé du bucket
+# ARGV = jetons/seconde, capacité (burst), jetons demandés, attente max (s)
+# Retourne {1|0 (réservé), attente en secondes (string)}
+TOKEN_BUCKET_SCRIPT = """
+if redis.replicate_commands then redis.replicate_commands() end
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local max_wait = tonumber(ARGV[4])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens < requested then
+    wait = (requested - tokens) / rate
+end
+
+local granted = 0
+if wait <= max_wait then
+    tokens = tokens - requested
+    granted = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil((capacity - tokens) / rate) + 60)
+return {granted, tostring(wait)}
+"""
+
+
+class RateLimitExceeded(Exception):
+    """L'attente nécessaire pour obtenir un jeton dépasse l'attente maximale"""
+    
+    def __init__(self, platform: str, wait_seconds: float):
+        self.platform = platform
+        self.wait_seconds = wait_seconds
+        super().__init__(
+            f"Rate limit {platform}: attente de {wait_seconds:.1f}s nécessaire"
+        )
+
+
+@dataclass
+class RateLimit:
+    """Limite d'une plateforme"""
+    requests_per_hour: float
+    burst: int
+    
+    @property
+    def tokens_per_second(self) -> float:
+        return self.requests_per_hour / 3600
+
+
+class RateLimiter:
+    """Token bucket partagé (Redis) avec repli local"""
+    
+    KEY_PREFIX = "jobhunter:ratelimit:"
+    REDIS_RETRY_DELAY = 30  # secondes avant de retenter Redis après une erreur
+    
+    def __init__(self):
+        self._script = None
+        self._script_client = None
+        self._redis_retry_at = 0.0
+        self._local_buckets: Dict[str, Tuple[float, float]] = {}
+        self._metrics: Dict[str, Dict] = {}
+        self._backend_errors = 0
+    
+    def get_limit(self, platform: str) -> Optional[RateLimit]:
+        """Limite déclarée pour la plateforme (None = pas de limitation)"""
+        config = get_platform_config(platform)
+        requests_per_hour = config.get("rate_limit")
+        if not requests_per_hour:
+            return None
+        return RateLimit(
+            requests_per_hour=float(requests_per_hour),
+            burst=max(1, int(config.get("burst", 1)))
+        )
+    
+    async def _reserve_redis(
+        self, platform: str, limit: RateLimit, tokens: int, max_wait: float
+    ) -> Tuple[bool, float]:
+        client = get_redis()
+        if self._script is None or self._script_client is not client:
+            # Script lié au client (recréé si la boucle d'événements change)
+            self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+            self._script_client = client
+        granted, wait = await self._script(
+            keys=[f"{self.KEY_PREFIX}{platform}"],
+            args=[limit.tokens_per_second, limit.burst, tokens, max_wait]
+        )
+        return bool(int(granted)), float(wait)
+    
+    def _reserve_local(
+        self, platform: str, limit: RateLimit, tokens: int, max_wait: float
+    ) -> Tuple[bool, float]:
+        """Même algorithme que le script Lua, en mémoire (atomique dans la boucle)"""
+        now = time.monotonic()
+        available, ts = self._local_buckets.get(platform, (float(limit.burst), now))
+        available = min(limit.burst, available + max(0.0, now - ts) * limit.tokens_per_second)
+        wait = 0.0
+        if available < tokens:
+            wait = (tokens - available) / limit.tokens_per_second
+        granted = wait <= max_wait
+        if granted:
+            available -= tokens
+        self._local_buckets[platform] = (available, now)
+        return granted, wait
+    
+    async def _reserve(
+        self, platform: str, limit: RateLimit, tokens: int, max_wait: float
+    ) -> Tuple[bool, float]:
+        if time.monotonic() >= self._redis_retry_at:
+            try:
+                return await self._reserve_redis(platform, limit, tokens, max_wait)
+            except (RedisError, OSError) as e:
+                self._backend_errors += 1
+                self._redis_retry_at = time.monotonic() + self.REDIS_RETRY_DELAY
+                logger.warning(
+                    f"[RateLimiter] Redis indisponible ({e}), repli sur un bucket local "
+                    f"pendant {self.REDIS_RETRY_DELAY}s"
+                )
+        return self._reserve_local(platform, limit, tokens, max_wait)
+    
+    def _platform_metrics(self, platform: str) -> Dict:
+        return self._metrics.setdefault(platform, {
+            "acquired": 0,
+            "rejected": 0,
+            "delayed": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+        })
+    
+    async def acquire(
+        self,
+        platform: str,
+        tokens: int = 1,
+        max_wait: Optional[float] = None
+    ) -> float:
+        """
+        Attend que `tokens` requêtes soient autorisées sur la plateforme
+        
+        Args:
+            platform: Nom de la plateforme (clé de SUPPORTED_PLATFORMS)
+            tokens: Nombre de requêtes à réserver
+            max_wait: Attente maximale acceptée en secondes
+                (défaut: settings.RATE_LIMIT_MAX_WAIT)
+        
+        Returns:
+            Temps d'attente effectif en secondes
+        
+        Raises:
+            RateLimitExceeded: si l'attente dépasserait max_wait
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return 0.0
+        limit = self.get_limit(platform)
+        if limit is None:
+            return 0.0
+        if max_wait is None:
+            max_wait = settings.RATE_LIMIT_MAX_WAIT
+        
+        granted, wait = await self._reserve(platform, limit, tokens, max_wait)
+        metrics = self._platform_metrics(platform)
+        if not granted:
+            metrics["rejected"] += 1
+            raise RateLimitExceeded(platform, wait)
+        
+        metrics["acquired"] += 1
+        if wait > 0:
+            metrics["delayed"] += 1
+            metrics["total_wait_seconds"] = round(metrics["total_wait_seconds"] + wait, 3)
+            metrics["max_wait_seconds"] = max(metrics["max_wait_seconds"], round(wait, 3))
+            # Jeton déjà réservé : une annulation pendant l'attente le consomme
+            # quand même (on reste du bon côté de la limite)
+            await asyncio.sleep(wait)
+        return wait
+    
+    def get_metrics(self) -> Dict:
+        """Compteurs par plateforme (processus courant) et état du backend"""
+        return {
+            "enabled": settings.RATE_LIMIT_ENABLED,
+            "backend": "redis" if time.monotonic() >= self._redis_retry_at else "local",
+            "backend_errors": self._backend_errors,
+            "platforms": {p: dict(m) for p, m in self._metrics.items()},
+        }
+
+
+# Instance globale (une par processus, état partagé via Redis)
+rate_limiter = RateLimiter()
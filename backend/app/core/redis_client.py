@@ -0,0 +1,137 @@
+"""
+Client Redis partagé (redis.asyncio)
+
+Réutilise l'instance Redis déjà déployée pour Celery (settings.REDIS_URL) pour
+l'état partagé entre les workers API et les workers Celery (rate limiting,
+verrous, caches).
+
+Comme la session aiohttp, le pool de connexions redis.asyncio est lié à la
+boucle d'événements qui l'a créé : le client est recréé si la boucle change.
+
+BatchCheckpoints regroupe le checkpoint et le verrou des traitements par lots
+reprenables (backfill des embeddings, purges par lots).
+"""
+import asyncio
+import logging
+import uuid
+from typing import Optional
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Supprime un verrou seulement s'il appartient encore à son détenteur (jeton)
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisClientManager:
+    """Gestionnaire du client Redis asynchrone du processus"""
+    
+    def __init__(self):
+        self._client: Optional[aioredis.Redis] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def get_client(self) -> aioredis.Redis:
+        """
+        Retourne le client Redis de la boucle courante (créé à la demande)
+        
+        La connexion est établie paresseusement à la première commande.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is not None and self._loop is loop:
+            return self._client
+        
+        if self._client is not None:
+            logger.warning("[Redis] Boucle d'événements changée, recréation du client")
+        
+        self._client = aioredis.from_url(
+            settings.REDIS_URL,
+            decode_responses=False,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+            health_check_interval=30,
+        )
+        self._loop = loop
+        return self._client
+    
+    async def close(self):
+        """Ferme le pool de connexions (shutdown)"""
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            try:
+                await self._client.aclose()
+            except Exception as e:
+                logger.warning(f"[Redis] Erreur fermeture client: {e}")
+        self._client = None
+        self._loop = None
+
+
+# Instance globale (une par processus)
+redis_manager = RedisClientManager()
+
+
+def get_redis() -> aioredis.Redis:
+    """Raccourci vers le client Redis asynchrone partagé"""
+    return redis_manager.get_client()
+
+
+class BatchCheckpoints:
+    """
+    Checkpoint et verrou Redis d'un traitement par lots reprenable (optionnels)
+    
+    Le checkpoint est le dernier id traité : un passage interrompu reprend
+    après lui, un passage terminé l'efface et repart du début. Le verrou
+    garantit un seul passage à la fois par nom ; il porte un jeton propre au
+    passage, et n'est supprimé que par ce passage (un verrou expiré puis repris
+    par un autre n'est pas libéré par erreur). Redis indisponible : reprise au
+    début et verrou accordé (les traitements revérifient leur condition).
+    """
+    
+    def __init__(self, prefix: str):
+        self.prefix = prefix  # ex. "jobhunter:purge" -> jobhunter:purge:{name}:checkpoint
+    
+    def _key(self, name: str, kind: str) -> str:
+        return f"{self.prefix}:{name}:{kind}"
+    
+    async def get_checkpoint(self, name: str) -> Optional[uuid.UUID]:
+        try:
+            value = await get_redis().get(self._key(name, "checkpoint"))
+            return uuid.UUID(value.decode()) if value else None
+        except (RedisError, OSError, ValueError) as e:
+            logger.warning(f"[Redis] Checkpoint {self.prefix}:{name} illisible ({e}), reprise au début")
+            return None
+    
+    async def set_checkpoint(self, name: str, last_id: Optional[uuid.UUID]):
+        """Enregistre le dernier id traité (None = passage terminé)"""
+        key = self._key(name, "checkpoint")
+        try:
+            if last_id is None:
+                await get_redis().delete(key)
+            else:
+                await get_redis().set(key, str(last_id))
+        except (RedisError, OSError) as e:
+            logger.warning(f"[Redis] Checkpoint {self.prefix}:{name} non enregistré: {e}")
+    
+    async def acquire_lock(self, name: str, ttl: int) -> Optional[str]:
+        """Jeton du verrou à passer à release_lock, None si un autre passage le détient"""
+        token = uuid.uuid4().hex
+        try:
+            acquired = await get_redis().set(self._key(name, "lock"), token, nx=True, ex=ttl)
+            return token if acquired else None
+        except (RedisError, OSError):
+            return token
+    
+    async def release_lock(self, name: str, token: str):
+        """Libère le verrou s'il porte encore ce jeton (compare-and-delete atomique)"""
+        try:
+            release = get_redis().register_script(RELEASE_LOCK_SCRIPT)
+            await release(keys=[self._key(name, "lock")], args=[token])
+        except (RedisError, OSError):
+            pass
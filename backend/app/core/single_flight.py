@@ -0,0 +1,240 @@
+"""
+Single-flight : fusion des appels identiques en cours
+
+Quand plusieurs requêtes identiques arrivent en même temps (plusieurs
+utilisateurs, double-clic, tâche Celery + API), une seule exécute le travail
+(le « leader ») et les autres attendent son résultat :
+- dans le processus : les appelants suivants attendent le même Future
+- entre processus : verrou Redis (SET NX EX) + clé de résultat ; les
+  « followers » interrogent la clé de résultat jusqu'à wait_timeout
+
+Garde-fous :
+- le verrou a une durée de vie (lock_ttl) : un leader bloqué ou mort ne bloque
+  pas les followers au-delà, l'un d'eux reprend alors la main
+- si le leader échoue, il libère le verrou sans résultat et un follower reprend
+- si Redis est indisponible ou si l'attente dépasse wait_timeout, l'appelant
+  exécute le travail lui-même (jamais d'erreur due au single-flight)
+"""
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.core.redis_client import RELEASE_LOCK_SCRIPT, get_redis
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def _json_default(obj: Any) -> Any:
+    """Encode les datetime de façon réversible"""
+    if isinstance(obj, datetime):
+        return {"__datetime__": obj.isoformat()}
+    raise TypeError(f"Type non sérialisable: {type(obj).__name__}")
+
+
+def _json_object_hook(obj: Dict) -> Any:
+    if len(obj) == 1 and "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    return obj
+
+
+class SingleFlight:
+    """Coalescence des appels identiques, dans le processus et via Redis"""
+    
+    KEY_PREFIX = "jobhunter:singleflight:"
+    POLL_INTERVAL = 0.2  # secondes entre deux lectures du résultat par un follower
+    
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._release_script = None
+        self._script_client = None
+        self._metrics: Dict[str, int] = {
+            "leader": 0,
+            "coalesced_local": 0,
+            "coalesced_remote": 0,
+            "fallback": 0,
+        }
+    
+    def _local_calls(self) -> Dict[str, asyncio.Future]:
+        """Appels en cours de la boucle courante (réinitialisés si la boucle change)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._inflight = {}
+            self._loop = loop
+        return self._inflight
+    
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        serialize: Callable[[T], Any],
+        deserialize: Callable[[Any], T],
+        lock_ttl: Optional[int] = None,
+        wait_timeout: Optional[float] = None,
+        result_ttl: Optional[int] = None
+    ) -> T:
+        """
+        Exécute fn() une seule fois pour tous les appels concurrents de même clé
+        
+        Args:
+            key: Clé de coalescence (doit identifier complètement le travail)
+            fn: Travail à exécuter par le leader
+            serialize: Résultat → objet JSON-sérialisable (partage entre processus)
+            deserialize: Inverse de serialize
+            lock_ttl: Durée de vie du verrou leader en secondes (défaut: settings)
+            wait_timeout: Attente max d'un follower en secondes (défaut: lock_ttl)
+            result_ttl: Durée de conservation du résultat partagé (défaut: settings)
+        
+        Returns:
+            Résultat de fn() (exécuté ici ou par un autre appelant)
+        """
+        if not settings.SINGLE_FLIGHT_ENABLED:
+            return await fn()
+        
+        lock_ttl = lock_ttl or settings.SINGLE_FLIGHT_LOCK_TTL
+        wait_timeout = wait_timeout or lock_ttl
+        result_ttl = result_ttl or settings.SINGLE_FLIGHT_RESULT_TTL
+        calls = self._local_calls()
+        
+        while True:
+            existing = calls.get(key)
+            if existing is None:
+                break
+            self._metrics["coalesced_local"] += 1
+            try:
+                return await asyncio.shield(existing)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not existing.cancelled() or (task is not None and task.cancelling()):
+                    raise
+                # Leader local annulé (ex: client déconnecté) : on prend le relais
+                continue
+        
+        future = asyncio.get_running_loop().create_future()
+        # Évite l'avertissement "exception was never retrieved" sans follower
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        calls[key] = future
+        try:
+            result = await self._do_distributed(
+                key, fn, serialize, deserialize, lock_ttl, wait_timeout, result_ttl
+            )
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if calls.get(key) is future:
+                del calls[key]
+    
+    async def _do_distributed(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[T]],
+        serialize: Callable[[T], Any],
+        deserialize: Callable[[Any], T],
+        lock_ttl: int,
+        wait_timeout: float,
+        result_ttl: int
+    ) -> T:
+        lock_key = f"{self.KEY_PREFIX}lock:{key}"
+        result_key = f"{self.KEY_PREFIX}result:{key}"
+        token = uuid.uuid4().hex
+        
+        try:
+            redis = get_redis()
+            acquired = await redis.set(lock_key, token, nx=True, ex=lock_ttl)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[SingleFlight] Redis indisponible ({e}), exécution locale")
+            self._metrics["fallback"] += 1
+            return await fn()
+        
+        if acquired:
+            return await self._lead(
+                redis, lock_key, result_key, token, fn, serialize, deserialize, result_ttl
+            )
+        
+        # Follower : attendre le résultat publié par le leader d'un autre processus
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + wait_timeout
+        while loop.time() < deadline:
+            await asyncio.sleep(self.POLL_INTERVAL)
+            try:
+                payload = await redis.get(result_key)
+                if payload is not None:
+                    self._metrics["coalesced_remote"] += 1
+                    return deserialize(json.loads(payload, object_hook=_json_object_hook))
+                # Verrou disparu sans résultat : leader en échec ou bail expiré
+                if await redis.set(lock_key, token, nx=True, ex=lock_ttl):
+                    return await self._lead(
+                        redis, lock_key, result_key, token, fn, serialize, deserialize, result_ttl
+                    )
+            except (RedisError, OSError) as e:
+                logger.warning(f"[SingleFlight] Erreur Redis en attente du leader: {e}")
+                break
+        
+        logger.warning(f"[SingleFlight] Pas de résultat du leader pour {key}, exécution locale")
+        self._metrics["fallback"] += 1
+        return await fn()
+    
+    async def _lead(
+        self,
+        redis,
+        lock_key: str,
+        result_key: str,
+        token: str,
+        fn: Callable[[], Awaitable[T]],
+        serialize: Callable[[T], Any],
+        deserialize: Callable[[Any], T],
+        result_ttl: int
+    ) -> T:
+        try:
+            # Un leader précédent a pu publier juste avant la prise du verrou
+            payload = await redis.get(result_key)
+            if payload is not None:
+                self._metrics["coalesced_remote"] += 1
+                return deserialize(json.loads(payload, object_hook=_json_object_hook))
+            
+            self._metrics["leader"] += 1
+            result = await fn()
+            
+            try:
+                payload = json.dumps(serialize(result), default=_json_default)
+                await redis.set(result_key, payload, ex=result_ttl)
+            except (RedisError, OSError, TypeError, ValueError) as e:
+                logger.warning(f"[SingleFlight] Publication du résultat impossible: {e}")
+            return result
+        finally:
+            await self._release(redis, lock_key, token)
+    
+    async def _release(self, redis, lock_key: str, token: str):
+        try:
+            if self._release_script is None or self._script_client is not redis:
+                self._release_script = redis.register_script(RELEASE_LOCK_SCRIPT)
+                self._script_client = redis
+            await self._release_script(keys=[lock_key], args=[token])
+        except (RedisError, OSError) as e:
+            # Le verrou expirera de lui-même (lock_ttl)
+            logger.warning(f"[SingleFlight] Libération du verrou impossible: {e}")
+    
+    def get_metrics(self) -> Dict:
+        """Compteurs cumulés (processus courant)"""
+        metrics = dict(self._metrics)
+        metrics["in_flight"] = len(self._inflight)
+        return metrics
+
+
+# Instance globale (une par processus)
+single_flight = SingleFlight()
@@ -40,15 +40,6 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
-async def init_db():
-    """
-    Initialiser la base de données (créer les tables)
-    À utiliser uniquement en développement
-    """
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
-
-
 async def close_db():
     """Fermer la connexion à la base de données"""
     await engine.dispose()
@@ -6,10 +6,16 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.config import settings
-from app.database import init_db, close_db
+from app.core.pagination import InvalidCursor, NEXT_CURSOR_HEADER, TOTAL_ESTIMATE_HEADER
+from app.database import close_db
+from app.services.scraping_service import scraping_service
+from app.services.embedding_executor import embedding_executor
+from app.services.embedding_service import EmbeddingService
+from app.services.search_cache_service import search_cache_service
 
 logger = logging.getLogger(__name__)
 
@@ -21,14 +27,24 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     print("🚀 Démarrage de Job Hunter AI...")
-    # Note: En production, utiliser Alembic plutôt que init_db()
-    # await init_db()
+    # Note: Schéma créé par les migrations (alembic upgrade head) : job_offers est partitionnée
     print("✅ Base de données connectée")
+    await scraping_service.startup()
+    print("✅ Client HTTP de scraping prêt")
+    await search_cache_service.startup()
+    print("✅ Cache de recherche prêt (invalidations, report des hits)")
+    if settings.EMBEDDING_MODE == "eager":
+        # Chargement + warm-up en arrière-plan : /health passe à "ready" une fois terminé
+        app.state.embedding_preload = asyncio.create_task(asyncio.to_thread(EmbeddingService.preload))
+        print("⏳ Préchargement du modèle d'embeddings lancé")
     
     yield
     
     # Shutdown
     print("🔌 Fermeture des connexions...")
+    await search_cache_service.shutdown()
+    await scraping_service.shutdown()
+    await embedding_executor.shutdown()
     await close_db()
     print("✅ Application arrêtée proprement")
 
@@ -75,6 +91,15 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
     )
 
 
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request: Request, exc: InvalidCursor):
+    """Curseur de pagination illisible ou modifié"""
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={"detail": str(exc)}
+    )
+
+
 # Configuration CORS
 app.add_middleware(
     CORSMiddleware,
@@ -82,6 +107,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # En-têtes de pagination lisibles par le frontend
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_ESTIMATE_HEADER],
 )
 
 
@@ -99,10 +126,25 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    """Health check pour le monitoring"""
+    """
+    Health check pour le monitoring
+    
+    503 tant que le modèle d'embeddings n'est pas prêt, en EMBEDDING_MODE=eager
+    uniquement : le processus ne doit pas recevoir de trafic avant la fin du
+    warm-up. En mode local (chargement à la demande), un échec de chargement
+    est signalé dans la réponse (status "degraded") sans rendre l'API
+    indisponible.
+    """
+    embeddings = EmbeddingService.status()
+    if embeddings["mode"] == "eager" and not embeddings["ready"]:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "starting", "version": settings.VERSION, "embeddings": embeddings}
+        )
     return {
-        "status": "healthy",
-        "version": settings.VERSION
+        "status": "healthy" if embeddings["ready"] else "degraded",
+        "version": settings.VERSION,
+        "embeddings": embeddings
     }
 
 
@@ -1,7 +1,7 @@
 """
 Application model - Candidatures utilisateur
 """
-from sqlalchemy import Column, String, DateTime, Text, ForeignKey
+from sqlalchemy import Column, String, DateTime, Text, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -23,10 +23,17 @@ class ApplicationStatus(str, enum.Enum):
 class Application(Base):
     """Modèle pour les candidatures envoyées"""
     __tablename__ = "applications"
+    __table_args__ = (
+        # Pagination par curseur (app.core.pagination) : (applied_at, id)
+        Index("ix_applications_user_applied_id", "user_id", "applied_at", "id"),
+        # Filtre par statut (liste, statistiques)
+        Index("ix_applications_user_status_applied_id", "user_id", "status", "applied_at", "id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    job_offer_id = Column(UUID(as_uuid=True), ForeignKey("job_offers.id", ondelete="SET NULL"), nullable=True)
+    # Pas de clé étrangère : job_offers est partitionnée (voir JobOffer)
+    job_offer_id = Column(UUID(as_uuid=True), nullable=True)
     
     company_name = Column(String(255), nullable=False)
     job_title = Column(String(255), nullable=False)
@@ -40,4 +47,8 @@ class Application(Base):
     
     # Relations
     user = relationship("User", back_populates="applications")
-    job_offer = relationship("JobOffer", back_populates="applications")
+    job_offer = relationship(
+        "JobOffer",
+        primaryjoin="foreign(Application.job_offer_id) == JobOffer.id",
+        back_populates="applications"
+    )
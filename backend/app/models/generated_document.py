@@ -1,7 +1,7 @@
 """
 Modèle GeneratedDocument - Documents générés (CV, LM)
 """
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Integer
+from sqlalchemy import Column, String, Text, ForeignKey, DateTime, Integer, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -13,11 +13,16 @@ from app.database import Base
 class GeneratedDocument(Base):
     """Document généré (CV ou Lettre de Motivation)"""
     __tablename__ = "generated_documents"
+    __table_args__ = (
+        # Pagination par curseur (app.core.pagination) : (generated_at, id)
+        Index("ix_generated_documents_user_generated_id", "user_id", "generated_at", "id"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     profile_id = Column(UUID(as_uuid=True), ForeignKey("profiles.id", ondelete="CASCADE"), nullable=False)
-    job_offer_id = Column(UUID(as_uuid=True), ForeignKey("job_offers.id", ondelete="CASCADE"), nullable=False)
+    # Pas de clé étrangère : job_offers est partitionnée (voir JobOffer)
+    job_offer_id = Column(UUID(as_uuid=True), nullable=False)
     
     # Type de document
     document_type = Column(String(50), nullable=False)  # "resume" ou "cover_letter"
@@ -41,7 +46,11 @@ class GeneratedDocument(Base):
     # Relations
     user = relationship("User", back_populates="generated_documents")
     profile = relationship("Profile", back_populates="generated_documents")
-    job_offer = relationship("JobOffer", back_populates="generated_documents")
+    job_offer = relationship(
+        "JobOffer",
+        primaryjoin="foreign(GeneratedDocument.job_offer_id) == JobOffer.id",
+        back_populates="generated_documents"
+    )
     
     def __repr__(self):
         return f"<GeneratedDocument {self.document_type} for {self.job_offer_id}>"
@@ -1,9 +1,9 @@
 """
 Modèle JobOffer - Offre d'emploi analysée
 """
-from sqlalchemy import Column, String, Text, ForeignKey, DateTime
-from sqlalchemy.dialects.postgresql import UUID, JSONB
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Computed, Index, String, Text, ForeignKey, DateTime
+from sqlalchemy.dialects.postgresql import UUID, JSONB, TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from pgvector.sqlalchemy import Vector
 import uuid
@@ -11,16 +11,65 @@ import uuid
 from app.database import Base
 
 
+# Configurations plein texte : offres en français et en anglais
+SEARCH_CONFIGS = ("french", "english")
+
+
+def _weighted_tsvector(column: str, weight: str) -> str:
+    return " || ".join(
+        f"setweight(to_tsvector('{config}'::regconfig, coalesce({column}, '')), '{weight}')"
+        for config in SEARCH_CONFIGS
+    )
+
+
+SEARCH_VECTOR_EXPRESSION = " || ".join([
+    _weighted_tsvector("job_title", "A"),
+    _weighted_tsvector("requirements", "B"),
+    _weighted_tsvector("description", "C"),
+])
+
+
 class JobOffer(Base):
-    """Offre d'emploi analysée"""
+    """
+    Offre d'emploi analysée
+    
+    Table partitionnée par mois de scraped_at (job_offers_pAAAA_MM, créées à
+    l'avance) ; les offres sans scraped_at (saisies manuellement) et celles
+    conservées par la rétention vont dans job_offers_default. La rétention
+    retire des partitions entières : voir services/job_offer_partitions.py.
+    
+    PostgreSQL n'accepte sur une table partitionnée ni clé primaire ni index
+    unique sans la clé de partitionnement : `id` reste l'identité côté ORM
+    (index ix_job_offers_id), l'unicité de content_hash est portée par
+    JobOfferFingerprint et les tables liées n'ont pas de clé étrangère vers
+    job_offers.
+    """
     __tablename__ = "job_offers"
+    __table_args__ = (
+        Index("ix_job_offers_id", "id"),
+        # Pagination par curseur (app.core.pagination) : (created_at, id)
+        Index("ix_job_offers_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_job_offers_created_id", "created_at", "id"),
+        Index("ix_job_offers_search_vector", "search_vector", postgresql_using="gin"),
+        # Filtres « contient / ressemble à » (app.core.fuzzy_match)
+        Index(
+            "ix_job_offers_company_name_trgm", "company_name",
+            postgresql_using="gin", postgresql_ops={"company_name": "gin_trgm_ops"}
+        ),
+        Index(
+            "ix_job_offers_location_trgm", "location",
+            postgresql_using="gin", postgresql_ops={"location": "gin_trgm_ops"}
+        ),
+        {"postgresql_partition_by": "RANGE (scraped_at)"},
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     
     # Source
-    source_url = Column(String(1000))
+    source_url = Column(String(1000), index=True)  # Dédoublonnage à l'ingestion
     source_platform = Column(String(100))  # "LinkedIn", "Indeed", "Manual"
+    content_hash = Column(String(32), index=True)  # Empreinte de déduplication (unicité : JobOfferFingerprint)
     
     # Détails de l'offre
     company_name = Column(String(255))
@@ -37,15 +86,32 @@ class JobOffer(Base):
     # Embedding vectoriel pour recherche sémantique (Phase 4)
     embedding = Column(Vector(384), nullable=True)
     
+    # Recherche plein texte (FR + EN), calculée par PostgreSQL, index GIN
+    # Poids : A = titre, B = compétences requises, C = description
+    search_vector = deferred(Column(
+        TSVECTOR,
+        Computed(SEARCH_VECTOR_EXPRESSION, persisted=True)
+    ))
+    
     # Timestamps
-    scraped_at = Column(DateTime(timezone=True))
+    scraped_at = Column(DateTime(timezone=True), index=True)  # Clé de partitionnement ; feed, veille entreprise
     analyzed_at = Column(DateTime(timezone=True), server_default=func.now())
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relations
     user = relationship("User", back_populates="job_offers")
-    generated_documents = relationship("GeneratedDocument", back_populates="job_offer", cascade="all, delete-orphan")
-    applications = relationship("Application", back_populates="job_offer", cascade="all, delete-orphan")
+    generated_documents = relationship(
+        "GeneratedDocument",
+        primaryjoin="JobOffer.id == foreign(GeneratedDocument.job_offer_id)",
+        back_populates="job_offer",
+        cascade="all, delete-orphan"
+    )
+    applications = relationship(
+        "Application",
+        primaryjoin="JobOffer.id == foreign(Application.job_offer_id)",
+        back_populates="job_offer",
+        cascade="all, delete-orphan"
+    )
     
     def __repr__(self):
         return f"<JobOffer {self.job_title} @ {self.company_name}>"
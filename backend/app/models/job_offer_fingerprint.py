@@ -0,0 +1,29 @@
+"""
+Modèle JobOfferFingerprint - Empreintes de déduplication des offres scrapées
+"""
+from sqlalchemy import Column, String, DateTime
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class JobOfferFingerprint(Base):
+    """
+    Empreinte de contenu (job_offers.content_hash) d'une offre enregistrée
+    
+    Un index unique sur job_offers.content_hash est impossible depuis le
+    partitionnement : l'unicité est portée par cette table, remplie dans la
+    même transaction que l'insertion des offres (SearchService._save_offers_to_db).
+    Les empreintes des offres retirées par la rétention ou supprimées par
+    l'utilisateur sont supprimées avec elles ; une empreinte restée orpheline
+    (suppression en cascade d'un utilisateur) est reprise à l'ingestion.
+    """
+    __tablename__ = "job_offer_fingerprints"
+    
+    content_hash = Column(String(32), primary_key=True)
+    job_offer_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<JobOfferFingerprint {self.content_hash}>"
@@ -9,14 +9,21 @@ from app.database import Base
 
 
 class SearchResultsCache(Base):
-    """Cache des résultats de recherche pour éviter rescraping"""
+    """
+    Cache des résultats de recherche pour éviter rescraping
+    
+    Une entrée par (requête, source), partagée entre utilisateurs ; filtres
+    et préférences sont appliqués à la lecture (SearchService).
+    """
     __tablename__ = "search_results_cache"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    # NULL : entrée partagée (offres brutes d'une source, tous utilisateurs)
+    user_id = Column(UUID(as_uuid=True), nullable=True, index=True)
     
-    # Hash MD5 des paramètres de recherche pour unicité
+    # Hash MD5 de la requête (mots-clés, localisation, source, limite) pour unicité
     cache_key = Column(String(32), nullable=False, unique=True, index=True)
+    source = Column(String(100), nullable=True)  # Source scrapée (entrées partagées)
     
     # Paramètres de recherche (pour debug/audit)
     keywords = Column(String(500), nullable=False)
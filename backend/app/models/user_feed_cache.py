@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Float, DateTime, func
+from sqlalchemy import Column, Float, DateTime, UniqueConstraint, func
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
@@ -7,6 +7,10 @@ from app.database import Base
 
 class UserFeedCache(Base):
     __tablename__ = "user_feed_cache"
+    __table_args__ = (
+        # Cible du INSERT ... ON CONFLICT de SearchService._cache_scores
+        UniqueConstraint("user_id", "profile_id", "job_offer_id", name="uq_user_profile_offer_cache"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
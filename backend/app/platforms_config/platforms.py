@@ -1,12 +1,16 @@
-"""Configuration des plateformes de scraping"""
+"""Configuration des plateformes de scraping
+
+rate_limit : requêtes/heure autorisées (tous workers confondus, voir core/rate_limiter.py)
+burst : requêtes pouvant partir d'affilée avant que le débit ne s'applique
+"""
 
 SUPPORTED_PLATFORMS = {
-    "indeed": {"name": "Indeed", "base_url": "https://fr.indeed.com", "enabled": False},
-    "welcometothejungle": {"name": "WTTJ", "base_url": "https://www.welcometothejungle.com", "enabled": False},
-    "remoteok": {"name": "RemoteOK", "base_url": "https://remoteok.com", "enabled": True},
-    "adzuna": {"name": "Adzuna", "base_url": "https://www.adzuna.fr", "enabled": True},  # API avec demo keys
-    "themuse": {"name": "The Muse", "base_url": "https://www.themuse.com", "enabled": True},
-    "jsearch": {"name": "JSearch", "base_url": "https://jsearch.p.rapidapi.com", "enabled": True},  # Nécessite clé RapidAPI
+    "indeed": {"name": "Indeed", "base_url": "https://fr.indeed.com", "enabled": False, "rate_limit": 100, "burst": 2},
+    "welcometothejungle": {"name": "WTTJ", "base_url": "https://www.welcometothejungle.com", "enabled": False, "rate_limit": 200, "burst": 3},
+    "remoteok": {"name": "RemoteOK", "base_url": "https://remoteok.com", "enabled": True, "rate_limit": 500, "burst": 5},
+    "adzuna": {"name": "Adzuna", "base_url": "https://www.adzuna.fr", "enabled": True, "rate_limit": 1500, "burst": 5},  # API avec demo keys
+    "themuse": {"name": "The Muse", "base_url": "https://www.themuse.com", "enabled": True, "rate_limit": 500, "burst": 5},
+    "jsearch": {"name": "JSearch", "base_url": "https://jsearch.p.rapidapi.com", "enabled": True, "rate_limit": 3600, "burst": 2},  # Nécessite clé RapidAPI
 }
 
 def get_enabled_platforms():
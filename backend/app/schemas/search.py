@@ -50,13 +50,17 @@ class SearchResponse(BaseModel):
     scraped_count: Optional[int] = None
     deduplicated_count: Optional[int] = None
     saved_count: Optional[int] = None
+    skipped_count: Optional[int] = None  # Offres déjà en base (doublons ignorés)
     platforms_scraped: Optional[List[str]] = None  # Deprecated, use sources_used
     sources_used: Optional[List[str]] = None  # New multi-source field
+    timed_out_sources: Optional[List[str]] = None  # Sources hors délai (résultats partiels)
     cached: Optional[bool] = False  # Cache hit indicator
     search_params: Optional[dict] = None
     scraped_at: Optional[str] = None
     duration_seconds: Optional[float] = None
     message: Optional[str] = None
+    next_cursor: Optional[str] = None  # Curseur de la page suivante (liste paginée)
+    total_estimate: Optional[int] = None  # Total estimé (si include_total)
 
 
 class FeedRequest(BaseModel):
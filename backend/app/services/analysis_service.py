@@ -1,77 +1,140 @@
 """Service d'analyse simplifié"""
-from sqlalchemy import select
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+import numpy as np
+from sqlalchemy import cast, or_, select, func, text
+from pgvector.sqlalchemy import BIT, HALFVEC, Vector
 from sqlalchemy.orm import selectinload
+from app.config import settings
+from app.core.fuzzy_match import fuzzy_match
 from app.models.profile import Profile
 from app.models.job_offer import JobOffer
 from app.services.embedding_service import EmbeddingService
+from app.services.embedding_executor import embedding_executor
 
 class AnalysisService:
+    SEMANTIC_WEIGHT = 0.7
+    SKILLS_WEIGHT = 0.3
+    RECOMMENDATION_COLUMNS = (JobOffer.id, JobOffer.job_title, JobOffer.company_name, JobOffer.location)
+    
+    @staticmethod
+    def _profile_text(profile: Profile) -> str:
+        profile_text = f"{profile.title or ''} {profile.summary or ''}"
+        if profile.skills:
+            skills = " ".join([s.name for s in profile.skills])
+            profile_text += f" Compétences: {skills}"
+        return profile_text
+    
+    @staticmethod
+    def _job_text(job_offer: JobOffer) -> str:
+        job_text = f"{job_offer.job_title} {job_offer.company_name} {job_offer.description or ''}"
+        if job_offer.extracted_keywords:
+            job_text += " " + " ".join(job_offer.extracted_keywords[:15])
+        return job_text
+    
+    @staticmethod
+    def _profile_skills(profile: Profile) -> set:
+        return {skill.name.lower() for skill in (profile.skills or [])}
+    
+    @staticmethod
+    def _job_keywords(job_offer: JobOffer) -> List[str]:
+        """Mots-clés de l'offre en minuscules, sans doublon (dénominateur du score compétences)"""
+        return list(dict.fromkeys(keyword.lower() for keyword in (job_offer.extracted_keywords or [])))
+    
     @classmethod
-    async def calculate_compatibility_score(cls, profile_id: str, job_offer_id: str, db):
-        # Load profile
-        profile_query = select(Profile).where(Profile.id == profile_id).options(selectinload(Profile.skills))
-        profile_result = await db.execute(profile_query)
-        profile = profile_result.scalar_one_or_none()
+    async def score_offers_batch(cls, profile: Profile, offers: List[JobOffer]) -> List[int]:
+        """
+        Scores de compatibilité (0-100) d'un profil avec plusieurs offres, en une passe
         
-        if not profile:
-            raise ValueError("Profile not found")
+        Même formule que compatibility_details (0.7 similarité sémantique +
+        0.3 compétences sur les mots-clés distincts), calculée sur toutes les
+        offres à la fois :
+        - les embeddings manquants sont générés en un seul batch (non commités :
+          l'appelant valide la transaction)
+        - similarités cosinus : un produit matrice (offres × dim) · vecteur profil
+        - compétences : matrice binaire offres × mots-clés · vecteur des compétences
         
-        # Load job
-        job_query = select(JobOffer).where(JobOffer.id == job_offer_id)
-        job_result = await db.execute(job_query)
-        job_offer = job_result.scalar_one_or_none()
+        Le profil doit être chargé avec ses compétences (selectinload(Profile.skills)).
         
-        if not job_offer:
-            raise ValueError("Job offer not found")
+        Returns:
+            Scores dans l'ordre de `offers`
+        """
+        if not offers:
+            return []
         
-        # Generate/get embeddings
-        profile_embedding = profile.embedding
-        profile_needs_embedding = (profile_embedding is None)
-        
-        if profile_needs_embedding:
-            profile_text = f"{profile.title or ''} {profile.summary or ''}"
-            if profile.skills:
-                skills = " ".join([s.name for s in profile.skills])
-                profile_text += f" Compétences: {skills}"
-            profile_embedding = EmbeddingService.generate_embedding(profile_text)
-            profile.embedding = profile_embedding
-            await db.commit()
+        # Embeddings manquants : un seul appel au modèle pour profil + offres
+        missing = [offer for offer in offers if offer.embedding is None]
+        texts = [cls._job_text(offer) for offer in missing]
+        if profile.embedding is None:
+            texts.append(cls._profile_text(profile))
+        if texts:
+            embeddings = await embedding_executor.embed_many(texts)
+            if profile.embedding is None:
+                profile.embedding = embeddings.pop()
+            for offer, embedding in zip(missing, embeddings):
+                offer.embedding = embedding
         
-        # Convert to list if needed
-        if not isinstance(profile_embedding, list):
-            profile_embedding = list(profile_embedding)
+        # Similarité cosinus vectorisée
+        profile_vector = np.asarray(profile.embedding, dtype=np.float64)
+        offer_matrix = np.vstack([np.asarray(offer.embedding, dtype=np.float64) for offer in offers])
+        norms = np.linalg.norm(offer_matrix, axis=1) * np.linalg.norm(profile_vector)
+        dots = offer_matrix @ profile_vector
+        similarity = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+        semantic_scores = np.trunc(np.clip((similarity + 1) * 50, 0, 100))
         
-        job_embedding = job_offer.embedding
-        job_needs_embedding = (job_embedding is None)
+        # Recouvrement compétences / mots-clés de l'offre, vectorisé
+        vocabulary = {}
+        rows, cols = [], []
+        for row, offer in enumerate(offers):
+            for keyword in cls._job_keywords(offer):
+                rows.append(row)
+                cols.append(vocabulary.setdefault(keyword, len(vocabulary)))
+        keyword_matrix = np.zeros((len(offers), len(vocabulary)), dtype=np.float64)
+        keyword_matrix[rows, cols] = 1.0
+        skills_vector = np.zeros(len(vocabulary), dtype=np.float64)
+        for skill in cls._profile_skills(profile):
+            if skill in vocabulary:
+                skills_vector[vocabulary[skill]] = 1.0
+        keyword_counts = keyword_matrix.sum(axis=1)
+        matching = keyword_matrix @ skills_vector
+        skills_ratio = np.divide(matching, keyword_counts, out=np.zeros_like(matching), where=keyword_counts > 0)
+        skills_scores = np.trunc(skills_ratio * 100)
         
-        if job_needs_embedding:
-            job_text = f"{job_offer.job_title} {job_offer.company_name} {job_offer.description or ''}"
-            if job_offer.extracted_keywords:
-                job_text += " " + " ".join(job_offer.extracted_keywords[:15])
-            job_embedding = EmbeddingService.generate_embedding(job_text)
-            job_offer.embedding = job_embedding
-            await db.commit()
+        final_scores = np.trunc(cls.SEMANTIC_WEIGHT * semantic_scores + cls.SKILLS_WEIGHT * skills_scores)
+        return final_scores.astype(int).tolist()
+    
+    @classmethod
+    async def compatibility_details(cls, profile: Profile, job_offer: JobOffer) -> Dict:
+        """
+        Score de compatibilité détaillé d'un profil avec une offre
         
-        # Convert to list if needed
-        if not isinstance(job_embedding, list):
-            job_embedding = list(job_embedding)
+        Même formule et même normalisation que score_offers_batch. Les
+        embeddings manquants sont générés sur les objets (non commités :
+        l'appelant valide la transaction).
+        """
+        # Generate/get embeddings
+        missing = [obj for obj in (profile, job_offer) if obj.embedding is None]
+        if missing:
+            texts = [cls._profile_text(obj) if obj is profile else cls._job_text(obj) for obj in missing]
+            for obj, embedding in zip(missing, await embedding_executor.embed_many(texts)):
+                obj.embedding = embedding
         
         # Calculate similarity
-        similarity = EmbeddingService.cosine_similarity(profile_embedding, job_embedding)
+        similarity = EmbeddingService.cosine_similarity(list(profile.embedding), list(job_offer.embedding))
         score = int(max(0, min(100, (similarity + 1) * 50)))
         
         # Skills analysis
-        profile_skills = [s.name.lower() for s in profile.skills] if profile.skills else []
-        job_keywords = [k.lower() for k in (job_offer.extracted_keywords or [])]
+        profile_skills = cls._profile_skills(profile)
+        job_keywords = cls._job_keywords(job_offer)
         
-        matching_skills = list(set(profile_skills) & set(job_keywords))
-        missing_skills = list(set(job_keywords) - set(profile_skills))
+        matching_skills = [keyword for keyword in job_keywords if keyword in profile_skills]
+        missing_skills = [keyword for keyword in job_keywords if keyword not in profile_skills]
         
-        skills_match_ratio = len(matching_skills) / max(1, len(job_keywords)) if job_keywords else 0
+        skills_match_ratio = len(matching_skills) / len(job_keywords) if job_keywords else 0
         
         # Weighted final score
         skills_score = int(skills_match_ratio * 100)
-        final_score = int(0.7 * score + 0.3 * skills_score)
+        final_score = int(cls.SEMANTIC_WEIGHT * score + cls.SKILLS_WEIGHT * skills_score)
         
         return {
             "score": final_score,
@@ -87,3 +150,206 @@ class AnalysisService:
                 "final_weighted": final_score
             }
         }
+    
+    @classmethod
+    async def calculate_compatibility_score(cls, profile_id: str, job_offer_id: str, db):
+        # Load profile
+        profile_query = select(Profile).where(Profile.id == profile_id).options(selectinload(Profile.skills))
+        profile_result = await db.execute(profile_query)
+        profile = profile_result.scalar_one_or_none()
+        
+        if not profile:
+            raise ValueError("Profile not found")
+        
+        # Load job
+        job_query = select(JobOffer).where(JobOffer.id == job_offer_id)
+        job_result = await db.execute(job_query)
+        job_offer = job_result.scalar_one_or_none()
+        
+        if not job_offer:
+            raise ValueError("Job offer not found")
+        
+        needs_commit = profile.embedding is None or job_offer.embedding is None
+        details = await cls.compatibility_details(profile, job_offer)
+        if needs_commit:
+            await db.commit()
+        return details
+    
+    @staticmethod
+    def _recommendation_filters(
+        user_id,
+        max_age_days: Optional[int],
+        location: Optional[str],
+        job_type: Optional[str],
+        work_mode: Optional[str]
+    ) -> List:
+        """
+        Filtres appliqués avant le classement vectoriel
+        
+        Candidats : offres scrapées (partagées entre utilisateurs) et offres de
+        l'utilisateur ; les offres saisies manuellement (scraped_at NULL) par
+        les autres utilisateurs sont privées.
+        """
+        filters = [
+            JobOffer.embedding.isnot(None),
+            or_(JobOffer.scraped_at.isnot(None), JobOffer.user_id == user_id),
+        ]
+        if max_age_days:
+            # Borné sur scraped_at (clé de partitionnement) : seules les partitions récentes sont lues
+            now = datetime.now(timezone.utc)
+            filters.append(JobOffer.scraped_at.between(now - timedelta(days=max_age_days), now))
+        if location:
+            filters.append(fuzzy_match(JobOffer.location, location))
+        if job_type:
+            filters.append(JobOffer.job_type == job_type)
+        if work_mode:
+            filters.append(JobOffer.work_mode == work_mode)
+        return filters
+    
+    @staticmethod
+    def _ef_search(limit: int, filtered: bool) -> int:
+        """
+        Taille de la liste de candidats HNSW pour cette requête
+        
+        Les filtres sont appliqués après le parcours de l'index : plus ils sont
+        nombreux, plus il faut explorer de voisins pour en garder `limit`.
+        """
+        ef_search = max(settings.RECOMMENDATION_EF_SEARCH_MIN, limit * 2)
+        if filtered:
+            ef_search *= 4
+        return min(ef_search, settings.RECOMMENDATION_EF_SEARCH_MAX)
+    
+    @staticmethod
+    def ann_distance(mode: str, query_vector):
+        """
+        Expression de distance servie par l'index HNSW du mode de stockage
+        
+        - "float"  : embedding <=> q (job_offer_embedding_idx, vector_cosine_ops)
+        - "half"   : embedding::halfvec <=> q (index d'expression halfvec, 2x plus petit)
+        - "binary" : binary_quantize(embedding)::bit <~> binary_quantize(q)
+                     (distance de Hamming, index 32x plus petit, à re-classer)
+        
+        L'expression doit être identique à celle de l'index (migration
+        add_quantized_hnsw_idx_001) pour que le planificateur l'utilise.
+        """
+        dim = EmbeddingService.EMBEDDING_DIM
+        if mode == "half":
+            return cast(JobOffer.embedding, HALFVEC(dim)).cosine_distance(query_vector)
+        if mode == "binary":
+            query_bits = cast(func.binary_quantize(cast(query_vector, Vector(dim))), BIT(dim))
+            return cast(func.binary_quantize(JobOffer.embedding), BIT(dim)).hamming_distance(query_bits)
+        return JobOffer.embedding.cosine_distance(query_vector)
+    
+    @classmethod
+    def exact_query(cls, query_vector, filters: List, limit: int):
+        """Top-K exact : CTE matérialisée, l'index HNSW n'est pas utilisé"""
+        candidates_cte = select(*cls.RECOMMENDATION_COLUMNS, JobOffer.embedding).where(*filters).cte(
+            "candidates"
+        ).prefix_with("MATERIALIZED")
+        exact_distance = candidates_cte.c.embedding.cosine_distance(query_vector).label("distance")
+        return select(
+            candidates_cte.c.id,
+            candidates_cte.c.job_title,
+            candidates_cte.c.company_name,
+            candidates_cte.c.location,
+            exact_distance
+        ).order_by(exact_distance).limit(limit)
+    
+    @classmethod
+    def ann_query(cls, query_vector, filters: List, limit: int, mode: str):
+        """
+        Requête top-K par l'index HNSW du mode donné
+        
+        En mode quantifié, l'index ne sert qu'à présélectionner
+        limit × VECTOR_RERANK_FACTOR candidats, re-classés ensuite par la
+        distance cosinus exacte sur les vecteurs float32.
+        """
+        columns = cls.RECOMMENDATION_COLUMNS
+        if mode == "float":
+            distance = JobOffer.embedding.cosine_distance(query_vector).label("distance")
+            return select(*columns, distance).where(*filters).order_by(distance).limit(limit)
+        
+        shortlist = select(*columns, JobOffer.embedding).where(*filters).order_by(
+            cls.ann_distance(mode, query_vector)
+        ).limit(limit * settings.VECTOR_RERANK_FACTOR).subquery("shortlist")
+        exact_distance = shortlist.c.embedding.cosine_distance(query_vector).label("distance")
+        return select(
+            shortlist.c.id,
+            shortlist.c.job_title,
+            shortlist.c.company_name,
+            shortlist.c.location,
+            exact_distance
+        ).order_by(exact_distance).limit(limit)
+    
+    @classmethod
+    async def get_recommendations(
+        cls,
+        db,
+        profile_id,
+        user_id,
+        limit: int = 10,
+        max_age_days: Optional[int] = None,
+        location: Optional[str] = None,
+        job_type: Optional[str] = None,
+        work_mode: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Offres les plus proches du profil (top-K par distance cosinus pgvector)
+        
+        - peu de candidats après filtrage (< RECOMMENDATION_EXACT_THRESHOLD) :
+          recherche exacte sur les seuls candidats filtrés
+        - sinon : parcours de l'index HNSW avec hnsw.ef_search ajusté à la
+          requête ; si les filtres laissent moins de `limit` résultats dans les
+          voisins explorés, repli sur la recherche exacte
+        
+        VECTOR_SEARCH_MODE choisit l'index parcouru : float32 (défaut), ou
+        halfvec / binaire suivis d'un re-classement exact en float32 des
+        limit × VECTOR_RERANK_FACTOR meilleurs candidats.
+        
+        Args:
+            user_id: propriétaire du profil (seules ses offres manuelles sont candidates)
+        
+        Returns:
+            Liste de dicts (job_offer_id, job_title, company_name, location, score)
+        """
+        result = await db.execute(select(Profile.embedding).where(Profile.id == profile_id))
+        profile_embedding = result.scalar_one_or_none()
+        if profile_embedding is None:
+            raise ValueError("Profile embedding not found")
+        
+        filters = cls._recommendation_filters(user_id, max_age_days, location, job_type, work_mode)
+        filtered = any((max_age_days, location, job_type, work_mode))
+        
+        # Nombre de candidats, borné : le comptage s'arrête au seuil
+        threshold = settings.RECOMMENDATION_EXACT_THRESHOLD
+        bounded = select(JobOffer.id).where(*filters).limit(threshold + 1).subquery()
+        result = await db.execute(select(func.count()).select_from(bounded))
+        candidates = result.scalar() or 0
+        
+        rows = []
+        if candidates > threshold:
+            mode = settings.VECTOR_SEARCH_MODE
+            fetch = limit if mode == "float" else limit * settings.VECTOR_RERANK_FACTOR
+            ef_search = cls._ef_search(fetch, filtered=filtered)
+            # SET n'accepte pas de paramètre lié ; valeur entière calculée ci-dessus
+            await db.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+            query = cls.ann_query(profile_embedding, filters, limit, mode)
+            result = await db.execute(query)
+            rows = result.all()
+        
+        if len(rows) < min(limit, candidates):
+            query = cls.exact_query(profile_embedding, filters, limit)
+            result = await db.execute(query)
+            rows = result.all()
+        
+        return [
+            {
+                "job_offer_id": row[0],
+                "job_title": row[1],
+                "company_name": row[2],
+                "location": row[3],
+                # distance cosinus ∈ [0, 2] → même échelle que le score sémantique
+                "score": round(max(0.0, min(100.0, (2 - float(row[4])) * 50)), 1)
+            }
+            for row in rows
+        ]
@@ -1,12 +1,13 @@
 """
 Application Service - Gestion des candidatures
 """
-from typing import List, Optional
+from typing import Optional
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
 from datetime import datetime
 
+from app.core.pagination import Page, paginate
 from app.models.application import Application, ApplicationStatus
 from app.schemas.application import (
     ApplicationCreate,
@@ -47,20 +48,19 @@ class ApplicationService:
         db: AsyncSession,
         user_id: UUID,
         status: Optional[ApplicationStatus] = None,
-        skip: int = 0,
-        limit: int = 100
-    ) -> List[Application]:
-        """Récupérer les candidatures d'un utilisateur"""
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> Page[Application]:
+        """Récupérer les candidatures d'un utilisateur, plus récentes d'abord (pagination par curseur)"""
         query = select(Application).where(Application.user_id == user_id)
         
         if status:
             query = query.where(Application.status == status.value)
         
-        query = query.order_by(Application.applied_at.desc())
-        query = query.offset(skip).limit(limit)
-        
-        result = await db.execute(query)
-        return result.scalars().all()
+        return await paginate(
+            db, query, (Application.applied_at, Application.id), cursor, limit, include_total
+        )
 
     @staticmethod
     async def get_application_by_id(
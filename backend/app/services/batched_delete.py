@@ -0,0 +1,139 @@
+"""
+BatchedDelete - Suppression par lots des lignes expirées (tâches de rétention)
+
+Un DELETE non borné sur une grosse table verrouille longtemps les lignes,
+produit d'un coup tout le WAL et laisse la table gonflée de lignes mortes.
+Ici une purge (PurgeJob) supprime les lignes par lots de clés primaires :
+- sélection de batch_size ids par id croissant après le checkpoint
+  (pagination par clé, pas d'OFFSET), puis DELETE ... WHERE id IN (...)
+  qui revérifie la condition ; lignes dépendantes supprimées dans la même
+  transaction, un COMMIT par lot
+- pause de sleep_seconds entre deux lots : l'API, l'autovacuum et la
+  réplication suivent
+- reprenable : le dernier id traité (checkpoint) est conservé dans Redis ;
+  une purge interrompue (worker arrêté) reprend où elle s'était arrêtée,
+  une purge terminée repart du début au passage suivant
+- progression : callback appelé après chaque lot (supprimées, lots, reste estimé)
+
+Utilisé par les tâches de la file Celery `maintenance` (tasks/maintenance_tasks.py).
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.pagination import estimate_count
+from app.core.redis_client import BatchCheckpoints
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PurgeJob:
+    """
+    Lignes à purger d'une table
+    
+    where() est réévaluée à chaque lot (horodatage courant) ; dependents liste
+    les (table, colonne) dont les lignes qui référencent les ids supprimés
+    partent avec eux (tables sans clé étrangère vers la table purgée).
+    """
+    name: str
+    table: object  # Table ou table() SQLAlchemy avec une colonne `id`
+    where: Callable
+    dependents: Tuple[Tuple[object, str], ...] = ()
+
+
+class BatchedDelete:
+    """Moteur de purge par lots, throttlé et reprenable"""
+    
+    # Clés jobhunter:purge:{job}:checkpoint / :lock (un DELETE revérifie la condition sans verrou)
+    checkpoints = BatchCheckpoints("jobhunter:purge")
+    
+    # ------------------------------------------------------------------
+    # Purge
+    # ------------------------------------------------------------------
+    
+    async def run_batch(self, db: AsyncSession, job: PurgeJob, batch_size: int) -> Dict:
+        """
+        Supprime le lot suivant après le checkpoint
+        
+        Returns:
+            {"deleted": lignes supprimées, "done": True si la purge est terminée}
+        """
+        id_column = job.table.c.id
+        checkpoint = await self.checkpoints.get_checkpoint(job.name)
+        
+        query = select(id_column).where(job.where())
+        if checkpoint is not None:
+            query = query.where(id_column > checkpoint)
+        result = await db.execute(query.order_by(id_column).limit(batch_size))
+        ids = result.scalars().all()
+        
+        if not ids:
+            # Fin du passage : le prochain repart du début
+            await self.checkpoints.set_checkpoint(job.name, None)
+            return {"deleted": 0, "done": True}
+        
+        # La condition est revérifiée : une ligne redevenue valide entre-temps est gardée
+        result = await db.execute(
+            delete(job.table).where(id_column.in_(ids), job.where()).returning(id_column)
+        )
+        deleted = result.scalars().all()
+        for table, column in job.dependents:
+            if deleted:
+                await db.execute(delete(table).where(table.c[column].in_(deleted)))
+        await db.commit()
+        
+        await self.checkpoints.set_checkpoint(job.name, ids[-1])
+        return {"deleted": len(deleted), "done": len(ids) < batch_size}
+    
+    async def remaining(self, db: AsyncSession, job: PurgeJob) -> int:
+        """Lignes restant à purger, estimées par le planificateur (coût constant)"""
+        return await estimate_count(db, select(job.table.c.id).where(job.where()))
+    
+    async def run(
+        self,
+        db: AsyncSession,
+        job: PurgeJob,
+        batch_size: Optional[int] = None,
+        sleep_seconds: Optional[float] = None,
+        max_batches: Optional[int] = None,
+        progress: Optional[Callable[[Dict], None]] = None
+    ) -> Dict:
+        """
+        Enchaîne au plus max_batches lots (None = jusqu'à la fin), avec une pause entre deux lots
+        
+        Args:
+            progress: appelé après chaque lot avec {"job", "deleted", "batches", "remaining"}
+        
+        Returns:
+            {"job", "deleted", "batches", "done"}
+        """
+        batch_size = batch_size or settings.PURGE_BATCH_SIZE
+        sleep_seconds = settings.PURGE_SLEEP_SECONDS if sleep_seconds is None else sleep_seconds
+        
+        stats = {"job": job.name, "deleted": 0, "batches": 0, "done": False}
+        while max_batches is None or stats["batches"] < max_batches:
+            batch = await self.run_batch(db, job, batch_size)
+            stats["batches"] += 1
+            stats["deleted"] += batch["deleted"]
+            if batch["done"]:
+                stats["done"] = True
+                break
+            
+            remaining = await self.remaining(db, job)
+            logger.info(f"[BatchedDelete] {job.name}: {stats['deleted']} supprimée(s), "
+                        f"{stats['batches']} lot(s), reste ~{remaining}")
+            if progress:
+                progress({**stats, "remaining": remaining})
+            await asyncio.sleep(sleep_seconds)
+        
+        return stats
+
+
+# Instance globale
+batched_delete = BatchedDelete()
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_, desc
 from sqlalchemy.orm import selectinload
 
+from app.core.fuzzy_match import fuzzy_match
 from app.models.watched_company import WatchedCompany, UserCompanyWatch
 from app.models.job_offer import JobOffer
 from app.models.profile import Profile
@@ -267,14 +268,15 @@ class CompanyWatchService:
                 "message": "Entreprise non trouvée"
             }
         
-        # Récupérer les offres de cette entreprise (30 derniers jours)
-        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        # Récupérer les offres de cette entreprise (30 derniers jours, partitions récentes uniquement)
+        now = datetime.utcnow()
+        thirty_days_ago = now - timedelta(days=30)
         offers_query = (
             select(JobOffer)
             .where(
                 and_(
-                    JobOffer.company_name.ilike(f"%{company.company_name}%"),
-                    JobOffer.scraped_at >= thirty_days_ago
+                    fuzzy_match(JobOffer.company_name, company.company_name),
+                    JobOffer.scraped_at.between(thirty_days_ago, now)
                 )
             )
             .order_by(desc(JobOffer.scraped_at))
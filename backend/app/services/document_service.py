@@ -1,13 +1,14 @@
 """
 Service pour gérer les documents générés (CRUD + limite génération)
 """
-from typing import Optional, List
+from typing import Optional
 from datetime import datetime, date
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 
+from app.core.pagination import Page, paginate
 from app.models.generated_document import GeneratedDocument
 from app.models.profile import Profile
 from app.models.job_offer import JobOffer
@@ -112,19 +113,23 @@ class DocumentService:
         db: AsyncSession,
         user_id: UUID,
         document_type: Optional[str] = None,
-        limit: int = 50
-    ) -> List[GeneratedDocument]:
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> Page[GeneratedDocument]:
         """
-        Liste les documents d'un utilisateur
+        Liste les documents d'un utilisateur, plus récents d'abord
         
         Args:
             db: Session de base de données
             user_id: ID de l'utilisateur
             document_type: Filtre par type ("resume" ou "cover_letter")
             limit: Nombre maximum de résultats
+            cursor: Curseur de la page précédente (None = première page)
+            include_total: Joindre une estimation du nombre total
             
         Returns:
-            Liste de GeneratedDocument
+            Page de GeneratedDocument (+ curseur de la page suivante)
         """
         query = (
             select(GeneratedDocument)
@@ -133,15 +138,14 @@ class DocumentService:
                 selectinload(GeneratedDocument.profile)
             )
             .where(GeneratedDocument.user_id == user_id)
-            .order_by(GeneratedDocument.generated_at.desc())
-            .limit(limit)
         )
         
         if document_type:
             query = query.where(GeneratedDocument.document_type == document_type)
         
-        result = await db.execute(query)
-        return list(result.scalars().all())
+        return await paginate(
+            db, query, (GeneratedDocument.generated_at, GeneratedDocument.id), cursor, limit, include_total
+        )
     
     @staticmethod
     async def update_document_content(
@@ -0,0 +1,108 @@
+"""
+Backends d'inférence pour EmbeddingService (sélection : settings.EMBEDDING_BACKEND)
+
+- "torch" : SentenceTransformer (PyTorch), comportement historique
+- "onnx"  : graphe ONNX exporté (scripts/export_onnx_model.py) exécuté par
+  ONNX Runtime sur CPU, optionnellement quantifié int8 (quantification
+  dynamique) : empreinte mémoire et latence nettement plus faibles que PyTorch
+
+Les deux backends exposent encode(texts) -> np.ndarray (n, 384) et produisent
+des vecteurs normalisés (L2) comparables : all-MiniLM-L6-v2 = mean pooling
+des états cachés puis normalisation.
+"""
+import logging
+import os
+from typing import List, Optional
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TorchEmbeddingBackend:
+    """SentenceTransformer sur PyTorch"""
+    
+    def __init__(self, model_name: str):
+        import torch
+        from sentence_transformers import SentenceTransformer
+        
+        if settings.EMBEDDING_NUM_THREADS:
+            torch.set_num_threads(settings.EMBEDDING_NUM_THREADS)
+        self.name = "torch"
+        self.model = SentenceTransformer(model_name)
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, convert_to_numpy=True)
+
+
+class OnnxEmbeddingBackend:
+    """Graphe ONNX (fp32 ou int8) sur ONNX Runtime, CPU"""
+    
+    MAX_LENGTH = 256  # longueur max de séquence de all-MiniLM-L6-v2
+    
+    def __init__(self, model_name: str):
+        # Dépendance optionnelle : seulement requise si EMBEDDING_BACKEND=onnx
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+        
+        model_dir = settings.EMBEDDING_ONNX_DIR
+        filename = "model_int8.onnx" if settings.EMBEDDING_ONNX_QUANTIZED else "model.onnx"
+        model_path = os.path.join(model_dir, filename)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"Modèle ONNX introuvable: {model_path} "
+                f"(générer avec scripts/export_onnx_model.py)"
+            )
+        
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if settings.EMBEDDING_NUM_THREADS:
+            options.intra_op_num_threads = settings.EMBEDDING_NUM_THREADS
+            options.inter_op_num_threads = 1
+        
+        self.name = "onnx-int8" if settings.EMBEDDING_ONNX_QUANTIZED else "onnx"
+        # Tokenizer sauvegardé à côté du graphe par le script d'export (sinon hub)
+        tokenizer_source = model_dir if os.path.exists(os.path.join(model_dir, "tokenizer.json")) else model_name
+        self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_source)
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+    
+    def encode(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.MAX_LENGTH,
+            return_tensors="np"
+        )
+        inputs = {
+            name: encoded[name].astype(np.int64)
+            for name in ("input_ids", "attention_mask", "token_type_ids")
+            if name in self.input_names and name in encoded
+        }
+        token_embeddings = self.session.run(None, inputs)[0]
+        
+        # Mean pooling sur les tokens réels puis normalisation L2
+        mask = inputs["attention_mask"][..., None].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        embeddings = summed / counts
+        norms = np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings / norms
+
+
+BACKENDS = {
+    "torch": TorchEmbeddingBackend,
+    "onnx": OnnxEmbeddingBackend,
+}
+
+
+def load_backend(model_name: str, backend: Optional[str] = None):
+    """Instancie le backend configuré (ou celui demandé)"""
+    backend = (backend or settings.EMBEDDING_BACKEND).lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"EMBEDDING_BACKEND inconnu: {backend} (attendu: {', '.join(BACKENDS)})")
+    logger.info(f"Loading embedding backend '{backend}' for {model_name}")
+    return BACKENDS[backend](model_name)
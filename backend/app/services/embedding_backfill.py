@@ -0,0 +1,161 @@
+"""
+EmbeddingBackfill - Génération par lots des embeddings manquants
+
+Utilisé par les tâches de la file Celery `embeddings` et par generate_embeddings.py :
+- sélection par lots des lignes `embedding IS NULL`, parcourues par id
+  croissant (pagination par clé, pas d'OFFSET)
+- encodage d'un lot en un appel (EmbeddingExecutor → generate_embeddings_batch,
+  cache inclus) puis un seul UPDATE groupé par clé primaire
+- idempotent : l'UPDATE ne touche que les lignes encore sans embedding
+- reprenable : le dernier id traité (checkpoint) est conservé dans Redis ; un
+  passage interrompu reprend où il s'était arrêté, un passage terminé repart
+  du début (les nouvelles lignes d'id inférieur sont alors rattrapées)
+"""
+import logging
+import uuid
+from typing import Dict, List
+
+from sqlalchemy import bindparam, select, update, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.redis_client import BatchCheckpoints
+from app.models.job_offer import JobOffer
+from app.models.profile import Profile
+from app.services.embedding_executor import embedding_executor
+from app.services.embedding_service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingBackfill:
+    """Backfill des embeddings de job_offers et profiles"""
+    
+    MODELS = {
+        "job_offers": JobOffer,
+        "profiles": Profile,
+    }
+    # Clés jobhunter:embeddings:backfill:{table}:checkpoint / :lock (l'UPDATE reste idempotent sans verrou)
+    checkpoints = BatchCheckpoints("jobhunter:embeddings:backfill")
+    
+    # ------------------------------------------------------------------
+    # Textes à encoder
+    # ------------------------------------------------------------------
+    
+    @staticmethod
+    def offer_text(offer: JobOffer) -> str:
+        return EmbeddingService.job_offer_to_text({
+            "job_title": offer.job_title,
+            "company_name": offer.company_name,
+            "description": offer.description,
+            "requirements": offer.requirements,
+            "extracted_keywords": offer.extracted_keywords or [],
+        })
+    
+    @staticmethod
+    def profile_text(profile: Profile) -> str:
+        return EmbeddingService.profile_to_text({
+            "title": profile.title,
+            "summary": profile.summary,
+            "experiences": [
+                {"position": exp.title, "company": exp.company, "description": exp.description}
+                for exp in profile.experiences
+            ],
+            "skills": [{"name": skill.name} for skill in profile.skills],
+            "educations": [
+                {"degree": edu.degree, "field_of_study": edu.field_of_study or ""}
+                for edu in profile.educations
+            ],
+        })
+    
+    def _select_missing(self, table: str):
+        model = self.MODELS[table]
+        query = select(model).where(model.embedding.is_(None))
+        if model is Profile:
+            query = query.options(
+                selectinload(Profile.experiences),
+                selectinload(Profile.skills),
+                selectinload(Profile.educations),
+            )
+        return query
+    
+    def _text(self, table: str, row) -> str:
+        return self.offer_text(row) if table == "job_offers" else self.profile_text(row)
+    
+    # ------------------------------------------------------------------
+    # Encodage + écriture
+    # ------------------------------------------------------------------
+    
+    async def _embed_rows(self, db: AsyncSession, table: str, rows: List) -> int:
+        """Encode un lot et l'écrit en un UPDATE groupé ; retourne le nombre de lignes"""
+        if not rows:
+            return 0
+        model = self.MODELS[table]
+        ids = [row.id for row in rows]
+        texts = [self._text(table, row) for row in rows]
+        embeddings = await embedding_executor.embed_many(texts)
+        
+        # Les objets chargés ne doivent pas être ré-écrits par le flush de l'ORM
+        db.expunge_all()
+        table_ = model.__table__
+        stmt = (
+            update(table_)
+            .where(table_.c.id == bindparam("row_id"), table_.c.embedding.is_(None))
+            .values(embedding=bindparam("row_embedding"))
+        )
+        await db.execute(
+            stmt,
+            [{"row_id": row_id, "row_embedding": embedding} for row_id, embedding in zip(ids, embeddings)]
+        )
+        await db.commit()
+        return len(rows)
+    
+    async def run_batch(self, db: AsyncSession, table: str, batch_size: int) -> Dict:
+        """
+        Traite le lot suivant après le checkpoint
+        
+        Returns:
+            {"processed": lignes encodées, "done": True si le passage est terminé}
+        """
+        model = self.MODELS[table]
+        checkpoint = await self.checkpoints.get_checkpoint(table)
+        
+        query = self._select_missing(table)
+        if checkpoint is not None:
+            query = query.where(model.id > checkpoint)
+        result = await db.execute(query.order_by(model.id).limit(batch_size))
+        rows = result.scalars().all()
+        
+        if not rows:
+            # Fin du passage : le prochain repart du début
+            await self.checkpoints.set_checkpoint(table, None)
+            return {"processed": 0, "done": True}
+        
+        last_id = rows[-1].id
+        processed = await self._embed_rows(db, table, rows)
+        await self.checkpoints.set_checkpoint(table, last_id)
+        return {"processed": processed, "done": len(rows) < batch_size}
+    
+    async def embed_job_offers(self, db: AsyncSession, offer_ids: List[str]) -> int:
+        """Encode des offres précises (nouvelles offres scrapées) encore sans embedding"""
+        if not offer_ids:
+            return 0
+        query = self._select_missing("job_offers").where(
+            JobOffer.id.in_([uuid.UUID(str(offer_id)) for offer_id in offer_ids])
+        )
+        result = await db.execute(query)
+        return await self._embed_rows(db, "job_offers", result.scalars().all())
+    
+    async def backlog(self, db: AsyncSession) -> Dict[str, int]:
+        """Nombre de lignes sans embedding, par table"""
+        backlog = {}
+        for table, model in self.MODELS.items():
+            result = await db.execute(
+                select(func.count()).select_from(model).where(model.embedding.is_(None))
+            )
+            backlog[table] = result.scalar() or 0
+        return backlog
+
+
+# Instance globale
+embedding_backfill = EmbeddingBackfill()
@@ -0,0 +1,156 @@
+"""
+Cache des embeddings adressé par contenu
+
+Les mêmes textes sont ré-encodés en permanence (offres identiques sauvegardées
+par plusieurs utilisateurs, re-scraping après nettoyage, backfills). La clé est
+sha256(nom du modèle + texte normalisé) : un même texte donne le même vecteur
+quel que soit l'appelant, et changer de modèle invalide naturellement le cache.
+
+Deux niveaux :
+- LRU en mémoire, borné (EMBEDDING_CACHE_LRU_SIZE entrées), par processus
+- Redis, partagé entre workers API et Celery (vecteurs float32 bruts, TTL)
+
+EmbeddingService consulte le cache de façon transparente. Ses méthodes sont
+synchrones (appelées depuis le pool de threads de l'EmbeddingExecutor) : le
+niveau Redis utilise donc un client redis synchrone dédié, pas redis.asyncio.
+"""
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import redis
+from redis.exceptions import RedisError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalisation avant hachage (espaces uniquement : le texte encodé reste identique)"""
+    return _WHITESPACE_RE.sub(" ", text or "").strip()
+
+
+class EmbeddingCache:
+    """Cache LRU (processus) + Redis (partagé) des vecteurs d'embedding"""
+    
+    KEY_PREFIX = "jobhunter:embedding:"
+    REDIS_RETRY_AFTER = 30  # secondes sans Redis après une erreur
+    
+    def __init__(self):
+        self._lru: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis: Optional[redis.Redis] = None
+        self._redis_disabled_until = 0.0
+        self._metrics: Dict[str, int] = {
+            "lru_hits": 0,
+            "redis_hits": 0,
+            "misses": 0,
+            "redis_errors": 0,
+        }
+    
+    @staticmethod
+    def make_key(model_name: str, text: str) -> str:
+        return hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode()).hexdigest()
+    
+    def _get_redis(self) -> Optional[redis.Redis]:
+        if not settings.EMBEDDING_CACHE_REDIS_ENABLED:
+            return None
+        if time.monotonic() < self._redis_disabled_until:
+            return None
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(
+                settings.REDIS_URL,
+                decode_responses=False,
+                socket_connect_timeout=2,
+                socket_timeout=2,
+            )
+        return self._redis
+    
+    def _redis_failed(self, e: Exception):
+        self._metrics["redis_errors"] += 1
+        self._redis_disabled_until = time.monotonic() + self.REDIS_RETRY_AFTER
+        logger.warning(f"[EmbeddingCache] Redis indisponible ({e}), cache mémoire seul pendant {self.REDIS_RETRY_AFTER}s")
+    
+    def _remember(self, key: str, vector: List[float]):
+        with self._lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > settings.EMBEDDING_CACHE_LRU_SIZE:
+                self._lru.popitem(last=False)
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[float]]:
+        """Vecteurs en cache pour ces clés (absentes du résultat si inconnues)"""
+        found: Dict[str, List[float]] = {}
+        missing: List[str] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                vector = self._lru.get(key)
+                if vector is None:
+                    missing.append(key)
+                else:
+                    self._lru.move_to_end(key)
+                    found[key] = vector
+        self._metrics["lru_hits"] += len(found)
+        
+        redis_hits = 0
+        client = self._get_redis() if missing else None
+        if client is not None:
+            try:
+                payloads = client.mget([self.KEY_PREFIX + key for key in missing])
+            except (RedisError, OSError) as e:
+                self._redis_failed(e)
+                payloads = [None] * len(missing)
+            for key, payload in zip(missing, payloads):
+                if payload is None:
+                    continue
+                vector = np.frombuffer(payload, dtype=np.float32).tolist()
+                found[key] = vector
+                self._remember(key, vector)
+                redis_hits += 1
+        
+        self._metrics["redis_hits"] += redis_hits
+        self._metrics["misses"] += len(missing) - redis_hits
+        return found
+    
+    def set_many(self, vectors: Dict[str, List[float]]):
+        """Enregistre des vecteurs dans les deux niveaux"""
+        if not vectors:
+            return
+        for key, vector in vectors.items():
+            self._remember(key, vector)
+        
+        client = self._get_redis()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, vector in vectors.items():
+                pipe.set(
+                    self.KEY_PREFIX + key,
+                    np.asarray(vector, dtype=np.float32).tobytes(),
+                    ex=settings.EMBEDDING_CACHE_TTL
+                )
+            pipe.execute()
+        except (RedisError, OSError) as e:
+            self._redis_failed(e)
+    
+    def get_metrics(self) -> Dict:
+        """Compteurs cumulés (processus courant)"""
+        metrics = dict(self._metrics)
+        lookups = metrics["lru_hits"] + metrics["redis_hits"] + metrics["misses"]
+        hits = metrics["lru_hits"] + metrics["redis_hits"]
+        metrics["hit_rate"] = round(hits / lookups, 3) if lookups else 0
+        metrics["lru_size"] = len(self._lru)
+        return metrics
+
+
+# Instance globale (une par processus)
+embedding_cache = EmbeddingCache()
@@ -0,0 +1,165 @@
+"""
+EmbeddingExecutor - Inférence d'embeddings hors de la boucle d'événements
+
+SentenceTransformer.encode est synchrone (dizaines de ms par texte) : appelé
+directement depuis une route async, il bloque toute l'API pendant l'encodage.
+
+L'exécuteur :
+- exécute l'inférence dans un pool de threads dédié (PyTorch libère le GIL
+  pendant le calcul, la boucle reste disponible)
+- regroupe les demandes concurrentes en micro-batches : la première demande
+  ouvre une fenêtre de EMBEDDING_BATCH_MAX_WAIT_MS, fermée plus tôt si
+  EMBEDDING_BATCH_MAX_SIZE textes sont en attente ; un seul appel
+  generate_embeddings_batch sert alors tous les appelants
+- rend à chaque appelant un Future résolu avec son propre vecteur
+
+Usage:
+    embedding = await embedding_executor.embed(text)
+    embeddings = await embedding_executor.embed_many(texts)
+"""
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.embedding_service import EmbeddingService
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingExecutor:
+    """Micro-batching des encodages, exécutés dans un pool de threads dédié"""
+    
+    def __init__(self):
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._metrics: Dict[str, int] = {
+            "requests": 0,
+            "texts": 0,
+            "batches": 0,
+            "max_batch_size": 0,
+            "errors": 0,
+        }
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=settings.EMBEDDING_EXECUTOR_WORKERS,
+                thread_name_prefix="embedding"
+            )
+        return self._pool
+    
+    def _get_queue(self) -> asyncio.Queue:
+        """File de la boucle courante (recréée si la boucle change, ex: tâches Celery)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._worker = loop.create_task(self._run())
+        return self._queue
+    
+    async def embed(self, text: str) -> List[float]:
+        """Embedding d'un texte (regroupé avec les demandes concurrentes)"""
+        embeddings = await self.embed_many([text])
+        return embeddings[0]
+    
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        """Embeddings de plusieurs textes, dans l'ordre"""
+        if not texts:
+            return []
+        self._metrics["requests"] += 1
+        
+        queue = self._get_queue()
+        loop = asyncio.get_running_loop()
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        futures: List[Tuple[int, asyncio.Future]] = []
+        for index, text in enumerate(texts):
+            if not text or not text.strip():
+                # Même convention que generate_embedding : vecteur nul
+                results[index] = [0.0] * EmbeddingService.EMBEDDING_DIM
+                continue
+            future = loop.create_future()
+            queue.put_nowait((text, future))
+            futures.append((index, future))
+        
+        for index, future in futures:
+            results[index] = await future
+        return results
+    
+    async def _collect_batch(self, queue: asyncio.Queue) -> List[Tuple[str, asyncio.Future]]:
+        """Attend une demande puis regroupe les suivantes (taille / délai max)"""
+        batch = [await queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.EMBEDDING_BATCH_MAX_WAIT_MS / 1000
+        while len(batch) < settings.EMBEDDING_BATCH_MAX_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        # Demandes arrivées pendant l'inférence précédente : déjà prêtes, sans attente
+        while len(batch) < settings.EMBEDDING_BATCH_MAX_SIZE and not queue.empty():
+            batch.append(queue.get_nowait())
+        return batch
+    
+    async def _run(self):
+        """Boucle de traitement : un micro-batch à la fois"""
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = await self._collect_batch(queue)
+            # Appelants annulés entre-temps : inutile de les encoder
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+            
+            texts = [text for text, _ in batch]
+            self._metrics["batches"] += 1
+            self._metrics["texts"] += len(texts)
+            self._metrics["max_batch_size"] = max(self._metrics["max_batch_size"], len(texts))
+            try:
+                embeddings = await loop.run_in_executor(
+                    self._get_pool(), EmbeddingService.generate_embeddings_batch, texts
+                )
+            except Exception as e:
+                self._metrics["errors"] += 1
+                logger.error(f"[EmbeddingExecutor] Échec d'un batch de {len(texts)} textes: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (_, future), embedding in zip(batch, embeddings):
+                if not future.done():
+                    future.set_result(embedding)
+    
+    async def shutdown(self):
+        """Arrête la boucle de traitement et le pool de threads"""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            if self._loop is asyncio.get_running_loop():
+                try:
+                    await self._worker
+                except asyncio.CancelledError:
+                    pass
+        self._worker = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+    
+    def get_metrics(self) -> Dict:
+        """Compteurs cumulés (processus courant)"""
+        metrics = dict(self._metrics)
+        batches = metrics["batches"]
+        metrics["avg_batch_size"] = round(metrics["texts"] / batches, 2) if batches else 0
+        metrics["queued"] = self._queue.qsize() if self._queue is not None else 0
+        return metrics
+
+
+# Instance globale (une par processus)
+embedding_executor = EmbeddingExecutor()
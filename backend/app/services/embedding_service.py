@@ -2,10 +2,15 @@
 Service de génération d'embeddings avec sentence-transformers.
 Utilisé pour le matching sémantique entre profils et offres.
 """
-from typing import List, Optional
+from typing import Dict, List, Optional
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import logging
+import threading
+import time
+
+from app.config import settings
+from app.services.embedding_backends import load_backend
+from app.services.embedding_cache import embedding_cache
 
 logger = logging.getLogger(__name__)
 
@@ -13,19 +18,122 @@ logger = logging.getLogger(__name__)
 class EmbeddingService:
     """Service pour générer des embeddings avec sentence-transformers"""
     
-    _model: Optional[SentenceTransformer] = None
+    _model = None
+    _load_lock = threading.Lock()
+    _load_seconds: Optional[float] = None
+    _warmup_ms: Optional[float] = None
+    _load_error: Optional[str] = None
+    _remote_allowed = True  # False dans les workers Celery (voir use_local_inference)
     MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"  # 384 dimensions
     EMBEDDING_DIM = 384
+    REMOTE_TASK = "app.tasks.embedding_tasks.encode_texts"
     
     @classmethod
-    def get_model(cls) -> SentenceTransformer:
-        """Lazy loading du modèle (charge une seule fois)"""
+    def get_model(cls):
+        """
+        Lazy loading du modèle (charge une seule fois)
+        
+        Retourne le backend configuré (EMBEDDING_BACKEND : torch ou onnx),
+        qui expose encode(texts) -> np.ndarray.
+        """
         if cls._model is None:
-            logger.info(f"Loading embedding model: {cls.MODEL_NAME}")
-            cls._model = SentenceTransformer(cls.MODEL_NAME)
-            logger.info("Embedding model loaded successfully")
+            with cls._load_lock:
+                if cls._model is None:
+                    logger.info(f"Loading embedding model: {cls.MODEL_NAME}")
+                    start = time.perf_counter()
+                    try:
+                        cls._model = load_backend(cls.MODEL_NAME)
+                    except Exception as e:
+                        cls._load_error = str(e)
+                        raise
+                    cls._load_seconds = time.perf_counter() - start
+                    cls._load_error = None
+                    logger.info(f"Embedding model loaded successfully (backend: {cls._model.name})")
         return cls._model
     
+    @classmethod
+    def warmup(cls):
+        """Première inférence (allocation des buffers, optimisation du graphe) hors requête"""
+        model = cls.get_model()
+        start = time.perf_counter()
+        model.encode(["warm-up: développeur python, data engineer, remote"])
+        cls._warmup_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"Embedding model warmed up in {cls._warmup_ms:.0f} ms")
+    
+    @classmethod
+    def preload(cls, warmup: bool = True):
+        """
+        Charge le modèle au démarrage du processus (EMBEDDING_MODE=eager)
+        
+        Avec warmup=False, seul le chargement est fait : c'est la forme à
+        utiliser avant un fork (worker Celery prefork). Les poids sont alors
+        partagés copy-on-write par les processus enfants ; l'inférence de
+        warm-up, qui démarre les pools de threads du runtime (non réutilisables
+        après fork), est faite dans chaque enfant.
+        """
+        if settings.EMBEDDING_MODE == "remote":
+            return
+        try:
+            cls.get_model()
+            if warmup:
+                cls.warmup()
+        except Exception as e:
+            cls._load_error = str(e)
+            logger.error(f"Embedding model preload failed: {e}")
+    
+    @classmethod
+    def status(cls) -> Dict:
+        """État du modèle pour /health (ready = peut servir sans latence de chargement)"""
+        mode = settings.EMBEDDING_MODE
+        loaded = cls._model is not None
+        if mode == "remote":
+            ready = True
+        elif mode == "eager":
+            ready = loaded and cls._warmup_ms is not None
+        else:
+            ready = cls._load_error is None
+        return {
+            "mode": mode,
+            "backend": cls._model.name if loaded else settings.EMBEDDING_BACKEND,
+            "loaded": loaded,
+            "ready": ready,
+            "load_seconds": round(cls._load_seconds, 2) if cls._load_seconds is not None else None,
+            "warmup_ms": round(cls._warmup_ms, 1) if cls._warmup_ms is not None else None,
+            "error": cls._load_error,
+        }
+    
+    @classmethod
+    def encode_local(cls, texts: List[str]) -> List[List[float]]:
+        """Inférence par le modèle du processus (sans cache)"""
+        return cls.get_model().encode(texts).tolist()
+    
+    @classmethod
+    def use_local_inference(cls):
+        """
+        Processus worker Celery : EMBEDDING_MODE=remote y est ignoré
+        
+        Attendre le résultat d'une tâche (result.get()) depuis une tâche est
+        interdit par Celery (RuntimeError) et peut bloquer tous les workers :
+        les tâches qui encodent (recherche → feed, backfill) utilisent donc le
+        modèle du processus, chargé à la première utilisation.
+        """
+        cls._remote_allowed = False
+    
+    @classmethod
+    def _encode_remote(cls, texts: List[str]) -> List[List[float]]:
+        """Inférence déléguée au worker de la file `embeddings` (EMBEDDING_MODE=remote)"""
+        from app.celery_config import celery_app
+        result = celery_app.send_task(cls.REMOTE_TASK, args=[texts], queue="embeddings")
+        return result.get(timeout=settings.EMBEDDING_REMOTE_TIMEOUT)
+    
+    @classmethod
+    def cache_namespace(cls) -> str:
+        """Modèle + backend : les vecteurs int8 ne doivent pas se mélanger aux vecteurs fp32"""
+        backend = settings.EMBEDDING_BACKEND.lower()
+        if backend == "onnx" and settings.EMBEDDING_ONNX_QUANTIZED:
+            backend = "onnx-int8"
+        return f"{cls.MODEL_NAME}:{backend}"
+    
     @classmethod
     def generate_embedding(cls, text: str) -> List[float]:
         """
@@ -41,15 +149,16 @@ class EmbeddingService:
             # Retourner un vecteur nul si texte vide
             return [0.0] * cls.EMBEDDING_DIM
         
-        model = cls.get_model()
-        embedding = model.encode(text, convert_to_numpy=True)
-        return embedding.tolist()
+        return cls.generate_embeddings_batch([text])[0]
     
     @classmethod
     def generate_embeddings_batch(cls, texts: List[str]) -> List[List[float]]:
         """
         Génère des embeddings pour plusieurs textes (plus efficace).
         
+        Les textes déjà encodés sont servis par le cache (LRU puis Redis) ;
+        seuls les textes inconnus, dédoublonnés, passent par le modèle.
+        
         Args:
             texts: Liste de textes à encoder
             
@@ -59,9 +168,25 @@ class EmbeddingService:
         if not texts:
             return []
         
-        model = cls.get_model()
-        embeddings = model.encode(texts, convert_to_numpy=True)
-        return embeddings.tolist()
+        namespace = cls.cache_namespace()
+        keys = [embedding_cache.make_key(namespace, text) for text in texts]
+        vectors = embedding_cache.get_many(keys)
+        
+        to_encode = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                to_encode.setdefault(key, text)
+        
+        if to_encode:
+            if settings.EMBEDDING_MODE == "remote" and cls._remote_allowed:
+                embeddings = cls._encode_remote(list(to_encode.values()))
+            else:
+                embeddings = cls.encode_local(list(to_encode.values()))
+            computed = dict(zip(to_encode.keys(), embeddings))
+            embedding_cache.set_many(computed)
+            vectors.update(computed)
+        
+        return [vectors[key] for key in keys]
     
     @classmethod
     def cosine_similarity(cls, vec1: List[float], vec2: List[float]) -> float:
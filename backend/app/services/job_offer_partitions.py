@@ -0,0 +1,291 @@
+"""
+JobOfferPartitions - Partitions mensuelles de job_offers et rétention
+
+job_offers est partitionnée par mois de scraped_at (migration
+partition_job_offers_001). Utilisé par la tâche quotidienne
+cleanup_old_job_offers :
+- ensure_partitions : crée à l'avance les partitions des mois à venir
+  (JOB_OFFER_PARTITIONS_AHEAD), une offre ne tombe donc jamais dans la
+  partition par défaut faute de partition
+- apply_retention : retire les partitions entièrement plus vieilles que
+  JOB_OFFER_RETENTION_DAYS (DETACH puis DROP, ou table détachée conservée
+  si JOB_OFFER_PARTITION_RETENTION = "detach") au lieu d'un DELETE massif.
+  Les offres référencées par une candidature ou un document généré sont
+  recopiées dans job_offers_default et conservées.
+- residue_purge_job : purge par lots (BatchedDelete) des offres conservées
+  qui ne sont plus référencées
+
+DETACH PARTITION CONCURRENTLY est impossible en présence d'une partition par
+défaut : le DETACH simple prend un verrou ACCESS EXCLUSIVE sur job_offers
+jusqu'à la fin de sa transaction. Cette transaction est donc réduite au
+DETACH et à la réinsertion des offres conservées, copiées au préalable dans
+une table temporaire ; suppression des lignes dépendantes, comptage et DROP
+suivent dans des transactions séparées, sans verrou sur job_offers.
+"""
+import logging
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, column, select, table, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.job_offer import JobOffer
+from app.services.batched_delete import PurgeJob
+
+logger = logging.getLogger(__name__)
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+class JobOfferPartitions:
+    """Création et rétention des partitions de job_offers"""
+    
+    PARENT = "job_offers"
+    DEFAULT_PARTITION = "job_offers_default"
+    PARTITION_NAME = re.compile(r"^job_offers_p(\d{4})_(\d{2})$")
+    
+    RETAINED_STAGING = "job_offers_retained"  # Table temporaire (ON COMMIT DROP)
+    
+    # Tables liées aux offres (sans clé étrangère depuis le partitionnement)
+    RETAINING_TABLES = ("applications", "generated_documents")  # offres à conserver
+    DEPENDENT_TABLES = ("user_feed_cache",)  # lignes supprimées avec l'offre
+    
+    @staticmethod
+    def partition_name(month: date) -> str:
+        return f"job_offers_p{month:%Y_%m}"
+    
+    @staticmethod
+    def _copied_columns() -> str:
+        """Colonnes recopiées vers la partition par défaut (hors colonnes générées)"""
+        return ", ".join(col.name for col in JobOffer.__table__.columns if col.computed is None)
+    
+    async def _existing_tables(self, db: AsyncSession, tables: Tuple[str, ...]) -> List[str]:
+        existing = []
+        for name in tables:
+            result = await db.execute(text("SELECT to_regclass(:table)"), {"table": name})
+            if result.scalar() is not None:
+                existing.append(name)
+        return existing
+    
+    async def list_partitions(self, db: AsyncSession) -> List[Tuple[str, date]]:
+        """Partitions mensuelles attachées (nom, premier jour du mois), par mois croissant"""
+        result = await db.execute(text("""
+            SELECT child.relname FROM pg_inherits
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE pg_inherits.inhparent = CAST(:parent AS regclass)
+        """), {"parent": self.PARENT})
+        partitions = []
+        for (name,) in result.all():
+            match = self.PARTITION_NAME.match(name)
+            if match:
+                partitions.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(partitions, key=lambda partition: partition[1])
+    
+    # ------------------------------------------------------------------
+    # Création
+    # ------------------------------------------------------------------
+    
+    async def ensure_partitions(self, db: AsyncSession, ahead: Optional[int] = None) -> List[str]:
+        """
+        Crée les partitions du mois courant et des `ahead` mois suivants
+        
+        Returns:
+            Noms des partitions créées
+        """
+        ahead = settings.JOB_OFFER_PARTITIONS_AHEAD if ahead is None else ahead
+        existing = {name for name, _ in await self.list_partitions(db)}
+        current = datetime.now(timezone.utc).date().replace(day=1)
+        
+        created = []
+        for offset in range(ahead + 1):
+            month = _add_months(current, offset)
+            name = self.partition_name(month)
+            if name in existing:
+                continue
+            following = _add_months(month, 1)
+            try:
+                # Échoue si job_offers_default contient déjà des offres de ce mois
+                await db.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {self.PARENT} "
+                    f"FOR VALUES FROM ('{month.isoformat()} 00:00:00+00') "
+                    f"TO ('{following.isoformat()} 00:00:00+00')"
+                ))
+                await db.commit()
+                created.append(name)
+                logger.info(f"[JobOfferPartitions] Partition {name} créée")
+            except DBAPIError as e:
+                await db.rollback()
+                logger.error(f"[JobOfferPartitions] Création de {name} impossible: {e}")
+        return created
+    
+    # ------------------------------------------------------------------
+    # Rétention
+    # ------------------------------------------------------------------
+    
+    async def _detach_partition(self, db: AsyncSession, name: str) -> int:
+        """
+        Détache une partition et réinsère ses offres encore référencées (transaction courte)
+        
+        Les offres à conserver sont copiées dans une table temporaire avant le
+        DETACH, sans verrou exclusif ; le verrou de DETACH sur job_offers ne
+        couvre ensuite que leur réinsertion (dans la partition par défaut, le
+        mois n'ayant plus de partition) jusqu'au commit.
+        
+        Returns:
+            Nombre d'offres conservées
+        """
+        columns = self._copied_columns()
+        retaining = await self._existing_tables(db, self.RETAINING_TABLES)
+        if retaining:
+            referenced = " UNION ".join(
+                f"SELECT job_offer_id FROM {table_name} WHERE job_offer_id IS NOT NULL" for table_name in retaining
+            )
+            await db.execute(text(
+                f"CREATE TEMP TABLE {self.RETAINED_STAGING} ON COMMIT DROP AS "
+                f"SELECT {columns} FROM {name} WHERE id IN ({referenced})"
+            ))
+        
+        await db.execute(text(f"ALTER TABLE {self.PARENT} DETACH PARTITION {name}"))
+        retained = 0
+        if retaining:
+            result = await db.execute(text(
+                f"INSERT INTO {self.PARENT} ({columns}) SELECT {columns} FROM {self.RETAINED_STAGING}"
+            ))
+            retained = result.rowcount or 0
+        await db.commit()
+        return retained
+    
+    async def _delete_dependents(self, db: AsyncSession, source: str):
+        """Empreintes et lignes dépendantes des offres de `source` qui n'ont pas été conservées"""
+        removed = f"SELECT id FROM {source} WHERE id NOT IN (SELECT id FROM {self.DEFAULT_PARTITION})"
+        await db.execute(text(f"DELETE FROM job_offer_fingerprints WHERE job_offer_id IN ({removed})"))
+        for name in await self._existing_tables(db, self.DEPENDENT_TABLES):
+            await db.execute(text(f"DELETE FROM {name} WHERE job_offer_id IN ({removed})"))
+    
+    async def _finish_detached(self, db: AsyncSession, name: str, mode: str) -> int:
+        """
+        Nettoie une partition déjà détachée : lignes dépendantes, puis DROP (ou conservation)
+        
+        Transactions séparées du DETACH, sans verrou sur job_offers ; en cas
+        d'échec, la table détachée est reprise au passage suivant (mode "drop").
+        
+        Returns:
+            Nombre d'offres de la table détachée
+        """
+        await self._delete_dependents(db, name)
+        await db.commit()
+        
+        result = await db.execute(text(f"SELECT count(*) FROM {name}"))
+        offers = result.scalar() or 0
+        if mode != "detach":
+            await db.execute(text(f"DROP TABLE {name}"))
+        await db.commit()
+        return offers
+    
+    async def _retire_partition(self, db: AsyncSession, name: str, mode: str) -> Dict:
+        """Détache une partition, conserve ses offres référencées puis la supprime (ou la garde)"""
+        retained = await self._detach_partition(db, name)
+        offers = await self._finish_detached(db, name, mode)
+        return {"partition": name, "offers": offers, "retained": retained}
+    
+    async def _list_detached(self, db: AsyncSession) -> List[Tuple[str, date]]:
+        """Anciennes partitions mensuelles détachées mais pas encore supprimées (par mois croissant)"""
+        result = await db.execute(text("""
+            SELECT relname FROM pg_class
+            WHERE relkind = 'r' AND NOT relispartition AND pg_table_is_visible(oid)
+              AND relname LIKE 'job_offers\\_p%'
+        """))
+        detached = []
+        for (name,) in result.all():
+            match = self.PARTITION_NAME.match(name)
+            if match:
+                detached.append((name, date(int(match.group(1)), int(match.group(2)), 1)))
+        return sorted(detached, key=lambda partition: partition[1])
+    
+    async def apply_retention(
+        self,
+        db: AsyncSession,
+        retention_days: Optional[int] = None,
+        mode: Optional[str] = None
+    ) -> Dict:
+        """
+        Retire les partitions dont tout le mois est plus vieux que retention_days
+        
+        Les offres conservées (partition par défaut) sont purgées à part, par
+        lots, une fois qu'elles ne sont plus référencées (residue_purge_job).
+        En mode "drop", une partition détachée lors d'une exécution précédente
+        mais pas encore supprimée (échec après le DETACH) est reprise ici.
+        
+        Returns:
+            {"partitions": [{"partition", "offers", "retained"}], "offers_removed": n,
+             "offers_retained": n}
+        """
+        retention_days = settings.JOB_OFFER_RETENTION_DAYS if retention_days is None else retention_days
+        mode = mode or settings.JOB_OFFER_PARTITION_RETENTION
+        cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+        
+        stats = {"partitions": [], "offers_removed": 0, "offers_retained": 0}
+        leftovers = await self._list_detached(db) if mode != "detach" else []
+        for name, month in leftovers + await self.list_partitions(db):
+            upper = datetime.combine(_add_months(month, 1), datetime.min.time(), tzinfo=timezone.utc)
+            if upper > cutoff:
+                continue
+            try:
+                if (name, month) in leftovers:
+                    offers = await self._finish_detached(db, name, mode)
+                    retired = {"partition": name, "offers": offers, "retained": 0}
+                else:
+                    retired = await self._retire_partition(db, name, mode)
+            except DBAPIError as e:
+                await db.rollback()
+                logger.error(f"[JobOfferPartitions] Rétention de {name} impossible: {e}")
+                continue
+            stats["partitions"].append(retired)
+            stats["offers_removed"] += retired["offers"] - retired["retained"]
+            stats["offers_retained"] += retired["retained"]
+            logger.info(
+                f"[JobOfferPartitions] {name} retirée ({mode}): {retired['offers']} offre(s), "
+                f"{retired['retained']} conservée(s)"
+            )
+        
+        return stats
+    
+    async def residue_purge_job(self, db: AsyncSession, retention_days: Optional[int] = None) -> PurgeJob:
+        """
+        Purge (par lots, BatchedDelete) des offres conservées qui ne sont plus référencées
+        
+        Offres de job_offers_default plus vieilles que retention_days dont la
+        candidature / le document a été supprimé ; les offres sans scraped_at
+        (saisies manuellement) ne sont jamais concernées.
+        """
+        retention_days = settings.JOB_OFFER_RETENTION_DAYS if retention_days is None else retention_days
+        default = table(self.DEFAULT_PARTITION, column("id"), column("scraped_at"))
+        references = [
+            select(column("job_offer_id")).select_from(table(name)).where(column("job_offer_id").isnot(None))
+            for name in await self._existing_tables(db, self.RETAINING_TABLES)
+        ]
+        dependents = [
+            (table(name, column("job_offer_id")), "job_offer_id")
+            for name in ("job_offer_fingerprints",) + tuple(await self._existing_tables(db, self.DEPENDENT_TABLES))
+        ]
+        
+        def _where():
+            cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+            return and_(
+                default.c.scraped_at < cutoff,
+                *[default.c.id.notin_(reference) for reference in references]
+            )
+        
+        return PurgeJob(
+            name=self.DEFAULT_PARTITION, table=default, where=_where, dependents=tuple(dependents)
+        )
+
+
+# Instance globale
+job_offer_partitions = JobOfferPartitions()
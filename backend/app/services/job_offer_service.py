@@ -2,34 +2,55 @@
 Service pour gérer les offres d'emploi
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_, and_, func
-from typing import Optional, List
+from sqlalchemy import Float, select, and_, delete, func
+from sqlalchemy.dialects.postgresql import TSQUERY
+from typing import Optional, List, Tuple
 from uuid import UUID
 
-from app.models.job_offer import JobOffer
+from app.core.fuzzy_match import fuzzy_match
+from app.core.pagination import Page, paginate
+from app.models.job_offer import JobOffer, SEARCH_CONFIGS
+from app.models.job_offer_fingerprint import JobOfferFingerprint
+from app.models.user_feed_cache import UserFeedCache
 from app.schemas.job_offer import JobOfferCreate, JobOfferUpdate
 
 
 class JobOfferService:
     """Service pour les opérations CRUD sur les offres d'emploi"""
     
+    @staticmethod
+    def full_text_filter(keyword: str) -> Tuple:
+        """
+        Condition et score de la recherche plein texte sur search_vector
+        
+        La requête utilise la syntaxe web de PostgreSQL ("phrase exacte",
+        -exclusion, OR), analysée en français et en anglais : un document
+        correspond s'il correspond dans l'une des deux langues.
+        
+        Returns:
+            (condition @@ servie par l'index GIN, ts_rank à trier par ordre décroissant)
+        """
+        queries = [func.websearch_to_tsquery(config, keyword) for config in SEARCH_CONFIGS]
+        ts_query = queries[0]
+        for other in queries[1:]:
+            ts_query = ts_query.op("||", return_type=TSQUERY)(other)
+        condition = JobOffer.search_vector.op("@@")(ts_query)
+        rank = func.ts_rank(JobOffer.search_vector, ts_query, type_=Float)
+        return condition, rank
+    
     @staticmethod
     async def get_user_job_offers(
         db: AsyncSession, 
         user_id: UUID,
         limit: int = 20,
-        offset: int = 0
-    ) -> List[JobOffer]:
-        """Récupérer toutes les offres d'un utilisateur"""
-        query = (
-            select(JobOffer)
-            .where(JobOffer.user_id == user_id)
-            .order_by(JobOffer.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+        cursor: Optional[str] = None,
+        include_total: bool = False
+    ) -> Page[JobOffer]:
+        """Récupérer les offres d'un utilisateur, plus récentes d'abord (pagination par curseur)"""
+        query = select(JobOffer).where(JobOffer.user_id == user_id)
+        return await paginate(
+            db, query, (JobOffer.created_at, JobOffer.id), cursor, limit, include_total
         )
-        result = await db.execute(query)
-        return list(result.scalars().all())
     
     @staticmethod
     async def get_job_offer_by_id(
@@ -98,11 +119,19 @@ class JobOfferService:
         job_offer_id: UUID,
         user_id: UUID
     ) -> bool:
-        """Supprimer une offre"""
+        """
+        Supprimer une offre
+        
+        Sans clé étrangère vers job_offers (partitionnée), l'empreinte de
+        déduplication et les scores de feed de l'offre sont supprimés avec
+        elle : l'offre peut ainsi être de nouveau enregistrée au prochain scraping.
+        """
         job_offer = await JobOfferService.get_job_offer_by_id(db, job_offer_id, user_id)
         if not job_offer:
             return False
         
+        await db.execute(delete(JobOfferFingerprint).where(JobOfferFingerprint.job_offer_id == job_offer.id))
+        await db.execute(delete(UserFeedCache).where(UserFeedCache.job_offer_id == job_offer.id))
         await db.delete(job_offer)
         await db.commit()
         return True
@@ -120,22 +149,21 @@ class JobOfferService:
     ) -> List[JobOffer]:
         """
         Rechercher des offres avec filtres
-        Recherche dans: job_title, description, company_name
+        Mot-clé : recherche plein texte (titre, compétences, description),
+        résultats classés par pertinence (ts_rank) puis par date
         """
         query = select(JobOffer).where(JobOffer.user_id == user_id)
+        order_by = [JobOffer.created_at.desc()]
         
-        # Filtre par mot-clé (recherche dans titre, description)
+        # Filtre par mot-clé (index GIN sur search_vector)
         if keyword:
-            keyword_filter = or_(
-                JobOffer.job_title.ilike(f"%{keyword}%"),
-                JobOffer.description.ilike(f"%{keyword}%"),
-                JobOffer.requirements.ilike(f"%{keyword}%")
-            )
+            keyword_filter, rank = JobOfferService.full_text_filter(keyword)
             query = query.where(keyword_filter)
+            order_by.insert(0, rank.desc())
         
         # Filtre par localisation
         if location:
-            query = query.where(JobOffer.location.ilike(f"%{location}%"))
+            query = query.where(fuzzy_match(JobOffer.location, location))
         
         # Filtre par type de poste
         if job_type:
@@ -143,10 +171,10 @@ class JobOfferService:
         
         # Filtre par entreprise
         if company_name:
-            query = query.where(JobOffer.company_name.ilike(f"%{company_name}%"))
+            query = query.where(fuzzy_match(JobOffer.company_name, company_name))
         
         # Tri et pagination
-        query = query.order_by(JobOffer.created_at.desc()).limit(limit).offset(offset)
+        query = query.order_by(*order_by).limit(limit).offset(offset)
         
         result = await db.execute(query)
         return list(result.scalars().all())
@@ -0,0 +1,167 @@
+"""
+OfferDeduplicator - Détection des quasi-doublons d'offres en temps quasi linéaire
+
+Même règle que l'ancienne boucle de SearchService.deduplicate_offers :
+- doublon exact d'URL (source_url déjà vue)
+- ou signature « titre|entreprise » avec SequenceMatcher.ratio() >= seuil
+  contre une signature déjà retenue
+
+Au lieu de comparer chaque offre à toutes les précédentes (O(n²)) :
+1. blocking : seules les offres d'une même entreprise normalisée sont comparées
+2. index de trigrammes par bloc + filtres sans perte : longueur et nombre
+   minimal de trigrammes communs qu'impose un ratio >= seuil
+3. vérification exacte (quick_ratio puis ratio) sur les seuls candidats
+
+Le filtre par trigrammes découle de la définition du ratio
+(2·M / (|a|+|b|), M = caractères appariés en blocs contigus) :
+un ratio >= t implique au moins M - (q-1)·(1 + D) q-grammes communs,
+avec D = |a| + |b| - 2·M. Aucun candidat valide n'est donc écarté : dans un
+bloc, le résultat est identique à la comparaison exhaustive.
+"""
+import math
+import re
+import unicodedata
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Set, Tuple
+
+
+# Formes juridiques ignorées pour le blocking par entreprise
+COMPANY_SUFFIXES = {
+    "inc", "ltd", "llc", "plc", "corp", "corporation", "co", "company",
+    "limited", "gmbh", "ag", "sa", "sas", "sasu", "sarl", "bv", "srl",
+}
+
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_company(company: Optional[str]) -> str:
+    """Clé de blocking : minuscules, sans accents, ponctuation ni forme juridique"""
+    if not company:
+        return ""
+    text = unicodedata.normalize("NFKD", company)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    tokens = [t for t in _NON_ALNUM_RE.split(text) if t and t not in COMPANY_SUFFIXES]
+    return " ".join(tokens)
+
+
+class _Block:
+    """Signatures retenues d'une entreprise + index inversé de trigrammes"""
+    
+    __slots__ = ("signatures", "exact", "postings")
+    
+    def __init__(self):
+        self.signatures: List[str] = []
+        self.exact: Set[str] = set()
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}
+    
+    def add(self, signature: str, grams: Counter):
+        position = len(self.signatures)
+        self.signatures.append(signature)
+        self.exact.add(signature)
+        for gram, count in grams.items():
+            self.postings.setdefault(gram, []).append((position, count))
+
+
+class OfferDeduplicator:
+    """Déduplication URL + similarité titre/entreprise, bloquée par entreprise"""
+    
+    Q = 3  # taille des q-grammes
+    
+    def __init__(self, threshold: float = 0.9):
+        self.threshold = threshold
+        self.last_stats: Dict[str, int] = {}
+    
+    @staticmethod
+    def _signature(offer: Dict) -> str:
+        title = (offer.get("job_title") or "").lower().strip()
+        company = (offer.get("company_name") or "").lower().strip()
+        return f"{title}|{company}"
+    
+    def _grams(self, text: str) -> Counter:
+        q = self.Q
+        return Counter(text[i:i + q] for i in range(len(text) - q + 1))
+    
+    def _min_common_grams(self, len_a: int, len_b: int) -> int:
+        """Nombre minimal de q-grammes communs compatible avec ratio >= seuil"""
+        total = len_a + len_b
+        # epsilon : ne pas exclure un ratio exactement égal au seuil (arrondi flottant)
+        matched = math.ceil(self.threshold * total / 2 - 1e-9)
+        unmatched = total - 2 * matched
+        return matched - (self.Q - 1) * (1 + unmatched)
+    
+    def _length_compatible(self, len_a: int, len_b: int) -> bool:
+        """ratio <= 2·min(|a|,|b|) / (|a|+|b|)"""
+        total = len_a + len_b
+        return total == 0 or 2.0 * min(len_a, len_b) / total >= self.threshold
+    
+    def _is_near_duplicate(self, signature: str, grams: Counter, block: _Block) -> bool:
+        if signature in block.exact:
+            return True
+        
+        # Trigrammes communs (multiensemble) avec chaque signature du bloc
+        common: Dict[int, int] = {}
+        for gram, count in grams.items():
+            for position, other_count in block.postings.get(gram, ()):
+                common[position] = common.get(position, 0) + min(count, other_count)
+        
+        # Si tout partenaire de longueur compatible doit partager au moins un trigramme,
+        # seules les signatures présentes dans `common` sont candidates ; sinon
+        # (signatures très courtes) on parcourt tout le bloc
+        length = len(signature)
+        shortest = math.ceil(length * self.threshold / (2 - self.threshold) - 1e-9)
+        longest = math.floor(length * (2 - self.threshold) / self.threshold + 1e-9)
+        if (self._min_common_grams(length, shortest) > 0
+                and self._min_common_grams(length, longest) > 0):
+            candidates = sorted(common)
+        else:
+            candidates = range(len(block.signatures))
+        
+        for position in candidates:
+            existing = block.signatures[position]
+            other_length = len(existing)
+            if not self._length_compatible(length, other_length):
+                continue
+            if common.get(position, 0) < self._min_common_grams(length, other_length):
+                continue
+            self.last_stats["comparisons"] += 1
+            # Même appel que l'ancienne boucle : SequenceMatcher(None, nouvelle, existante)
+            matcher = SequenceMatcher(None, signature, existing)
+            if matcher.quick_ratio() < self.threshold:
+                continue
+            if matcher.ratio() >= self.threshold:
+                return True
+        return False
+    
+    def deduplicate(self, offers: List[Dict]) -> List[Dict]:
+        """
+        Retourne les offres sans doublons, dans l'ordre d'origine
+        (la première occurrence est conservée)
+        """
+        self.last_stats = {"offers": len(offers), "url_duplicates": 0,
+                           "near_duplicates": 0, "comparisons": 0}
+        seen_urls: Set[str] = set()
+        blocks: Dict[str, _Block] = {}
+        deduplicated = []
+        
+        for offer in offers:
+            # Déduplication par URL (exact)
+            url = offer.get("source_url", "")
+            if url and url in seen_urls:
+                self.last_stats["url_duplicates"] += 1
+                continue
+            
+            # Déduplication par signature (titre + entreprise), dans le bloc de l'entreprise
+            signature = self._signature(offer)
+            block = blocks.setdefault(normalize_company(offer.get("company_name")), _Block())
+            grams = self._grams(signature)
+            if self._is_near_duplicate(signature, grams, block):
+                self.last_stats["near_duplicates"] += 1
+                continue
+            
+            deduplicated.append(offer)
+            if url:
+                seen_urls.add(url)
+            block.add(signature, grams)
+        
+        return deduplicated
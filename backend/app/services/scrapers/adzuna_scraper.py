@@ -7,7 +7,6 @@ Focus : Offres France (Indeed, Monster, autres)
 import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime
-import aiohttp
 
 import sys
 import os
@@ -73,8 +72,8 @@ class AdzunaScraper(BaseScraper):
         
         except Exception as e:
             print(f"[Adzuna] Erreur lors du scraping: {str(e)}")
-            # Ne pas lever d'exception pour ne pas bloquer les autres scrapers
-            return []
+            # Propagée : la source est marquée en erreur (ScrapeResults.failed) sans bloquer les autres
+            raise
     
     async def _scrape_from_api(
         self,
@@ -107,52 +106,60 @@ class AdzunaScraper(BaseScraper):
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                # Adzuna supporte la pagination (page=1, 2, 3...)
-                page = 1
-                max_pages = (max_results // self.max_results_per_page) + 1
+            # Session HTTP partagée (keep-alive, cache DNS) : ne pas la fermer
+            session = await self.get_http_session()
+            # Adzuna supporte la pagination (page=1, 2, 3...)
+            page = 1
+            max_pages = (max_results // self.max_results_per_page) + 1
+            
+            while page <= max_pages and len(offers) < max_results:
+                # Construire l'URL avec page
+                url = f"{self.base_url}/{self.country}/search/{page}"
                 
-                while page <= max_pages and len(offers) < max_results:
-                    # Construire l'URL avec page
-                    url = f"{self.base_url}/{self.country}/search/{page}"
+                # Jeton du rate limiter partagé (tous workers confondus)
+                await self.throttle()
+                async with session.get(url, params=params, timeout=30) as response:
+                    if response.status != 200:
+                        print(f"[Adzuna] API error: status {response.status}")
+                        if not offers:
+                            # Échec dès la première page : la source est en erreur
+                            raise Exception(f"Adzuna API status {response.status}")
+                        break
                     
-                    async with session.get(url, params=params, timeout=30) as response:
-                        if response.status != 200:
-                            print(f"[Adzuna] API error: status {response.status}")
-                            break
-                        
-                        data = await response.json()
-                        
-                        # Vérifier les résultats
-                        results = data.get("results", [])
-                        if not results:
-                            break  # Pas de résultats, arrêter la pagination
-                        
-                        # Parser les offres
-                        for job in results:
-                            try:
-                                offer = self._parse_api_job(job)
-                                if offer:
-                                    offers.append(offer)
-                                
-                                # Limiter le nombre de résultats
-                                if len(offers) >= max_results:
-                                    break
+                    data = await response.json()
+                    
+                    # Vérifier les résultats
+                    results = data.get("results", [])
+                    if not results:
+                        break  # Pas de résultats, arrêter la pagination
+                    
+                    # Parser les offres
+                    for job in results:
+                        try:
+                            offer = self._parse_api_job(job)
+                            if offer:
+                                offers.append(offer)
                             
-                            except Exception as e:
-                                print(f"[Adzuna] Erreur parsing job: {str(e)}")
-                                continue
+                            # Limiter le nombre de résultats
+                            if len(offers) >= max_results:
+                                break
                         
-                        # Passer à la page suivante
-                        page += 1
-                        
-                        # Pause pour respecter rate limit
-                        await asyncio.sleep(0.5)
+                        except Exception as e:
+                            print(f"[Adzuna] Erreur parsing job: {str(e)}")
+                            continue
+                    
+                    # Passer à la page suivante
+                    page += 1
         
         except asyncio.TimeoutError:
             print("[Adzuna] Timeout lors de la requête API")
+            if not offers:
+                raise
         except Exception as e:
             print(f"[Adzuna] Erreur API: {str(e)}")
+            # Offres des pages précédentes conservées, sinon la source est en erreur
+            if not offers:
+                raise
         
         return offers
     
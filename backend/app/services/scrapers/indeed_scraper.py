@@ -22,8 +22,8 @@ class IndeedScraper(BaseScraper):
         super().__init__()
         self.base_url = "https://fr.indeed.com"
         self.max_offers = 100
-        self.rate_limit = 100  # req/h
-        self.delay_between_requests = 3600 / self.rate_limit  # 36 secondes
+        self.rate_limit = self.config.get("rate_limit", 100)  # req/h (appliqué par core/rate_limiter.py)
+        self.delay_between_requests = 3600 / self.rate_limit
     
     async def scrape(
         self,
@@ -49,8 +49,6 @@ class IndeedScraper(BaseScraper):
             Liste de dictionnaires contenant les offres
         """
         try:
-            await self.init_browser()
-            
             # Construire l'URL de recherche
             search_url = self._build_search_url(
                 keywords=keywords,
@@ -62,8 +60,9 @@ class IndeedScraper(BaseScraper):
             
             print(f"[Indeed] Scraping URL: {search_url}")
             
-            # Accéder à la page de recherche
-            page = await self.browser.new_page()
+            # Accéder à la page de recherche (contexte emprunté au pool)
+            page = await self.new_page()
+            await self.throttle()
             await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
             await self.wait_random(2, 4)
             
@@ -179,6 +178,9 @@ class IndeedScraper(BaseScraper):
             print("[Indeed] Timeout lors de l'attente des résultats")
         except Exception as e:
             print(f"[Indeed] Erreur extraction page: {str(e)}")
+            # Offres déjà extraites conservées, sinon la source est en erreur
+            if not offers:
+                raise
         
         return offers
     
@@ -302,6 +304,7 @@ class IndeedScraper(BaseScraper):
     async def _go_to_next_page(self, page: Page, current_page: int):
         """Aller à la page suivante"""
         try:
+            await self.throttle()
             # Cliquer sur "Suivant"
             next_button = await page.query_selector(
                 "a[data-testid='pagination-page-next'], a[aria-label*='Suivant'], .pagination a[aria-label='Next']"
@@ -7,7 +7,6 @@ Focus : Agrégateur global (LinkedIn + Indeed + Glassdoor + ZipRecruiter)
 import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime
-import aiohttp
 import os
 
 import sys
@@ -77,8 +76,8 @@ class JSearchScraper(BaseScraper):
         
         except Exception as e:
             print(f"[JSearch] Erreur lors du scraping: {str(e)}")
-            # Ne pas lever d'exception pour ne pas bloquer les autres scrapers
-            return []
+            # Propagée : la source est marquée en erreur (ScrapeResults.failed) sans bloquer les autres
+            raise
     
     async def _scrape_from_api(
         self,
@@ -132,57 +131,66 @@ class JSearchScraper(BaseScraper):
         }
         
         try:
-            async with aiohttp.ClientSession() as session:
-                # JSearch supporte la pagination (page=1, 2, 3...)
-                page = 1
-                max_pages = min(10, (max_results // self.max_results_per_page) + 1)
+            # Session HTTP partagée (keep-alive, cache DNS) : ne pas la fermer
+            session = await self.get_http_session()
+            # JSearch supporte la pagination (page=1, 2, 3...)
+            page = 1
+            max_pages = min(10, (max_results // self.max_results_per_page) + 1)
+            
+            while page <= max_pages and len(offers) < max_results:
+                params["page"] = str(page)
+                
+                # Jeton du rate limiter partagé (tous workers confondus)
+                await self.throttle()
                 
-                while page <= max_pages and len(offers) < max_results:
-                    params["page"] = str(page)
+                async with session.get(
+                    self.base_url,
+                    params=params,
+                    headers=headers,
+                    timeout=30
+                ) as response:
+                    if response.status != 200:
+                        error_text = await response.text()
+                        print(f"[JSearch] API error: status {response.status} - {error_text}")
+                        if not offers:
+                            # Échec dès la première page : la source est en erreur
+                            raise Exception(f"JSearch API status {response.status}")
+                        break
                     
-                    async with session.get(
-                        self.base_url,
-                        params=params,
-                        headers=headers,
-                        timeout=30
-                    ) as response:
-                        if response.status != 200:
-                            error_text = await response.text()
-                            print(f"[JSearch] API error: status {response.status} - {error_text}")
-                            break
-                        
-                        data = await response.json()
-                        
-                        # Vérifier les résultats
-                        results = data.get("data", [])
-                        if not results:
-                            break  # Pas de résultats, arrêter la pagination
-                        
-                        # Parser les offres
-                        for job in results:
-                            try:
-                                offer = self._parse_api_job(job)
-                                if offer:
-                                    offers.append(offer)
-                                
-                                # Limiter le nombre de résultats
-                                if len(offers) >= max_results:
-                                    break
+                    data = await response.json()
+                    
+                    # Vérifier les résultats
+                    results = data.get("data", [])
+                    if not results:
+                        break  # Pas de résultats, arrêter la pagination
+                    
+                    # Parser les offres
+                    for job in results:
+                        try:
+                            offer = self._parse_api_job(job)
+                            if offer:
+                                offers.append(offer)
                             
-                            except Exception as e:
-                                print(f"[JSearch] Erreur parsing job: {str(e)}")
-                                continue
+                            # Limiter le nombre de résultats
+                            if len(offers) >= max_results:
+                                break
                         
-                        # Passer à la page suivante
-                        page += 1
-                        
-                        # Pause pour respecter rate limit
-                        await asyncio.sleep(1)
+                        except Exception as e:
+                            print(f"[JSearch] Erreur parsing job: {str(e)}")
+                            continue
+                    
+                    # Passer à la page suivante
+                    page += 1
         
         except asyncio.TimeoutError:
             print("[JSearch] Timeout lors de la requête API")
+            if not offers:
+                raise
         except Exception as e:
             print(f"[JSearch] Erreur API: {str(e)}")
+            # Offres des pages précédentes conservées, sinon la source est en erreur
+            if not offers:
+                raise
         
         return offers
     
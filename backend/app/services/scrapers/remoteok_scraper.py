@@ -15,6 +15,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from app.services.scraping_service import BaseScraper
+from app.services.scrapers.remoteok_snapshot import remoteok_snapshot
 
 
 class RemoteOKScraper(BaseScraper):
@@ -25,8 +26,8 @@ class RemoteOKScraper(BaseScraper):
         self.base_url = "https://remoteok.com"
         self.api_url = "https://remoteok.com/api"
         self.max_offers = 100
-        self.rate_limit = 500  # req/h
-        self.delay_between_requests = 3600 / self.rate_limit  # 7.2 secondes
+        self.rate_limit = self.config.get("rate_limit", 500)  # req/h (appliqué par core/rate_limiter.py)
+        self.delay_between_requests = 3600 / self.rate_limit
     
     async def scrape(
         self,
@@ -68,8 +69,6 @@ class RemoteOKScraper(BaseScraper):
                 print(f"[RemoteOK] Erreur API, fallback vers scraping HTML: {str(e)}")
             
             # Fallback: scraping HTML si API échoue
-            await self.init_browser()
-            
             # Construire l'URL de recherche
             search_url = self._build_search_url(
                 keywords=keywords,
@@ -78,8 +77,9 @@ class RemoteOKScraper(BaseScraper):
             
             print(f"[RemoteOK] Scraping URL: {search_url}")
             
-            # Accéder à la page de recherche
-            page = await self.browser.new_page()
+            # Accéder à la page de recherche (contexte emprunté au pool)
+            page = await self.new_page()
+            await self.throttle()
             await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
             await self.wait_random(2, 4)
             
@@ -104,54 +104,30 @@ class RemoteOKScraper(BaseScraper):
         """
         Scraper depuis l'API RemoteOK.
         
-        L'API retourne un JSON avec toutes les offres actives.
+        L'API retourne un JSON avec toutes les offres actives : la recherche est
+        faite dans le snapshot partagé du flux (remoteok_snapshot), rafraîchi
+        en arrière-plan, au lieu de retélécharger le flux à chaque recherche.
         """
-        import aiohttp
-        
         offers = []
         
-        async with aiohttp.ClientSession() as session:
-            # L'API RemoteOK retourne toutes les offres en un seul call
-            async with session.get(self.api_url, timeout=30) as response:
-                if response.status != 200:
-                    raise Exception(f"API error: status {response.status}")
-                
-                data = await response.json()
+        await remoteok_snapshot.ensure_fresh()
+        if not remoteok_snapshot.jobs:
+            raise Exception("Snapshot RemoteOK vide")
+        
+        for job in remoteok_snapshot.search(keywords=keywords, company=company):
+            try:
+                # Extraire les données
+                offer = self._parse_api_job(job)
+                if offer:
+                    offers.append(offer)
                 
-                # Le premier élément est des métadonnées, on le skip
-                if data and isinstance(data, list) and len(data) > 1:
-                    jobs = data[1:]  # Skip first element (metadata)
-                    
-                    for job in jobs:
-                        try:
-                            # Filtrer par mots-clés si fournis
-                            if keywords:
-                                job_text = (
-                                    job.get("position", "").lower() + " " +
-                                    job.get("description", "").lower() + " " +
-                                    " ".join(job.get("tags", [])).lower()
-                                )
-                                if not any(kw.lower() in job_text for kw in keywords.split()):
-                                    continue
-                            
-                            # Filtrer par entreprise si fourni
-                            if company:
-                                job_company = job.get("company", "").lower()
-                                if company.lower() not in job_company:
-                                    continue
-                            
-                            # Extraire les données
-                            offer = self._parse_api_job(job)
-                            if offer:
-                                offers.append(offer)
-                            
-                            # Limiter le nombre de résultats
-                            if len(offers) >= max_results:
-                                break
-                        
-                        except Exception as e:
-                            print(f"[RemoteOK] Erreur parsing job API: {str(e)}")
-                            continue
+                # Limiter le nombre de résultats
+                if len(offers) >= max_results:
+                    break
+            
+            except Exception as e:
+                print(f"[RemoteOK] Erreur parsing job API: {str(e)}")
+                continue
         
         return offers
     
@@ -274,6 +250,9 @@ class RemoteOKScraper(BaseScraper):
             print("[RemoteOK] Timeout lors de l'attente des résultats")
         except Exception as e:
             print(f"[RemoteOK] Erreur extraction page: {str(e)}")
+            # Offres déjà extraites conservées, sinon la source est en erreur
+            if not offers:
+                raise
         
         return offers
     
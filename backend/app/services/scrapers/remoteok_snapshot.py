@@ -0,0 +1,294 @@
+"""
+Snapshot partagé du flux complet RemoteOK
+
+L'API RemoteOK (https://remoteok.com/api) renvoie toutes les offres actives en
+un seul document JSON. Au lieu de le télécharger à chaque recherche, on garde
+un snapshot :
+- en mémoire dans chaque processus, avec un index inversé (tokens du titre,
+  des tags et de la description → offres) : une recherche par mots-clés est
+  résolue localement en quelques millisecondes
+- persisté dans Redis (compressé) : un seul téléchargement est partagé par les
+  workers API et Celery
+- rafraîchi périodiquement (tâche Celery Beat) par requête conditionnelle
+  (If-None-Match / If-Modified-Since) : un flux inchangé coûte une réponse 304
+
+Le matching reprend la sémantique historique (au moins un des mots-clés
+présent) mais par préfixe de token : « py » trouve « python ».
+"""
+import asyncio
+import json
+import logging
+import re
+import time
+import zlib
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from redis.exceptions import RedisError
+
+from app.config import settings
+from app.core.http_client import http_client_manager
+from app.core.rate_limiter import rate_limiter
+from app.core.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+API_URL = "https://remoteok.com/api"
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Tokens normalisés (minuscules, balises HTML retirées, « c++ », « c# », « node.js » conservés)"""
+    if not text:
+        return []
+    text = _TAG_RE.sub(" ", text).lower()
+    return [token.rstrip(".") for token in _TOKEN_RE.findall(text)]
+
+
+class RemoteOKSnapshot:
+    """Snapshot du flux RemoteOK avec index inversé"""
+    
+    DATA_KEY = "jobhunter:remoteok:snapshot:data"
+    META_KEY = "jobhunter:remoteok:snapshot:meta"
+    REDIS_TTL = 24 * 3600  # secondes
+    
+    def __init__(self):
+        self.jobs: List[Dict] = []
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.fetched_at: Optional[float] = None  # dernier contrôle réussi du flux (epoch)
+        self.version: Optional[float] = None  # date du dernier contenu téléchargé (200)
+        self._postings: Dict[str, List[int]] = {}
+        self._vocabulary: List[str] = []
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._metrics: Dict = {
+            "refreshes": 0,
+            "not_modified": 0,
+            "redis_loads": 0,
+            "refresh_errors": 0,
+            "searches": 0,
+        }
+    
+    @property
+    def age_seconds(self) -> Optional[float]:
+        """Âge du snapshot (None si jamais chargé)"""
+        if self.fetched_at is None:
+            return None
+        return max(0.0, time.time() - self.fetched_at)
+    
+    def is_fresh(self, max_age: Optional[float] = None) -> bool:
+        max_age = settings.REMOTEOK_SNAPSHOT_MAX_AGE if max_age is None else max_age
+        age = self.age_seconds
+        return age is not None and age <= max_age and bool(self.jobs)
+    
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+    
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+    
+    def _build_index(self, jobs: List[Dict]):
+        """Construit l'index inversé token → positions des offres (triées)"""
+        postings: Dict[str, List[int]] = {}
+        for position, job in enumerate(jobs):
+            text = " ".join([
+                job.get("position") or "",
+                " ".join(job.get("tags") or []),
+                job.get("description") or "",
+            ])
+            for token in set(tokenize(text)):
+                postings.setdefault(token, []).append(position)
+        self.jobs = jobs
+        self._postings = postings
+        self._vocabulary = sorted(postings)
+    
+    def _match_prefix(self, prefix: str) -> set:
+        """Offres contenant un token commençant par `prefix`"""
+        matches = set()
+        start = bisect_left(self._vocabulary, prefix)
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            matches.update(self._postings[token])
+        return matches
+    
+    def search(
+        self,
+        keywords: Optional[str] = None,
+        company: Optional[str] = None,
+        max_results: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Recherche locale dans le snapshot
+        
+        Args:
+            keywords: Mots-clés (au moins un doit correspondre)
+            company: Filtre sur le nom d'entreprise (sous-chaîne)
+            max_results: Nombre maximum d'offres (None = toutes)
+        
+        Returns:
+            Offres brutes de l'API, les plus pertinentes (nombre de mots-clés
+            trouvés) puis les plus récentes en premier
+        """
+        self._metrics["searches"] += 1
+        query_tokens = tokenize(keywords or "")
+        
+        if query_tokens:
+            scores: Dict[int, int] = {}
+            for token in set(query_tokens):
+                for position in self._match_prefix(token):
+                    scores[position] = scores.get(position, 0) + 1
+            positions = sorted(scores, key=lambda p: (-scores[p], p))
+        else:
+            positions = range(len(self.jobs))
+        
+        company_filter = company.lower() if company else None
+        results = []
+        for position in positions:
+            job = self.jobs[position]
+            if company_filter and company_filter not in (job.get("company") or "").lower():
+                continue
+            results.append(job)
+            if max_results is not None and len(results) >= max_results:
+                break
+        return results
+    
+    # ------------------------------------------------------------------
+    # Chargement / rafraîchissement
+    # ------------------------------------------------------------------
+    
+    async def _load_from_redis(self) -> bool:
+        """Adopte le snapshot Redis s'il est plus récent que le snapshot local"""
+        try:
+            redis = get_redis()
+            meta_raw = await redis.get(self.META_KEY)
+            if not meta_raw:
+                return False
+            meta = json.loads(meta_raw)
+            if self.fetched_at is not None and meta.get("fetched_at", 0) <= self.fetched_at:
+                return False
+            if meta.get("version") != self.version:
+                data_raw = await redis.get(self.DATA_KEY)
+                if not data_raw:
+                    return False
+                data = json.loads(zlib.decompress(data_raw))
+                self._build_index(data["jobs"])
+                self.etag = data.get("etag")
+                self.last_modified = data.get("last_modified")
+                self.version = meta.get("version")
+                self._metrics["redis_loads"] += 1
+            self.fetched_at = meta.get("fetched_at")
+            return True
+        except (RedisError, OSError, ValueError, KeyError, zlib.error) as e:
+            logger.warning(f"[RemoteOKSnapshot] Lecture Redis impossible: {e}")
+            return False
+    
+    async def _save_meta(self, redis):
+        meta = {"fetched_at": self.fetched_at, "version": self.version}
+        await redis.set(self.META_KEY, json.dumps(meta), ex=self.REDIS_TTL)
+    
+    async def _save_to_redis(self, content_changed: bool):
+        try:
+            redis = get_redis()
+            if content_changed:
+                data = {
+                    "jobs": self.jobs,
+                    "etag": self.etag,
+                    "last_modified": self.last_modified,
+                }
+                await redis.set(
+                    self.DATA_KEY,
+                    zlib.compress(json.dumps(data).encode()),
+                    ex=self.REDIS_TTL
+                )
+            await self._save_meta(redis)
+        except (RedisError, OSError) as e:
+            logger.warning(f"[RemoteOKSnapshot] Écriture Redis impossible: {e}")
+    
+    async def refresh(self) -> bool:
+        """
+        Télécharge le flux par requête conditionnelle
+        
+        Returns:
+            True si le contenu a changé (réponse 200), False si inchangé (304)
+        """
+        headers = {}
+        if self.jobs and self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.jobs and self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        
+        await rate_limiter.acquire("remoteok")
+        session = await http_client_manager.get_session()
+        try:
+            async with session.get(API_URL, headers=headers, timeout=30) as response:
+                if response.status == 304:
+                    self.fetched_at = time.time()
+                    self._metrics["not_modified"] += 1
+                    await self._save_to_redis(content_changed=False)
+                    return False
+                if response.status != 200:
+                    raise Exception(f"API error: status {response.status}")
+                
+                data = await response.json(content_type=None)
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+        except Exception:
+            self._metrics["refresh_errors"] += 1
+            raise
+        
+        # Le premier élément est des métadonnées (mentions légales)
+        jobs = [job for job in (data or [])[1:] if isinstance(job, dict)]
+        self._build_index(jobs)
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.time()
+        self.version = self.fetched_at
+        self._metrics["refreshes"] += 1
+        await self._save_to_redis(content_changed=True)
+        logger.info(f"[RemoteOKSnapshot] Flux rafraîchi: {len(jobs)} offres, {len(self._vocabulary)} tokens")
+        return True
+    
+    async def ensure_fresh(self, max_age: Optional[float] = None):
+        """
+        Garantit un snapshot de moins de max_age secondes
+        (mémoire → Redis → téléchargement conditionnel)
+        
+        Si le téléchargement échoue, un snapshot existant (même ancien) est conservé.
+        """
+        if self.is_fresh(max_age):
+            return
+        async with self._get_lock():
+            if self.is_fresh(max_age):
+                return
+            await self._load_from_redis()
+            if self.is_fresh(max_age):
+                return
+            try:
+                await self.refresh()
+            except Exception as e:
+                if not self.jobs:
+                    raise
+                # Mieux vaut un snapshot un peu ancien que pas de résultat
+                logger.warning(f"[RemoteOKSnapshot] Rafraîchissement impossible, snapshot conservé: {e}")
+    
+    def get_metrics(self) -> Dict:
+        """État du snapshot et compteurs (processus courant)"""
+        metrics = dict(self._metrics)
+        age = self.age_seconds
+        metrics["age_seconds"] = round(age, 1) if age is not None else None
+        metrics["jobs"] = len(self.jobs)
+        metrics["tokens"] = len(self._vocabulary)
+        return metrics
+
+
+# Instance globale (une par processus, partagée via Redis)
+remoteok_snapshot = RemoteOKSnapshot()
@@ -7,7 +7,6 @@ Focus : Tech, Startups, Remote-friendly
 import asyncio
 from typing import List, Dict, Optional
 from datetime import datetime
-import aiohttp
 
 import sys
 import os
@@ -66,8 +65,8 @@ class TheMuseScraper(BaseScraper):
         
         except Exception as e:
             print(f"[TheMuse] Erreur lors du scraping: {str(e)}")
-            # Ne pas lever d'exception pour ne pas bloquer les autres scrapers
-            return []
+            # Propagée : la source est marquée en erreur (ScrapeResults.failed) sans bloquer les autres
+            raise
     
     async def _scrape_from_api(
         self,
@@ -105,61 +104,69 @@ class TheMuseScraper(BaseScraper):
             params["company"] = company
         
         try:
-            async with aiohttp.ClientSession() as session:
-                # The Muse supporte la pagination (page=0, 1, 2...)
-                page = 0
-                max_pages = (max_results // self.max_results_per_page) + 1
+            # Session HTTP partagée (keep-alive, cache DNS) : ne pas la fermer
+            session = await self.get_http_session()
+            # The Muse supporte la pagination (page=0, 1, 2...)
+            page = 0
+            max_pages = (max_results // self.max_results_per_page) + 1
+            
+            while page < max_pages and len(offers) < max_results:
+                params["page"] = page
                 
-                while page < max_pages and len(offers) < max_results:
-                    params["page"] = page
+                # Jeton du rate limiter partagé (tous workers confondus)
+                await self.throttle()
+                async with session.get(self.base_url, params=params, timeout=30) as response:
+                    if response.status != 200:
+                        print(f"[TheMuse] API error: status {response.status}")
+                        if not offers:
+                            # Échec dès la première page : la source est en erreur
+                            raise Exception(f"TheMuse API status {response.status}")
+                        break
                     
-                    async with session.get(self.base_url, params=params, timeout=30) as response:
-                        if response.status != 200:
-                            print(f"[TheMuse] API error: status {response.status}")
-                            break
-                        
-                        data = await response.json()
-                        
-                        # Vérifier les résultats
-                        results = data.get("results", [])
-                        if not results:
-                            break  # Pas de résultats, arrêter la pagination
-                        
-                        # Parser les offres
-                        for job in results:
-                            try:
-                                # Filtrer par keywords si fourni
-                                if keywords:
-                                    job_text = (
-                                        job.get("name", "").lower() + " " +
-                                        job.get("contents", "").lower() + " " +
-                                        " ".join([cat.get("name", "") for cat in job.get("categories", [])]).lower()
-                                    )
-                                    if not any(kw.lower() in job_text for kw in keywords.split()):
-                                        continue
-                                
-                                offer = self._parse_api_job(job)
-                                if offer:
-                                    offers.append(offer)
-                                
-                                # Limiter le nombre de résultats
-                                if len(offers) >= max_results:
-                                    break
+                    data = await response.json()
+                    
+                    # Vérifier les résultats
+                    results = data.get("results", [])
+                    if not results:
+                        break  # Pas de résultats, arrêter la pagination
+                    
+                    # Parser les offres
+                    for job in results:
+                        try:
+                            # Filtrer par keywords si fourni
+                            if keywords:
+                                job_text = (
+                                    job.get("name", "").lower() + " " +
+                                    job.get("contents", "").lower() + " " +
+                                    " ".join([cat.get("name", "") for cat in job.get("categories", [])]).lower()
+                                )
+                                if not any(kw.lower() in job_text for kw in keywords.split()):
+                                    continue
                             
-                            except Exception as e:
-                                print(f"[TheMuse] Erreur parsing job: {str(e)}")
-                                continue
-                        
-                        # Passer à la page suivante
-                        page += 1
+                            offer = self._parse_api_job(job)
+                            if offer:
+                                offers.append(offer)
+                            
+                            # Limiter le nombre de résultats
+                            if len(offers) >= max_results:
+                                break
                         
-                        # Pause pour être respectueux de l'API
-                        await asyncio.sleep(0.5)
+                        except Exception as e:
+                            print(f"[TheMuse] Erreur parsing job: {str(e)}")
+                            continue
+                    
+                    # Passer à la page suivante
+                    page += 1
         
         except asyncio.TimeoutError:
             print("[TheMuse] Timeout lors de la requête API")
+            if not offers:
+                raise
         except Exception as e:
             print(f"[TheMuse] Erreur API: {str(e)}")
+            # Offres des pages précédentes conservées, sinon la source est en erreur
+            if not offers:
+                raise
         
         return offers
     
@@ -23,8 +23,12 @@ class WTTJScraper(BaseScraper):
         super().__init__()
         self.base_url = "https://www.welcometothejungle.com"
         self.max_offers = 50
-        self.rate_limit = 200  # req/h
-        self.delay_between_requests = 3600 / self.rate_limit  # 18 secondes
+        self.rate_limit = self.config.get("rate_limit", 200)  # req/h (appliqué par core/rate_limiter.py)
+        self.delay_between_requests = 3600 / self.rate_limit
+    
+    def get_platform_name(self) -> str:
+        """Clé de la plateforme dans SUPPORTED_PLATFORMS"""
+        return "welcometothejungle"
     
     async def scrape(
         self,
@@ -50,8 +54,6 @@ class WTTJScraper(BaseScraper):
             Liste de dictionnaires contenant les offres
         """
         try:
-            await self.init_browser()
-            
             # Construire l'URL de recherche
             search_url = self._build_search_url(
                 keywords=keywords,
@@ -63,8 +65,9 @@ class WTTJScraper(BaseScraper):
             
             print(f"[WTTJ] Scraping URL: {search_url}")
             
-            # Accéder à la page de recherche
-            page = await self.browser.new_page()
+            # Accéder à la page de recherche (contexte emprunté au pool)
+            page = await self.new_page()
+            await self.throttle()
             await page.goto(search_url, wait_until="domcontentloaded", timeout=30000)
             await self.wait_random(2, 4)
             
@@ -216,6 +219,9 @@ class WTTJScraper(BaseScraper):
             print("[WTTJ] Timeout lors de l'attente des résultats")
         except Exception as e:
             print(f"[WTTJ] Erreur extraction page: {str(e)}")
+            # Offres déjà extraites conservées, sinon la source est en erreur
+            if not offers:
+                raise
         
         return offers
     
@@ -1,9 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Callable, Awaitable
 from urllib.parse import urlparse
 import asyncio
-from playwright.async_api import async_playwright, Browser, Page
+from playwright.async_api import Browser, BrowserContext, Page
 
+from app.config import settings
+from app.core.browser_pool import browser_pool, BrowserLease
+from app.core.http_client import http_client_manager
+from app.core.rate_limiter import rate_limiter
+from app.core.single_flight import single_flight
+from app.core.redis_client import redis_manager
 from app.platforms_config.platforms import get_platform_config, get_enabled_platforms
 
 
@@ -19,7 +25,9 @@ class BaseScraper(ABC):
         except:
             self.config = {}
         self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        self._browser_lease: Optional[BrowserLease] = None
     
     def get_platform_name(self) -> str:
         """Retourne le nom de la plateforme (à override si nécessaire)"""
@@ -46,26 +54,51 @@ class BaseScraper(ABC):
         pass
     
     async def init_browser(self):
-        """Initialise Playwright et le navigateur"""
-        if not self.browser:
-            playwright = await async_playwright().start()
-            self.browser = await playwright.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
-            )
-            self.page = await self.browser.new_page()
-            
-            # User-Agent aléatoire
-            await self.page.set_extra_http_headers({
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            })
+        """
+        Emprunte un contexte de navigation isolé au pool de navigateurs partagé
+        
+        Le navigateur appartient au pool : seul le contexte est propre au scraper,
+        il est rendu par close_browser().
+        """
+        if not self._browser_lease:
+            self._browser_lease = await browser_pool.acquire(user_agent=settings.USER_AGENT)
+            self.browser = self._browser_lease.browser
+            self.context = self._browser_lease.context
+            self.page = await self.context.new_page()
+    
+    async def new_page(self) -> Page:
+        """Ouvre une page dans le contexte emprunté (initialisé si besoin)"""
+        if not self._browser_lease:
+            await self.init_browser()
+            return self.page
+        return await self.context.new_page()
+    
+    async def get_http_session(self):
+        """
+        Emprunte la session aiohttp partagée du processus (keep-alive, cache DNS)
+        
+        La session appartient au HTTPClientManager : ne pas la fermer.
+        """
+        return await http_client_manager.get_session()
+    
+    async def throttle(self, tokens: int = 1) -> float:
+        """
+        Attend l'autorisation du rate limiter partagé avant une requête vers la plateforme
+        
+        À appeler avant chaque requête API ou navigation de page. Lève
+        RateLimitExceeded si la plateforme est saturée au-delà de RATE_LIMIT_MAX_WAIT.
+        """
+        return await rate_limiter.acquire(self.platform_name, tokens=tokens)
     
     async def close_browser(self):
-        """Ferme le navigateur"""
-        if self.browser:
-            await self.browser.close()
+        """Rend le contexte de navigation au pool (le navigateur reste ouvert)"""
+        if self._browser_lease:
+            lease = self._browser_lease
+            self._browser_lease = None
             self.browser = None
+            self.context = None
             self.page = None
+            await browser_pool.release(lease)
     
     async def wait_random(self, min_seconds: float = 1.0, max_seconds: float = 3.0):
         """Attente aléatoire pour éviter détection bot"""
@@ -73,6 +106,45 @@ class BaseScraper(ABC):
         await asyncio.sleep(random.uniform(min_seconds, max_seconds))
 
 
+class ScrapeResults(dict):
+    """
+    Résultats d'un scraping multi-sources : {source_id: [offres]}
+    
+    Se comporte comme un dict classique (compatible avec les appelants existants)
+    et porte en plus le rapport d'exécution : sources hors délai, sources en erreur
+    et durée totale.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timed_out: List[str] = []
+        self.failed: Dict[str, str] = {}
+        self.duration_seconds: float = 0.0
+    
+    @property
+    def is_partial(self) -> bool:
+        """True si au moins une source n'a pas répondu à temps ou a échoué"""
+        return bool(self.timed_out or self.failed)
+    
+    def to_payload(self) -> Dict:
+        """Représentation dict (partage du résultat entre processus, cf. single-flight)"""
+        return {
+            "results": dict(self),
+            "timed_out": self.timed_out,
+            "failed": self.failed,
+            "duration_seconds": self.duration_seconds,
+        }
+    
+    @classmethod
+    def from_payload(cls, payload: Dict) -> "ScrapeResults":
+        """Inverse de to_payload()"""
+        results = cls(payload.get("results", {}))
+        results.timed_out = list(payload.get("timed_out", []))
+        results.failed = dict(payload.get("failed", {}))
+        results.duration_seconds = payload.get("duration_seconds", 0.0)
+        return results
+
+
 class ScrapingService:
     """
     Service principal de scraping multi-plateformes
@@ -80,6 +152,30 @@ class ScrapingService:
     
     def __init__(self):
         self.enabled_platforms = get_enabled_platforms()
+        self.http_client = http_client_manager
+        self.browser_pool = browser_pool
+        self.rate_limiter = rate_limiter
+    
+    async def startup(self):
+        """Initialise les ressources partagées (lifespan FastAPI / worker Celery)"""
+        await self.http_client.startup()
+    
+    async def shutdown(self):
+        """Libère les ressources partagées (connexions HTTP et Redis, navigateurs)"""
+        await self.http_client.close()
+        await self.browser_pool.close()
+        await redis_manager.close()
+    
+    def get_metrics(self) -> Dict:
+        """Métriques des ressources partagées du scraping"""
+        from app.services.scrapers.remoteok_snapshot import remoteok_snapshot
+        return {
+            "http_client": self.http_client.get_metrics(),
+            "browser_pool": self.browser_pool.get_metrics(),
+            "rate_limiter": self.rate_limiter.get_metrics(),
+            "single_flight": single_flight.get_metrics(),
+            "remoteok_snapshot": remoteok_snapshot.get_metrics(),
+        }
     
     def detect_platform(self, url: str) -> Optional[str]:
         """
@@ -212,6 +308,10 @@ class ScrapingService:
             
         Returns:
             List[Dict]: Liste d'offres
+        
+        Raises:
+            Exception: erreur du scraper, propagée pour que _scrape_concurrently
+                marque la source en erreur (ScrapeResults.failed)
         """
         if platform not in self.enabled_platforms:
             raise ValueError(f"Plateforme {platform} non supportée")
@@ -219,34 +319,31 @@ class ScrapingService:
         # Obtenir le scraper approprié
         scraper = self._get_scraper(platform)
         
-        try:
-            # Pour JSearch et Adzuna, passer le paramètre company si fourni
-            if platform in ["jsearch", "adzuna"] and company:
-                print(f"[ScrapingService] 🏢 {platform.upper()} avec filtre company='{company}'")
-                offers = await scraper.scrape(
-                    keywords=keywords,
-                    location=location if location else None,
-                    company=company,
-                    max_results=limit
-                )
-            else:
-                # Appeler scrape() du scraper normalement
-                offers = await scraper.scrape(
-                    keywords=keywords,
-                    location=location if location else None,
-                    max_results=limit
-                )
-            return offers
-        except Exception as e:
-            print(f"❌ Erreur scraping {platform}: {e}")
-            return []
+        # Pour JSearch et Adzuna, passer le paramètre company si fourni
+        if platform in ["jsearch", "adzuna"] and company:
+            print(f"[ScrapingService] 🏢 {platform.upper()} avec filtre company='{company}'")
+            return await scraper.scrape(
+                keywords=keywords,
+                location=location if location else None,
+                company=company,
+                max_results=limit
+            )
+        # Appeler scrape() du scraper normalement
+        return await scraper.scrape(
+            keywords=keywords,
+            location=location if location else None,
+            max_results=limit
+        )
     
     async def scrape_all_platforms(
         self,
         keywords: str,
         location: str = "",
-        limit_per_platform: int = 100
-    ) -> Dict[str, List[Dict]]:
+        limit_per_platform: int = 100,
+        max_concurrency: Optional[int] = None,
+        source_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None
+    ) -> ScrapeResults:
         """
         Scrape toutes les plateformes activées en parallèle
         
@@ -254,31 +351,32 @@ class ScrapingService:
             keywords: Mots-clés de recherche
             location: Localisation
             limit_per_platform: Limite par plateforme
+            max_concurrency: Nombre max de plateformes en parallèle (défaut: settings)
+            source_timeout: Deadline par plateforme en secondes (défaut: settings)
+            total_timeout: Deadline globale en secondes (défaut: settings)
             
         Returns:
-            Dict[str, List[Dict]]: {platform_name: [offers]}
+            ScrapeResults: {platform_name: [offers]} + rapport (timed_out, failed)
         """
-        results = {}
-        
-        # Scraping parallèle
-        tasks = []
+        # Scraping parallèle (borné par max_concurrency et les deadlines)
+        jobs = []
         for platform_name in self.enabled_platforms.keys():
-            task = self.scrape_platform(
+            jobs.append((
                 platform_name,
-                keywords,
-                location,
-                limit_per_platform
-            )
-            tasks.append((platform_name, task))
+                lambda p=platform_name: self.scrape_platform(
+                    p,
+                    keywords,
+                    location,
+                    limit_per_platform
+                )
+            ))
         
-        # Attendre tous les scrapings
-        for platform_name, task in tasks:
-            try:
-                offers = await task
-                results[platform_name] = offers
-            except Exception as e:
-                print(f"❌ Erreur scraping {platform_name}: {e}")
-                results[platform_name] = []
+        results = await self._scrape_concurrently(
+            jobs,
+            max_concurrency=max_concurrency,
+            source_timeout=source_timeout,
+            total_timeout=total_timeout
+        )
         
         total_offers = sum(len(offers) for offers in results.values())
         print(f"\n✅ Total: {total_offers} offres trouvées sur {len(results)} plateformes")
@@ -290,8 +388,11 @@ class ScrapingService:
         priority_sources: List[str],
         keywords: str,
         location: str = "",
-        limit_per_source: int = 100
-    ) -> Dict[str, List[Dict]]:
+        limit_per_source: int = 100,
+        max_concurrency: Optional[int] = None,
+        source_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None
+    ) -> ScrapeResults:
         """
         Scrape uniquement les sources prioritaires de l'utilisateur
         
@@ -300,16 +401,17 @@ class ScrapingService:
             keywords: Mots-clés de recherche
             location: Localisation
             limit_per_source: Limite par source
+            max_concurrency: Nombre max de sources en parallèle (défaut: settings)
+            source_timeout: Deadline par source en secondes (défaut: settings)
+            total_timeout: Deadline globale en secondes (défaut: settings)
             
         Returns:
-            Dict[str, List[Dict]]: {source_id: [offers]}
+            ScrapeResults: {source_id: [offers]} + rapport (timed_out, failed)
         """
-        results = {}
-        
         print(f"[ScrapingService] Scraping {len(priority_sources)} sources prioritaires...")
         
         # Scraping parallèle des sources prioritaires uniquement
-        tasks = []
+        jobs = []
         for source_id in priority_sources:
             # Mapper source_id → platform_name
             platform = self._map_source_to_platform(source_id)
@@ -317,32 +419,105 @@ class ScrapingService:
                 # Extraire le nom de l'entreprise depuis le source_id si c'est JSearch ou Adzuna
                 company_name = self._get_company_name(source_id) if platform in ["jsearch", "adzuna"] else None
                 
-                task = self.scrape_platform(
-                    platform,
-                    keywords,
-                    location,
-                    limit_per_source,
-                    company=company_name  # Passer le nom de l'entreprise
-                )
-                tasks.append((source_id, task))
+                jobs.append((
+                    source_id,
+                    lambda p=platform, c=company_name: self.scrape_platform(
+                        p,
+                        keywords,
+                        location,
+                        limit_per_source,
+                        company=c  # Passer le nom de l'entreprise
+                    )
+                ))
             else:
                 print(f"⚠️ Source {source_id} non mappée à une plateforme")
         
-        # Attendre tous les scrapings
-        for source_id, task in tasks:
-            try:
-                offers = await task
-                results[source_id] = offers
-                print(f"✅ {source_id}: {len(offers)} offres")
-            except Exception as e:
-                print(f"❌ Erreur scraping {source_id}: {e}")
-                results[source_id] = []
+        results = await self._scrape_concurrently(
+            jobs,
+            max_concurrency=max_concurrency,
+            source_timeout=source_timeout,
+            total_timeout=total_timeout
+        )
         
         total_offers = sum(len(offers) for offers in results.values())
         print(f"\n✅ Total prioritaires: {total_offers} offres sur {len(results)} sources")
         
         return results
     
+    async def _scrape_concurrently(
+        self,
+        jobs: List[Tuple[str, Callable[[], Awaitable[List[Dict]]]]],
+        max_concurrency: Optional[int] = None,
+        source_timeout: Optional[float] = None,
+        total_timeout: Optional[float] = None
+    ) -> ScrapeResults:
+        """
+        Exécute les scrapings de plusieurs sources en parallèle
+        
+        - Au plus `max_concurrency` sources tournent simultanément
+        - Chaque source dispose de `source_timeout` secondes une fois démarrée
+        - Au-delà de `total_timeout`, les sources restantes sont annulées et
+          les résultats partiels sont retournés
+        
+        Args:
+            jobs: Liste de (source_id, fabrique de coroutine de scraping)
+            max_concurrency: Nombre max de sources en parallèle
+            source_timeout: Deadline par source (secondes)
+            total_timeout: Deadline globale (secondes)
+            
+        Returns:
+            ScrapeResults: {source_id: [offers]} dans l'ordre des jobs
+        """
+        max_concurrency = max_concurrency or settings.SCRAPING_MAX_CONCURRENCY
+        source_timeout = source_timeout or settings.SCRAPING_TIMEOUT
+        total_timeout = total_timeout or settings.SCRAPING_TOTAL_TIMEOUT
+        
+        results = ScrapeResults()
+        if not jobs:
+            return results
+        
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        collected: Dict[str, List[Dict]] = {}
+        
+        async def _run_one(source_id: str, factory: Callable[[], Awaitable[List[Dict]]]):
+            async with semaphore:
+                try:
+                    offers = await asyncio.wait_for(factory(), timeout=source_timeout)
+                    collected[source_id] = offers or []
+                    print(f"✅ {source_id}: {len(collected[source_id])} offres")
+                except asyncio.TimeoutError:
+                    print(f"⏱️ {source_id}: deadline de {source_timeout}s dépassée")
+                    results.timed_out.append(source_id)
+                except Exception as e:
+                    print(f"❌ Erreur scraping {source_id}: {e}")
+                    results.failed[source_id] = str(e)
+        
+        tasks = {
+            asyncio.create_task(_run_one(source_id, factory)): source_id
+            for source_id, factory in jobs
+        }
+        
+        _, pending = await asyncio.wait(tasks.keys(), timeout=total_timeout)
+        
+        if pending:
+            # Deadline globale dépassée : annuler les sources restantes
+            for task in pending:
+                task.cancel()
+                results.timed_out.append(tasks[task])
+            # Laisser aux scrapers le temps de libérer leurs ressources (finally)
+            await asyncio.wait(pending, timeout=5)
+            print(f"⏱️ Deadline globale de {total_timeout}s dépassée, "
+                  f"{len(pending)} source(s) annulée(s): {[tasks[t] for t in pending]}")
+        
+        # Conserver l'ordre des jobs (la déduplication garde la première occurrence)
+        for source_id, _ in jobs:
+            results[source_id] = collected.get(source_id, [])
+        
+        results.duration_seconds = round(loop.time() - start, 2)
+        return results
+    
     def _get_company_name(self, source_id: str) -> Optional[str]:
         """
         Extraire le nom de l'entreprise depuis le source_id pour le filtre JSearch
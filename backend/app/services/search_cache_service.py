@@ -1,19 +1,92 @@
 """
 Service de gestion du cache des résultats de recherche
+
+Le cache est partagé entre utilisateurs : une entrée contient les offres
+brutes (normalisées) d'une source pour une requête (mots-clés, localisation,
+limite), sans filtre ni préférence. SearchService assemble les entrées des
+sources activées par l'utilisateur puis applique déduplication et filtres
+(projection par utilisateur, en mémoire) ; seules les sources absentes du
+cache sont scrapées.
+
+Trois niveaux, du plus rapide au plus durable :
+- LRU en mémoire, borné (SEARCH_CACHE_LRU_SIZE entrées), par processus API ;
+  une entrée y reste au plus SEARCH_CACHE_LRU_TTL secondes (désactivé dans
+  les workers Celery)
+- Redis, partagé entre workers (réponse JSON, TTL = durée de vie restante)
+- table search_results_cache (PostgreSQL), source de vérité
+
+Une recherche répétée est servie par les deux premiers niveaux sans
+requête PostgreSQL. invalidate_cache (et save_sources, qui remplace des
+entrées) supprime les clés à tous les niveaux puis publie l'invalidation sur
+un canal Redis : le listener de chaque processus API (startup, lancé au
+démarrage) retire l'entrée de son LRU. Si un message est perdu (Redis
+indisponible), le TTL du LRU borne la durée pendant laquelle une entrée
+périmée peut encore être servie.
+
+Les hits (tous niveaux) ne sont pas écrits à la lecture : ils sont comptés
+en mémoire par le processus et reportés dans hit_count toutes les
+SEARCH_CACHE_HITS_FLUSH_SECONDS secondes par un seul UPDATE groupé (et à
+l'arrêt). Un processus tué perd au plus cet intervalle de compteurs.
 """
+import asyncio
 import hashlib
 import json
-from typing import Optional, Dict, List, Any
+import logging
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Optional, Dict, List, Any, Tuple
 from datetime import datetime, timedelta
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, delete
+from sqlalchemy import select, and_, delete, text
+from sqlalchemy.dialects.postgresql import insert
 
+from app.config import settings
+from app.core.redis_client import get_redis
+from app.database import AsyncSessionLocal
 from app.models.search_cache import SearchResultsCache
+from app.services.batched_delete import PurgeJob, batched_delete
+
+logger = logging.getLogger(__name__)
+
+
+# Entrées expirées, purgées par lots (tâche maintenance_tasks.purge_expired)
+EXPIRED_SEARCH_CACHE = PurgeJob(
+    name="search_results_cache",
+    table=SearchResultsCache.__table__,
+    where=lambda: SearchResultsCache.expires_at < datetime.utcnow(),
+)
 
 
 class SearchCacheService:
     """Service pour gérer le cache des recherches d'offres"""
     
+    KEY_PREFIX = "jobhunter:search_cache:"
+    USER_KEYS_PREFIX = "jobhunter:search_cache:user:"  # clés Redis d'un utilisateur (invalidation)
+    INVALIDATION_CHANNEL = "jobhunter:search_cache:invalidate"
+    REDIS_RETRY_AFTER = 30  # secondes sans Redis après une erreur
+    
+    def __init__(self):
+        # cache_key -> (user_id ou None si partagée, expiration de l'entrée, expiration locale, réponse)
+        self._lru: "OrderedDict[str, Tuple[Optional[str], datetime, float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._lru_enabled = True  # désactivé dans les workers Celery (voir startup)
+        self._redis_disabled_until = 0.0
+        self._origin = f"{os.getpid()}-{id(self)}"
+        self._listener: Optional[asyncio.Task] = None
+        self._hits_flusher: Optional[asyncio.Task] = None
+        self._pending_hits: Counter = Counter()  # cache_key -> hits pas encore reportés en DB
+        self._metrics: Dict[str, int] = {
+            "lru_hits": 0,
+            "redis_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "invalidations_received": 0,
+            "redis_errors": 0,
+        }
+    
     def _serialize_for_json(self, obj: Any) -> Any:
         """
         Convertit récursivement les objets datetime en chaînes ISO
@@ -30,78 +103,267 @@ class SearchCacheService:
     
     def generate_cache_key(
         self,
-        user_id: str,
         keywords: str,
-        location: Optional[str] = None,
-        job_type: Optional[str] = None,
-        work_mode: Optional[str] = None,
-        company: Optional[str] = None,
-        sources: Optional[List[str]] = None
+        location: Optional[str],
+        source: str,
+        limit_per_source: int
     ) -> str:
         """
-        Génère une clé de cache unique basée sur les paramètres de recherche
+        Génère la clé de cache des offres brutes d'une source pour une requête
+        
+        Indépendante de l'utilisateur et des filtres (job_type, work_mode,
+        company) : ils sont appliqués après coup sur les offres en cache.
         
         Args:
-            user_id: ID utilisateur
             keywords: Mots-clés recherche
             location: Localisation
-            job_type: Type de contrat
-            work_mode: Mode de travail
-            company: Entreprise
-            sources: Liste des sources utilisées
+            source: ID de la source (ex: "remoteok")
+            limit_per_source: Nombre max d'offres demandées à la source
         
         Returns:
             Hash MD5 (32 caractères)
         """
-        # Normaliser les paramètres
-        keywords_norm = keywords.lower().strip() if keywords else ""
-        location_norm = location.lower().strip() if location else ""
-        job_type_norm = job_type.lower().strip() if job_type else ""
-        work_mode_norm = work_mode.lower().strip() if work_mode else ""
-        company_norm = company.lower().strip() if company else ""
-        sources_norm = "|".join(sorted(sources)) if sources else ""
-        
-        # Créer la chaîne à hasher
-        cache_string = f"{user_id}|{keywords_norm}|{location_norm}|{job_type_norm}|{work_mode_norm}|{company_norm}|{sources_norm}"
-        
-        # Générer MD5
+        keywords_norm = " ".join(keywords.lower().split()) if keywords else ""
+        location_norm = " ".join(location.lower().split()) if location else ""
+        cache_string = f"{keywords_norm}|{location_norm}|{source}|{limit_per_source}"
         return hashlib.md5(cache_string.encode()).hexdigest()
     
-    async def get_cached_results(
-        self,
-        db: AsyncSession,
-        cache_key: str
-    ) -> Optional[Dict]:
+    # ------------------------------------------------------------------
+    # Niveau 1 : LRU du processus
+    # ------------------------------------------------------------------
+    
+    def _lru_get(self, cache_key: str) -> Optional[Dict]:
+        if not self._lru_enabled:
+            return None
+        with self._lock:
+            entry = self._lru.get(cache_key)
+            if entry is None:
+                return None
+            _, expires_at, local_deadline, response = entry
+            if expires_at <= datetime.utcnow() or local_deadline <= time.monotonic():
+                del self._lru[cache_key]
+                return None
+            self._lru.move_to_end(cache_key)
+            return response
+    
+    def _lru_set(self, cache_key: str, user_id: Optional[str], expires_at: datetime, response: Dict):
+        if not self._lru_enabled:
+            return
+        with self._lock:
+            self._lru[cache_key] = (
+                str(user_id) if user_id else None, expires_at, time.monotonic() + settings.SEARCH_CACHE_LRU_TTL, response
+            )
+            self._lru.move_to_end(cache_key)
+            while len(self._lru) > settings.SEARCH_CACHE_LRU_SIZE:
+                self._lru.popitem(last=False)
+    
+    def _lru_invalidate(self, user_id: Optional[str] = None, cache_keys: Optional[List[str]] = None):
+        with self._lock:
+            if cache_keys:
+                for cache_key in cache_keys:
+                    self._lru.pop(cache_key, None)
+            elif user_id:
+                for key in [key for key, entry in self._lru.items() if entry[0] == str(user_id)]:
+                    del self._lru[key]
+    
+    # ------------------------------------------------------------------
+    # Niveau 2 : Redis (partagé)
+    # ------------------------------------------------------------------
+    
+    def _redis(self):
+        if not settings.SEARCH_CACHE_REDIS_ENABLED or time.monotonic() < self._redis_disabled_until:
+            return None
+        return get_redis()
+    
+    def _redis_failed(self, e: Exception):
+        self._metrics["redis_errors"] += 1
+        self._redis_disabled_until = time.monotonic() + self.REDIS_RETRY_AFTER
+        logger.warning(f"[SearchCache] Redis indisponible ({e}), niveaux mémoire + DB seuls pendant {self.REDIS_RETRY_AFTER}s")
+    
+    async def _redis_get_many(self, cache_keys: List[str]) -> Dict[str, Tuple[Optional[str], datetime, Dict]]:
+        """(user_id, expiration, réponse) des clés présentes dans Redis, en un MGET"""
+        client = self._redis()
+        if client is None or not cache_keys:
+            return {}
+        try:
+            payloads = await client.mget([self.KEY_PREFIX + cache_key for cache_key in cache_keys])
+        except (RedisError, OSError) as e:
+            self._redis_failed(e)
+            return {}
+        found = {}
+        for cache_key, payload in zip(cache_keys, payloads):
+            if payload is not None:
+                data = json.loads(payload)
+                found[cache_key] = (data["user_id"], datetime.fromisoformat(data["expires_at"]), data["response"])
+        return found
+    
+    async def _redis_set(self, cache_key: str, user_id: Optional[str], expires_at: datetime, response: Dict):
+        client = self._redis()
+        ttl = int((expires_at - datetime.utcnow()).total_seconds())
+        if client is None or ttl <= 0:
+            return
+        payload = json.dumps(
+            {"user_id": str(user_id) if user_id else None, "expires_at": expires_at.isoformat(), "response": response},
+            default=str
+        )
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.set(self.KEY_PREFIX + cache_key, payload, ex=ttl)
+            if user_id:
+                pipe.sadd(self.USER_KEYS_PREFIX + str(user_id), cache_key)
+                pipe.expire(self.USER_KEYS_PREFIX + str(user_id), ttl)
+            await pipe.execute()
+        except (RedisError, OSError) as e:
+            self._redis_failed(e)
+    
+    async def _redis_invalidate(self, user_id: Optional[str] = None, cache_keys: Optional[List[str]] = None):
+        """Supprime les clés Redis puis publie l'invalidation aux autres processus"""
+        client = self._redis()
+        if client is None:
+            return
+        try:
+            if cache_keys:
+                await client.delete(*[self.KEY_PREFIX + cache_key for cache_key in cache_keys])
+            elif user_id:
+                user_keys = self.USER_KEYS_PREFIX + str(user_id)
+                keys = [key.decode() for key in await client.smembers(user_keys)]
+                await client.delete(user_keys, *[self.KEY_PREFIX + key for key in keys])
+            message = {"origin": self._origin, "user_id": str(user_id) if user_id else None, "cache_keys": cache_keys}
+            await client.publish(self.INVALIDATION_CHANNEL, json.dumps(message))
+        except (RedisError, OSError) as e:
+            self._redis_failed(e)
+    
+    async def _listen(self):
+        """Applique au LRU local les invalidations publiées par les autres processus"""
+        while True:
+            pubsub = None
+            try:
+                pubsub = get_redis().pubsub()
+                await pubsub.subscribe(self.INVALIDATION_CHANNEL)
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None:
+                        continue
+                    data = json.loads(message["data"])
+                    if data.get("origin") == self._origin:
+                        continue
+                    self._metrics["invalidations_received"] += 1
+                    self._lru_invalidate(user_id=data.get("user_id"), cache_keys=data.get("cache_keys"))
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError, ValueError) as e:
+                # Messages manqués pendant la coupure : le TTL du LRU borne la péremption
+                logger.warning(f"[SearchCache] Abonnement aux invalidations interrompu ({e}), reprise dans {self.REDIS_RETRY_AFTER}s")
+                await asyncio.sleep(self.REDIS_RETRY_AFTER)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.reset()
+                    except Exception:
+                        pass
+    
+    # ------------------------------------------------------------------
+    # Compteurs de hits (agrégés en mémoire, reportés par lots)
+    # ------------------------------------------------------------------
+    
+    def _record_hit(self, cache_key: str):
+        with self._lock:
+            self._pending_hits[cache_key] += 1
+    
+    async def flush_hits(self, db: AsyncSession) -> int:
         """
-        Récupère les résultats depuis le cache s'ils sont valides
+        Reporte les hits comptés depuis le dernier report, en un seul UPDATE
         
-        Args:
-            db: Session DB
-            cache_key: Clé de cache
+        En cas d'échec les compteurs sont remis en attente pour le report suivant.
         
         Returns:
-            Dict avec résultats ou None si cache invalide/expiré
+            Nombre d'entrées mises à jour
         """
-        # Chercher dans le cache
-        stmt = select(SearchResultsCache).where(
-            and_(
-                SearchResultsCache.cache_key == cache_key,
-                SearchResultsCache.is_valid == True,
-                SearchResultsCache.expires_at > datetime.utcnow()
-            )
-        )
-        result = await db.execute(stmt)
-        cache_entry = result.scalar_one_or_none()
+        with self._lock:
+            pending, self._pending_hits = self._pending_hits, Counter()
+        if not pending:
+            return 0
         
-        if not cache_entry:
-            return None
-        
-        # Incrémenter le compteur de hits
-        cache_entry.hit_count += 1
-        await db.commit()
+        keys = list(pending)
+        try:
+            await db.execute(
+                text("""
+                    UPDATE search_results_cache AS c SET hit_count = c.hit_count + h.hits
+                    FROM unnest(CAST(:keys AS varchar[]), CAST(:hits AS integer[])) AS h(cache_key, hits)
+                    WHERE c.cache_key = h.cache_key
+                """),
+                {"keys": keys, "hits": [pending[key] for key in keys]}
+            )
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            with self._lock:
+                self._pending_hits.update(pending)
+            raise
+        return len(keys)
+    
+    async def _flush_hits_periodically(self):
+        while True:
+            await asyncio.sleep(settings.SEARCH_CACHE_HITS_FLUSH_SECONDS)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await self.flush_hits(db)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"[SearchCache] Report des hits différé: {e}")
+    
+    # ------------------------------------------------------------------
+    # Cycle de vie (lifespan FastAPI, processus worker Celery)
+    # ------------------------------------------------------------------
+    
+    async def startup(self, local_cache: bool = True):
+        """
+        Démarre l'écoute des invalidations et le report périodique des hits
         
-        print(f"[SearchCache] ✅ CACHE HIT - Key: {cache_key[:8]}... (hits: {cache_entry.hit_count})")
+        Avec local_cache=False (workers Celery), le LRU du processus est
+        désactivé et les invalidations ne sont pas écoutées : la boucle d'un
+        worker ne tourne que pendant ses tâches, le listener y appliquerait
+        les invalidations en retard et le LRU servirait des entrées remplacées.
+        Les workers lisent donc directement Redis puis la table.
         
+        Appelé par le lifespan FastAPI et par chaque processus worker Celery
+        (recherches asynchrones) : sans report, les hits comptés par un
+        processus seraient perdus et le compteur grossirait indéfiniment.
+        Dans un worker, la boucle asyncio ne tourne que pendant les tâches :
+        le report y a lieu pendant les tâches et à l'arrêt du processus.
+        """
+        self._lru_enabled = local_cache
+        if not local_cache:
+            self._lru_invalidate(cache_keys=list(self._lru))
+        elif settings.SEARCH_CACHE_REDIS_ENABLED and self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+        if self._hits_flusher is None:
+            self._hits_flusher = asyncio.create_task(self._flush_hits_periodically())
+    
+    async def shutdown(self):
+        """Arrête les tâches de fond et reporte les derniers hits"""
+        for task in (self._listener, self._hits_flusher):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._listener = None
+        self._hits_flusher = None
+        try:
+            async with AsyncSessionLocal() as db:
+                await self.flush_hits(db)
+        except Exception as e:
+            logger.warning(f"[SearchCache] Derniers hits non reportés: {e}")
+    
+    # ------------------------------------------------------------------
+    # Lecture / écriture
+    # ------------------------------------------------------------------
+    
+    def _entry_response(self, cache_entry: SearchResultsCache) -> Dict:
+        """Réponse d'une entrée de la table (format de get_cached_results)"""
         return {
             "success": True,
             "offers": cache_entry.results,
@@ -114,6 +376,7 @@ class SearchCacheService:
             "cached_at": cache_entry.created_at.isoformat(),
             "cache_hits": cache_entry.hit_count,
             "search_params": {
+                "source": cache_entry.source,
                 "keywords": cache_entry.keywords,
                 "location": cache_entry.location,
                 "job_type": cache_entry.job_type,
@@ -122,88 +385,159 @@ class SearchCacheService:
             }
         }
     
-    async def save_to_cache(
+    @staticmethod
+    def _fresh_enough(response: Dict, max_age: Optional[timedelta]) -> bool:
+        return max_age is None or datetime.fromisoformat(response["cached_at"]) >= datetime.utcnow() - max_age
+    
+    async def get_many(
+        self,
+        db: AsyncSession,
+        cache_keys: List[str],
+        max_age: Optional[timedelta] = None
+    ) -> Dict[str, Dict]:
+        """
+        Récupère les entrées valides de plusieurs clés
+        
+        LRU du processus, puis Redis (un MGET), puis la table (un SELECT) pour
+        les clés restantes : un niveau qui répond alimente les niveaux
+        au-dessus. Lecture seule : les hits sont comptés en mémoire (voir
+        flush_hits).
+        
+        Args:
+            db: Session DB
+            cache_keys: Clés de cache
+            max_age: Âge maximum accepté d'une entrée (durée de cache de l'utilisateur)
+        
+        Returns:
+            {cache_key: réponse} pour les clés trouvées
+        """
+        found: Dict[str, Dict] = {}
+        
+        # 1. Mémoire du processus
+        for cache_key in cache_keys:
+            response = self._lru_get(cache_key)
+            if response is not None and self._fresh_enough(response, max_age):
+                self._metrics["lru_hits"] += 1
+                found[cache_key] = dict(response)
+        
+        # 2. Redis
+        missing = [cache_key for cache_key in cache_keys if cache_key not in found]
+        now = datetime.utcnow()
+        for cache_key, (user_id, expires_at, response) in (await self._redis_get_many(missing)).items():
+            if expires_at > now and self._fresh_enough(response, max_age):
+                self._metrics["redis_hits"] += 1
+                self._lru_set(cache_key, user_id, expires_at, response)
+                found[cache_key] = dict(response)
+        
+        # 3. Table search_results_cache
+        missing = [cache_key for cache_key in cache_keys if cache_key not in found]
+        if missing:
+            conditions = [
+                SearchResultsCache.cache_key.in_(missing),
+                SearchResultsCache.is_valid == True,
+                SearchResultsCache.expires_at > now
+            ]
+            if max_age is not None:
+                conditions.append(SearchResultsCache.created_at >= now - max_age)
+            result = await db.execute(select(SearchResultsCache).where(and_(*conditions)))
+            for cache_entry in result.scalars().all():
+                self._metrics["db_hits"] += 1
+                response = self._entry_response(cache_entry)
+                self._lru_set(cache_entry.cache_key, cache_entry.user_id, cache_entry.expires_at, response)
+                await self._redis_set(cache_entry.cache_key, cache_entry.user_id, cache_entry.expires_at, response)
+                found[cache_entry.cache_key] = dict(response)
+        
+        self._metrics["misses"] += len(cache_keys) - len(found)
+        for cache_key in found:
+            self._record_hit(cache_key)
+        if found:
+            print(f"[SearchCache] ✅ CACHE HIT - {len(found)}/{len(cache_keys)} clé(s)")
+        return found
+    
+    async def get_cached_results(
         self,
         db: AsyncSession,
         cache_key: str,
-        user_id: str,
+        max_age: Optional[timedelta] = None
+    ) -> Optional[Dict]:
+        """
+        Récupère les résultats d'une clé depuis le cache s'ils sont valides
+        
+        Returns:
+            Dict avec résultats ou None si cache invalide/expiré
+        """
+        return (await self.get_many(db, [cache_key], max_age)).get(cache_key)
+    
+    async def save_sources(
+        self,
+        db: AsyncSession,
         keywords: str,
         location: Optional[str],
-        job_type: Optional[str],
-        work_mode: Optional[str],
-        company: Optional[str],
-        sources_used: List[str],
-        results: List[Dict],
-        scraped_count: int,
-        deduplicated_count: int,
+        limit_per_source: int,
+        results: Dict[str, List[Dict]],
         execution_time_seconds: int,
         ttl_hours: int = 24
     ):
         """
-        Sauvegarde les résultats dans le cache
+        Sauvegarde les offres brutes de chaque source (entrées partagées, un seul INSERT)
+        
+        Une entrée existante est remplacée (données, expiration, hits remis à zéro).
         
         Args:
             db: Session DB
-            cache_key: Clé de cache
-            user_id: ID utilisateur
             keywords: Mots-clés
             location: Localisation
-            job_type: Type de contrat
-            work_mode: Mode de travail
-            company: Entreprise
-            sources_used: Sources utilisées
-            results: Liste des offres
-            scraped_count: Nombre d'offres scrapées
-            deduplicated_count: Nombre après déduplication
-            execution_time_seconds: Temps d'exécution
+            limit_per_source: Nombre max d'offres demandées par source
+            results: {source_id: offres normalisées} (sources ayant répondu)
+            execution_time_seconds: Temps du scraping
             ttl_hours: Durée de vie du cache en heures
         """
-        expires_at = datetime.utcnow() + timedelta(hours=ttl_hours)
-        
-        # Nettoyer les résultats pour JSON (convertir datetime en ISO)
-        cleaned_results = self._serialize_for_json(results)
-        
-        # Vérifier si entrée existe déjà
-        stmt = select(SearchResultsCache).where(SearchResultsCache.cache_key == cache_key)
-        result = await db.execute(stmt)
-        existing = result.scalar_one_or_none()
-        
-        if existing:
-            # Mettre à jour
-            existing.results = cleaned_results
-            existing.results_count = len(results)
-            existing.scraped_count = scraped_count
-            existing.deduplicated_count = deduplicated_count
-            existing.execution_time_seconds = execution_time_seconds
-            existing.sources_used = sources_used
-            existing.expires_at = expires_at
-            existing.is_valid = True
-            existing.hit_count = 0  # Reset hits
-            print(f"[SearchCache] 🔄 CACHE UPDATED - Key: {cache_key[:8]}...")
-        else:
-            # Créer nouvelle entrée
-            cache_entry = SearchResultsCache(
-                user_id=user_id,
-                cache_key=cache_key,
-                keywords=keywords,
-                location=location,
-                job_type=job_type,
-                work_mode=work_mode,
-                company=company,
-                sources_used=sources_used,
-                results=cleaned_results,
-                results_count=len(results),
-                scraped_count=scraped_count,
-                deduplicated_count=deduplicated_count,
-                execution_time_seconds=execution_time_seconds,
-                expires_at=expires_at,
-                hit_count=0,
-                is_valid=True
-            )
-            db.add(cache_entry)
-            print(f"[SearchCache] 💾 CACHE SAVED - Key: {cache_key[:8]}... (TTL: {ttl_hours}h)")
+        if not results:
+            return
+        now = datetime.utcnow()
+        expires_at = now + timedelta(hours=ttl_hours)
+        
+        rows = []
+        for source, offers in results.items():
+            rows.append({
+                "cache_key": self.generate_cache_key(keywords, location, source, limit_per_source),
+                "user_id": None,
+                "source": source,
+                "keywords": keywords[:500],
+                "location": location[:200] if location else None,
+                "sources_used": [source],
+                # Nettoyer les résultats pour JSON (convertir datetime en ISO)
+                "results": self._serialize_for_json(offers),
+                "results_count": len(offers),
+                "scraped_count": len(offers),
+                "deduplicated_count": len(offers),
+                "execution_time_seconds": execution_time_seconds,
+                "created_at": now,
+                "expires_at": expires_at,
+                "hit_count": 0,
+                "is_valid": True,
+            })
         
+        stmt = insert(SearchResultsCache).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SearchResultsCache.cache_key],
+            set_={
+                column: stmt.excluded[column]
+                for column in (
+                    "results", "results_count", "scraped_count", "deduplicated_count",
+                    "execution_time_seconds", "created_at", "expires_at", "hit_count", "is_valid"
+                )
+            }
+        )
+        await db.execute(stmt)
         await db.commit()
+        print(f"[SearchCache] 💾 CACHE SAVED - {len(rows)} source(s) (TTL: {ttl_hours}h)")
+        
+        # Les anciennes versions éventuelles sont retirées des niveaux Redis et
+        # mémoire (tous processus) ; les nouvelles y entreront à la prochaine lecture
+        cache_keys = [row["cache_key"] for row in rows]
+        self._lru_invalidate(cache_keys=cache_keys)
+        await self._redis_invalidate(cache_keys=cache_keys)
     
     async def invalidate_cache(
         self,
@@ -212,11 +546,12 @@ class SearchCacheService:
         cache_key: Optional[str] = None
     ):
         """
-        Invalide le cache (par user ou par clé spécifique)
+        Invalide le cache (par user ou par clé spécifique), à tous les niveaux
+        et dans tous les processus (publication Redis)
         
         Args:
             db: Session DB
-            user_id: ID utilisateur (invalide tout son cache)
+            user_id: ID utilisateur (entrées personnelles antérieures au cache partagé)
             cache_key: Clé spécifique (invalide juste cette recherche)
         """
         if cache_key:
@@ -229,21 +564,34 @@ class SearchCacheService:
             print(f"[SearchCache] 🗑️ Cache invalidé - User: {user_id}")
         
         await db.commit()
+        
+        cache_keys = [cache_key] if cache_key else None
+        self._lru_invalidate(user_id=user_id, cache_keys=cache_keys)
+        await self._redis_invalidate(user_id=user_id, cache_keys=cache_keys)
     
-    async def cleanup_expired(self, db: AsyncSession):
+    async def cleanup_expired(self, db: AsyncSession, max_batches: Optional[int] = None) -> Dict:
         """
-        Nettoie les entrées expirées du cache
+        Nettoie les entrées expirées du cache, par lots (voir BatchedDelete)
+        
+        Returns:
+            Statistiques de la purge ({"deleted", "batches", "done"})
         """
-        stmt = delete(SearchResultsCache).where(
-            SearchResultsCache.expires_at < datetime.utcnow()
-        )
-        result = await db.execute(stmt)
-        await db.commit()
+        stats = await batched_delete.run(db, EXPIRED_SEARCH_CACHE, max_batches=max_batches)
         
-        deleted_count = result.rowcount
-        if deleted_count > 0:
-            print(f"[SearchCache] 🧹 {deleted_count} entrées expirées supprimées")
+        if stats["deleted"] > 0:
+            print(f"[SearchCache] 🧹 {stats['deleted']} entrées expirées supprimées")
+        return stats
+    
+    def get_metrics(self) -> Dict:
+        """Compteurs cumulés par niveau (processus courant)"""
+        metrics = dict(self._metrics)
+        lookups = metrics["lru_hits"] + metrics["redis_hits"] + metrics["db_hits"] + metrics["misses"]
+        metrics["hit_rate"] = round((lookups - metrics["misses"]) / lookups, 3) if lookups else 0
+        metrics["lru_enabled"] = self._lru_enabled
+        metrics["lru_size"] = len(self._lru)
+        metrics["pending_hits"] = sum(self._pending_hits.values())
+        return metrics
 
 
-# Instance globale
+# Instance globale (une par processus)
 search_cache_service = SearchCacheService()
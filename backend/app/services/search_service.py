@@ -5,24 +5,43 @@ Gère le scraping, la déduplication, la sauvegarde en DB et le feed personnalis
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, desc
+from sqlalchemy import select, and_, func, desc, text
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import selectinload
+import asyncio
 import hashlib
-from difflib import SequenceMatcher
+import json
+import uuid
 
 from app.models.job_offer import JobOffer
+from app.models.job_offer_fingerprint import JobOfferFingerprint
 from app.models.profile import Profile
 from app.models.user_feed_cache import UserFeedCache
 from app.models.user_source_preferences import UserSourcePreferences
-from app.services.scraping_service import scraping_service
+from app.services.scraping_service import scraping_service, ScrapeResults
 from app.services.ai_service import ai_service
+from app.services.analysis_service import AnalysisService
+from app.services.offer_deduplicator import OfferDeduplicator
 from app.services.search_cache_service import search_cache_service
 from app.core.predefined_sources import get_default_enabled_sources
+from app.core.single_flight import single_flight
+from app.services.batched_delete import PurgeJob
+from app.celery_config import celery_app
+
+
+# Scores de feed expirés, purgés par lots (tâche maintenance_tasks.purge_expired)
+EXPIRED_FEED_CACHE = PurgeJob(
+    name="user_feed_cache",
+    table=UserFeedCache.__table__,
+    where=lambda: UserFeedCache.expires_at < datetime.utcnow(),
+)
 
 
 class SearchService:
     """Service de recherche d'offres avec scraping et feed personnalisé"""
     
+    INSERT_CHUNK_SIZE = 500  # lignes par INSERT multi-lignes (limite de 32767 paramètres asyncpg)
+    
     def __init__(self):
         self.scraping_service = scraping_service
         self.ai_service = ai_service
@@ -123,80 +142,83 @@ class SearchService:
             cache_ttl = 24
             print(f"[SearchService] 📋 Mode classique (toutes les plateformes)")
         
-        # 2. NOUVEAU : Vérifier cache si activé
-        if use_cache and user_id:
-            cache_key = self.cache_service.generate_cache_key(
-                user_id=user_id,
-                keywords=keywords,
-                location=location,
-                job_type=job_type,
-                work_mode=work_mode,
-                company=company,
-                sources=sources_to_use
+        # 2. Sources sans source activée : rien à chercher
+        if sources_to_use is not None and not sources_to_use:
+            # Liste vide = aucune source activée
+            print(f"[SearchService] ⚠️  Aucune source activée - Retour résultats vides")
+            return {
+                "success": True,
+                "offers": [],
+                "count": 0,
+                "scraped_count": 0,
+                "deduplicated_count": 0,
+                "saved_count": 0,
+                "sources_used": [],
+                "cached": False,
+                "search_params": {
+                    "keywords": keywords,
+                    "location": location,
+                    "job_type": job_type,
+                    "work_mode": work_mode,
+                    "company": company
+                },
+                "scraped_at": datetime.utcnow().isoformat(),
+                "duration_seconds": 0,
+                "message": "Aucune source n'est activée. Veuillez activer au moins une source dans les paramètres."
+            }
+        
+        # 3. Cache partagé : offres brutes par (requête, source), tous utilisateurs confondus
+        cached_sources: Dict[str, Dict] = {}
+        if use_cache and user_id and sources_to_use:
+            cache_keys = {
+                source: self.cache_service.generate_cache_key(keywords, location, source, limit_per_platform)
+                for source in sources_to_use
+            }
+            cached = await self.cache_service.get_many(
+                db, list(cache_keys.values()), max_age=timedelta(hours=cache_ttl)
             )
-            
-            cached_results = await self.cache_service.get_cached_results(db, cache_key)
-            if cached_results:
-                print(f"[SearchService] ⚡ Résultats depuis cache (instantané)")
-                return cached_results
-        
-        # 3. Scraping (sources activées avec gestion priorités)
-        if sources_to_use is not None:
-            # Cas où l'utilisateur a des préférences
-            if not sources_to_use:
-                # Liste vide = aucune source activée
-                print(f"[SearchService] ⚠️  Aucune source activée - Retour résultats vides")
-                return {
-                    "success": True,
-                    "offers": [],
-                    "count": 0,
-                    "scraped_count": 0,
-                    "deduplicated_count": 0,
-                    "saved_count": 0,
-                    "sources_used": [],
-                    "cached": False,
-                    "search_params": {
-                        "keywords": keywords,
-                        "location": location,
-                        "job_type": job_type,
-                        "work_mode": work_mode,
-                        "company": company
-                    },
-                    "scraped_at": datetime.utcnow().isoformat(),
-                    "duration_seconds": 0,
-                    "message": "Aucune source n'est activée. Veuillez activer au moins une source dans les paramètres."
-                }
-            
-            # NOUVEAU : Scraper les sources activées par l'utilisateur
-            raw_results = await self.scraping_service.scrape_priority_sources(
-                priority_sources=sources_to_use,  # Toutes les sources activées
+            cached_sources = {source: cached[key] for source, key in cache_keys.items() if key in cached}
+            if cached_sources:
+                print(f"[SearchService] ⚡ {len(cached_sources)}/{len(sources_to_use)} source(s) depuis le cache")
+        
+        # 4. Scraping des seules sources absentes du cache
+        #    (partagé : les recherches identiques simultanées attendent un seul scraping)
+        sources_to_scrape = (
+            [source for source in sources_to_use if source not in cached_sources]
+            if sources_to_use is not None else None
+        )
+        raw_results = ScrapeResults()
+        if sources_to_scrape is None or sources_to_scrape:
+            raw_results = await self._scrape_single_flight(
+                sources=sources_to_scrape,
                 keywords=keywords,
                 location=location or "",
                 limit_per_source=limit_per_platform
             )
-        else:
-            # ANCIEN : Scraper toutes les plateformes (si pas de préférences)
-            raw_results = await self.scraping_service.scrape_all_platforms(
-                keywords=keywords,
-                location=location or "",
-                limit_per_platform=limit_per_platform
-            )
         
-        # Aplatir les résultats (dict[platform/source] -> list)
-        all_offers = []
-        for source, offers in raw_results.items():
-            all_offers.extend(offers)
-        
-        print(f"[SearchService] {len(all_offers)} offres brutes récupérées")
+        # Sources qui n'ont pas répondu dans les délais (résultats partiels)
+        timed_out_sources = list(getattr(raw_results, "timed_out", []))
+        if timed_out_sources:
+            print(f"[SearchService] ⏱️ Résultats partiels, sources hors délai: {timed_out_sources}")
         
         # Normaliser les champs des offres (title -> job_title, company -> company_name, url -> source_url)
-        all_offers = self._normalize_offer_fields(all_offers)
+        scraped_by_source = {
+            source: self._normalize_offer_fields(offers) for source, offers in raw_results.items()
+        }
+        
+        # 5. Projection pour l'utilisateur : offres en cache + scrapées, dans l'ordre
+        #    des sources (la déduplication garde la première occurrence), puis filtres
+        all_offers = []
+        for source in (sources_to_use if sources_to_use is not None else list(scraped_by_source)):
+            if source in cached_sources:
+                all_offers.extend(cached_sources[source]["offers"])
+            else:
+                all_offers.extend(scraped_by_source.get(source, []))
+        print(f"[SearchService] {len(all_offers)} offres brutes récupérées")
         
-        # 4. Déduplication (inchangé)
         deduplicated_offers = await self.deduplicate_offers(all_offers)
         print(f"[SearchService] {len(deduplicated_offers)} offres après déduplication")
         
-        # 5. Filtrage par critères (inchangé)
         filtered_offers = self._filter_offers(
             deduplicated_offers,
             job_type=job_type,
@@ -205,30 +227,29 @@ class SearchService:
         )
         print(f"[SearchService] {len(filtered_offers)} offres après filtrage")
         
-        # 6. Sauvegarde en DB + génération embeddings (inchangé)
-        saved_count = await self._save_offers_to_db(db, filtered_offers)
-        print(f"[SearchService] {saved_count} offres sauvegardées en DB")
+        # 6. Sauvegarde en DB des offres fraîchement scrapées (celles du cache l'ont
+        #    été au premier scraping) + embeddings des nouvelles offres
+        scraped_ids = {id(offer) for offers in scraped_by_source.values() for offer in offers}
+        save_stats = await self._save_offers_to_db(
+            db, [offer for offer in filtered_offers if id(offer) in scraped_ids], user_id=user_id
+        )
+        saved_count = save_stats["inserted"]
+        print(f"[SearchService] {saved_count} offres sauvegardées en DB, {save_stats['skipped']} ignorées")
         
         # 7. Calcul durée d'exécution
         end_time = datetime.utcnow()
         duration = (end_time - start_time).total_seconds()
         
-        # 8. NOUVEAU : Sauvegarder en cache si activé
-        if use_cache and user_id:
-            await self.cache_service.save_to_cache(
+        # 8. Mise en cache partagée des sources qui ont répondu
+        #    (pas les sources hors délai / en erreur, pour ne pas figer une source manquante)
+        if use_cache and user_id and sources_to_scrape:
+            await self.cache_service.save_sources(
                 db=db,
-                cache_key=cache_key,
-                user_id=user_id,
                 keywords=keywords,
                 location=location,
-                job_type=job_type,
-                work_mode=work_mode,
-                company=company,
-                sources_used=sources_to_use or list(raw_results.keys()),
-                results=filtered_offers,
-                scraped_count=len(all_offers),
-                deduplicated_count=len(deduplicated_offers),
-                execution_time_seconds=int(duration),
+                limit_per_source=limit_per_platform,
+                results=self._cacheable_sources(raw_results, scraped_by_source),
+                execution_time_seconds=int(getattr(raw_results, "duration_seconds", 0)),
                 ttl_hours=cache_ttl
             )
         
@@ -240,8 +261,12 @@ class SearchService:
             "scraped_count": len(all_offers),
             "deduplicated_count": len(deduplicated_offers),
             "saved_count": saved_count,
+            "skipped_count": save_stats["skipped"],
             "sources_used": sources_to_use or list(raw_results.keys()),
-            "cached": False,
+            "timed_out_sources": timed_out_sources,
+            "failed_sources": list(raw_results.failed),
+            "cached": bool(cached_sources) and not sources_to_scrape,
+            "cached_sources": list(cached_sources),
             "search_params": {
                 "keywords": keywords,
                 "location": location,
@@ -253,6 +278,77 @@ class SearchService:
             "duration_seconds": round(duration, 2)
         }
     
+    @staticmethod
+    def _cacheable_sources(raw_results: ScrapeResults, scraped_by_source: Dict[str, List[Dict]]) -> Dict[str, List[Dict]]:
+        """
+        Sources à écrire dans le cache partagé : celles qui ont répondu
+        
+        Une source hors délai ou en erreur (ex. RateLimitExceeded, API en 429)
+        a une liste vide dans les résultats : la mettre en cache la masquerait
+        à tous les utilisateurs pendant toute la durée du cache.
+        """
+        unavailable = set(raw_results.timed_out) | set(raw_results.failed)
+        return {
+            source: offers for source, offers in scraped_by_source.items()
+            if source not in unavailable
+        }
+    
+    def _scrape_flight_key(
+        self,
+        sources: Optional[List[str]],
+        keywords: str,
+        location: str,
+        limit_per_source: int
+    ) -> str:
+        """
+        Clé single-flight d'un scraping : requête normalisée + ensemble de sources
+        
+        L'utilisateur et les filtres appliqués après coup (job_type, work_mode,
+        company) n'en font pas partie : ils ne changent pas le scraping.
+        """
+        normalized = {
+            "keywords": " ".join((keywords or "").lower().split()),
+            "location": " ".join((location or "").lower().split()),
+            "sources": sorted(set(sources)) if sources is not None else None,
+            "limit": limit_per_source,
+        }
+        digest = hashlib.sha256(json.dumps(normalized, sort_keys=True).encode()).hexdigest()
+        return f"scrape:{digest}"
+    
+    async def _scrape_single_flight(
+        self,
+        sources: Optional[List[str]],
+        keywords: str,
+        location: str,
+        limit_per_source: int
+    ) -> ScrapeResults:
+        """
+        Scrape les sources (ou toutes les plateformes si sources=None) une seule
+        fois pour toutes les recherches identiques en cours
+        """
+        async def _scrape() -> ScrapeResults:
+            if sources is not None:
+                # NOUVEAU : Scraper les sources activées par l'utilisateur
+                return await self.scraping_service.scrape_priority_sources(
+                    priority_sources=sources,  # Toutes les sources activées
+                    keywords=keywords,
+                    location=location,
+                    limit_per_source=limit_per_source
+                )
+            # ANCIEN : Scraper toutes les plateformes (si pas de préférences)
+            return await self.scraping_service.scrape_all_platforms(
+                keywords=keywords,
+                location=location,
+                limit_per_platform=limit_per_source
+            )
+        
+        return await single_flight.do(
+            key=self._scrape_flight_key(sources, keywords, location, limit_per_source),
+            fn=_scrape,
+            serialize=ScrapeResults.to_payload,
+            deserialize=ScrapeResults.from_payload
+        )
+    
     async def get_feed(
         self,
         db: AsyncSession,
@@ -278,8 +374,8 @@ class SearchService:
         """
         print(f"[SearchService] get_feed: user={user_id}, profile={profile_id}, limit={limit}")
         
-        # 1. Récupérer le profil
-        profile_query = select(Profile).where(Profile.id == profile_id)
+        # 1. Récupérer le profil (avec compétences pour le score)
+        profile_query = select(Profile).where(Profile.id == profile_id).options(selectinload(Profile.skills))
         result = await db.execute(profile_query)
         profile = result.scalar_one_or_none()
         
@@ -291,18 +387,31 @@ class SearchService:
                 "count": 0
             }
         
-        # 2. Récupérer les offres récentes (< max_age_days)
-        cutoff_date = datetime.utcnow() - timedelta(days=max_age_days)
+        # 2. Récupérer les offres récentes (< max_age_days) avec leur score en cache
+        #    (une seule requête : LEFT JOIN sur user_feed_cache non expiré)
+        now = datetime.utcnow()
+        cutoff_date = now - timedelta(days=max_age_days)
         
-        offers_query = select(JobOffer).where(
+        offers_query = select(JobOffer, UserFeedCache.compatibility_score).outerjoin(
+            UserFeedCache,
             and_(
+                UserFeedCache.job_offer_id == JobOffer.id,
+                UserFeedCache.user_id == user_id,
+                UserFeedCache.profile_id == profile_id,
+                UserFeedCache.expires_at > now
+            )
+        ).where(
+            and_(
+                # Plage bornée des deux côtés : seules les partitions récentes sont lues
+                # (sans borne haute, job_offers_default serait aussi parcourue)
                 JobOffer.scraped_at >= cutoff_date,
-                JobOffer.scraped_at.isnot(None)
+                JobOffer.scraped_at <= now
             )
         ).order_by(desc(JobOffer.scraped_at)).limit(200)  # Limite pour performance
         
         result = await db.execute(offers_query)
-        recent_offers = result.scalars().all()
+        rows = result.all()
+        recent_offers = [offer for offer, _ in rows]
         
         print(f"[SearchService] {len(recent_offers)} offres récentes trouvées")
         
@@ -314,50 +423,28 @@ class SearchService:
                 "message": "Aucune offre récente disponible"
             }
         
-        # 3. Vérifier cache existant
-        cache_query = select(UserFeedCache).where(
-            and_(
-                UserFeedCache.user_id == user_id,
-                UserFeedCache.profile_id == profile_id,
-                UserFeedCache.expires_at > datetime.utcnow()
-            )
-        )
-        result = await db.execute(cache_query)
-        cached_scores = {cache.job_offer_id: cache.compatibility_score 
-                        for cache in result.scalars().all()}
-        
-        print(f"[SearchService] {len(cached_scores)} scores en cache")
+        # 3. Scores en cache
+        scores = {offer.id: score for offer, score in rows if score is not None}
+        print(f"[SearchService] {len(scores)} scores en cache")
         
-        # 4. Calculer scores pour offres non cachées
-        offers_with_scores = []
+        # 4. Calculer en un seul batch les scores des offres non cachées
+        uncached_offers = [offer for offer in recent_offers if offer.id not in scores]
+        if uncached_offers:
+            try:
+                batch_scores = await AnalysisService.score_offers_batch(profile, uncached_offers)
+                scores.update({offer.id: score for offer, score in zip(uncached_offers, batch_scores)})
+                # Mettre en cache (expire dans 24h) + embeddings générés, un seul commit
+                await self._cache_scores(db, user_id, profile_id, uncached_offers, batch_scores)
+            except Exception as e:
+                print(f"[SearchService] Erreur calcul des scores ({len(uncached_offers)} offres): {e}")
+                await db.rollback()
         
-        for offer in recent_offers:
-            # Utiliser cache si disponible
-            if offer.id in cached_scores:
-                score = cached_scores[offer.id]
-            else:
-                # Calculer nouveau score
-                try:
-                    score_result = await self.ai_service.calculate_compatibility(
-                        profile_data=self._profile_to_dict(profile),
-                        job_data=self._offer_to_dict(offer)
-                    )
-                    score = score_result.get("overall_score", 0)
-                    
-                    # Mettre en cache (expire dans 24h)
-                    await self._cache_score(
-                        db, user_id, profile_id, offer.id, score
-                    )
-                except Exception as e:
-                    print(f"[SearchService] Erreur calcul score pour offre {offer.id}: {e}")
-                    score = 0
-            
-            # Filtrer par score minimum
-            if score >= min_score:
-                offers_with_scores.append({
-                    "offer": offer,
-                    "compatibility_score": score
-                })
+        # Filtrer par score minimum
+        offers_with_scores = [
+            {"offer": offer, "compatibility_score": scores.get(offer.id, 0)}
+            for offer in recent_offers
+            if scores.get(offer.id, 0) >= min_score
+        ]
         
         # 5. Trier par score décroissant
         offers_with_scores.sort(key=lambda x: x["compatibility_score"], reverse=True)
@@ -398,6 +485,9 @@ class SearchService:
         """
         Déduplique les offres par URL et similarité titre+entreprise
         
+        Délègue à OfferDeduplicator (blocking par entreprise + index de trigrammes),
+        en temps quasi linéaire au lieu de comparer chaque paire d'offres.
+        
         Args:
             offers: Liste d'offres brutes
         
@@ -407,38 +497,11 @@ class SearchService:
         if not offers:
             return []
         
-        seen_urls = set()
-        seen_signatures = set()
-        deduplicated = []
-        
-        for offer in offers:
-            # Déduplication par URL (exact)
-            url = offer.get("source_url", "")
-            if url and url in seen_urls:
-                continue
-            
-            # Déduplication par signature (titre + entreprise)
-            title = offer.get("job_title", "").lower().strip()
-            company = offer.get("company_name", "").lower().strip()
-            signature = f"{title}|{company}"
-            
-            # Vérifier similarité avec signatures existantes
-            is_duplicate = False
-            for existing_sig in seen_signatures:
-                similarity = SequenceMatcher(None, signature, existing_sig).ratio()
-                if similarity >= self.deduplication_threshold:
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                deduplicated.append(offer)
-                if url:
-                    seen_urls.add(url)
-                seen_signatures.add(signature)
-        
+        deduplicator = OfferDeduplicator(threshold=self.deduplication_threshold)
+        deduplicated = deduplicator.deduplicate(offers)
+        print(f"[SearchService] Déduplication: {deduplicator.last_stats}")
         return deduplicated
     
-    
     def _normalize_offer_fields(self, offers: List[Dict]) -> List[Dict]:
         """
         Normalise les noms de champs des offres scrapées
@@ -495,127 +558,184 @@ class SearchService:
     async def _save_offers_to_db(
         self,
         db: AsyncSession,
-        offers: List[Dict]
-    ) -> int:
+        offers: List[Dict],
+        user_id: Optional[str] = None
+    ) -> Dict[str, int]:
         """
-        Sauvegarde les offres en DB avec génération d'embeddings
-        Utilise UPSERT pour éviter les doublons
+        Sauvegarde les offres en DB par INSERT multi-lignes ... ON CONFLICT DO NOTHING
+        
+        La déduplication repose sur l'empreinte content_hash : job_offers étant
+        partitionnée (pas d'index unique possible), les empreintes sont d'abord
+        réservées dans job_offer_fingerprints puis seules les offres dont
+        l'empreinte est nouvelle sont insérées, dans la même transaction, sans
+        requête par offre. Une empreinte dont l'offre n'existe plus (offre ou
+        utilisateur supprimé) est reprise par la nouvelle offre.
+        Les embeddings ne sont mis en file que pour les offres réellement insérées.
         
         Returns:
-            Nombre d'offres sauvegardées
+            {"inserted": nombre d'offres insérées, "skipped": doublons / offres invalides}
         """
+        stats = {"inserted": 0, "skipped": 0}
         if not offers:
-            return 0
+            return stats
         
-        saved_count = 0
+        if not user_id:
+            # job_offers.user_id est obligatoire
+            print(f"[SearchService] ⚠️  Pas d'utilisateur, offres non sauvegardées")
+            stats["skipped"] = len(offers)
+            return stats
         
+        # Lignes à insérer, dédupliquées dans le lot par empreinte
+        rows_by_hash: Dict[str, Dict] = {}
         for offer_data in offers:
-            try:
-                # Générer hash unique pour déduplication DB
-                offer_hash = self._generate_offer_hash(offer_data)
-                
-                # Vérifier si offre existe déjà
-                existing_query = select(JobOffer).where(
-                    or_(
-                        JobOffer.source_url == offer_data.get("source_url"),
-                        JobOffer.job_title == offer_data.get("job_title")
-                    )
-                ).limit(1)
-                result = await db.execute(existing_query)
-                existing = result.scalar_one_or_none()
-                
-                if existing:
-                    # Offre existe déjà, skip
-                    continue
-                
-                # Générer embedding pour description
-                embedding = None
-                description = offer_data.get("description", "")
-                if description:
-                    try:
-                        embedding = await self.ai_service.generate_embedding(description)
-                    except Exception as e:
-                        print(f"[SearchService] Erreur génération embedding: {e}")
-                
-                # Créer nouvelle offre
-                new_offer = JobOffer(
-                    title=offer_data.get("title", ""),
-                    company=offer_data.get("company", "Non spécifié"),
-                    location=offer_data.get("location", "Non spécifié"),
-                    description=description,
-                    requirements=offer_data.get("requirements", ""),
-                    source_url=offer_data.get("url", ""),
-                    source_platform=offer_data.get("source_platform", "unknown"),
-                    job_type=offer_data.get("job_type"),
-                    work_mode=offer_data.get("work_mode"),
-                    scraped_at=offer_data.get("scraped_at") or datetime.utcnow(),
-                    embedding=embedding
-                )
-                
-                db.add(new_offer)
-                saved_count += 1
-                
-            except Exception as e:
-                print(f"[SearchService] Erreur sauvegarde offre: {e}")
+            row = self._offer_to_row(offer_data, user_id)
+            if row is None or row["content_hash"] in rows_by_hash:
+                stats["skipped"] += 1
                 continue
+            rows_by_hash[row["content_hash"]] = row
         
-        # Commit batch
+        rows = list(rows_by_hash.values())
+        inserted = []
         try:
+            for start in range(0, len(rows), self.INSERT_CHUNK_SIZE):
+                chunk = rows[start:start + self.INSERT_CHUNK_SIZE]
+                fingerprint = insert(JobOfferFingerprint)
+                stmt = (
+                    fingerprint
+                    .values([
+                        {"content_hash": row["content_hash"], "job_offer_id": row["id"]} for row in chunk
+                    ])
+                    .on_conflict_do_update(
+                        index_elements=[JobOfferFingerprint.content_hash],
+                        set_={"job_offer_id": fingerprint.excluded.job_offer_id, "created_at": func.now()},
+                        # Empreinte orpheline (offre supprimée, ex. avec son utilisateur) : reprise
+                        where=text(
+                            "NOT EXISTS (SELECT 1 FROM job_offers "
+                            "WHERE job_offers.id = job_offer_fingerprints.job_offer_id)"
+                        )
+                    )
+                    .returning(JobOfferFingerprint.content_hash)
+                )
+                result = await db.execute(stmt)
+                new_hashes = set(result.scalars().all())
+                new_rows = [row for row in chunk if row["content_hash"] in new_hashes]
+                if new_rows:
+                    await db.execute(insert(JobOffer).values(new_rows))
+                    inserted.extend(row["id"] for row in new_rows)
             await db.commit()
         except Exception as e:
-            print(f"[SearchService] Erreur commit DB: {e}")
+            print(f"[SearchService] Erreur insertion DB: {e}")
             await db.rollback()
-            saved_count = 0
+            return {"inserted": 0, "skipped": len(offers)}
+        
+        stats["inserted"] = len(inserted)
+        stats["skipped"] += len(rows) - len(inserted)
+        
+        # Embeddings des nouvelles offres : mis en file (worker "embeddings"), l'ingestion n'attend pas
+        if inserted:
+            await self._enqueue_offer_embeddings(inserted)
+        
+        return stats
+    
+    def _offer_to_row(self, offer_data: Dict, user_id: str) -> Optional[Dict]:
+        """Convertit une offre normalisée en ligne job_offers (None si inutilisable)"""
+        job_title = (offer_data.get("job_title") or "").strip()
+        if not job_title:
+            return None
+        
+        scraped_at = offer_data.get("scraped_at")
+        if isinstance(scraped_at, str):
+            try:
+                scraped_at = datetime.fromisoformat(scraped_at)
+            except ValueError:
+                scraped_at = None
+        
+        # Longueurs tronquées aux tailles des colonnes : une valeur trop longue
+        # ferait échouer tout l'INSERT multi-lignes
+        return {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "content_hash": self._generate_offer_hash(offer_data),
+            "job_title": job_title[:255],
+            "company_name": (offer_data.get("company_name") or "Non spécifié")[:255],
+            "location": (offer_data.get("location") or "Non spécifié")[:255],
+            "description": offer_data.get("description") or "",
+            "requirements": offer_data.get("requirements") or "",
+            "source_url": (offer_data.get("source_url") or "")[:1000],
+            "source_platform": (offer_data.get("source_platform") or "unknown")[:100],
+            "job_type": (offer_data.get("job_type") or "")[:50] or None,
+            "work_mode": (offer_data.get("work_mode") or "")[:20] or None,
+            "scraped_at": scraped_at or datetime.utcnow(),
+        }
+    
+    async def _enqueue_offer_embeddings(self, offer_ids: List):
+        """
+        Met en file la génération des embeddings d'offres insérées
         
-        return saved_count
+        Si le broker est indisponible, les offres restent sans embedding et
+        sont rattrapées par la tâche périodique backfill_embeddings.
+        """
+        try:
+            await asyncio.to_thread(
+                celery_app.send_task,
+                "app.tasks.embedding_tasks.embed_job_offers",
+                args=[[str(offer_id) for offer_id in offer_ids]],
+                queue="embeddings"
+            )
+        except Exception as e:
+            print(f"[SearchService] Mise en file des embeddings impossible (backfill différé): {e}")
     
     def _generate_offer_hash(self, offer_data: Dict) -> str:
-        """Génère un hash unique pour une offre"""
-        signature = f"{offer_data.get('title', '')}|{offer_data.get('company', '')}|{offer_data.get('url', '')}"
+        """
+        Empreinte de contenu d'une offre (job_offers.content_hash, unicité : job_offer_fingerprints)
+        
+        md5(titre | entreprise | url) avec titre et entreprise en minuscules et
+        espaces normalisés. La migration add_offer_content_hash_001 reproduit
+        cette normalisation en SQL pour les offres existantes.
+        """
+        def _normalize(value: Optional[str]) -> str:
+            return " ".join((value or "").lower().split())
+        
+        title = offer_data.get("job_title") or offer_data.get("title")
+        company = offer_data.get("company_name") or offer_data.get("company")
+        url = offer_data.get("source_url") or offer_data.get("url") or ""
+        signature = f"{_normalize(title)}|{_normalize(company)}|{url.strip()}"
         return hashlib.md5(signature.encode()).hexdigest()
     
-    async def _cache_score(
+    async def _cache_scores(
         self,
         db: AsyncSession,
         user_id: str,
         profile_id: str,
-        job_offer_id: str,
-        score: float
+        offers: List[JobOffer],
+        scores: List[float]
     ):
-        """Met en cache un score de compatibilité"""
-        try:
-            cache_entry = UserFeedCache(
-                user_id=user_id,
-                profile_id=profile_id,
-                job_offer_id=job_offer_id,
-                compatibility_score=score,
-                calculated_at=datetime.utcnow(),
-                expires_at=datetime.utcnow() + timedelta(hours=24)
-            )
-            db.add(cache_entry)
-            await db.commit()
-        except Exception as e:
-            print(f"[SearchService] Erreur cache score: {e}")
-            await db.rollback()
-    
-    def _profile_to_dict(self, profile: Profile) -> Dict:
-        """Convertit un profil en dict pour AI"""
-        return {
-            "title": profile.current_title or "",
-            "summary": profile.summary or "",
-            "skills": profile.skills or [],
-            "experience_years": 0,  # TODO: calculer depuis experiences
-        }
+        """Met en cache des scores de compatibilité (un seul INSERT ... ON CONFLICT DO UPDATE)"""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(hours=24)
+        stmt = insert(UserFeedCache).values([
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "profile_id": profile_id,
+                "job_offer_id": offer.id,
+                "compatibility_score": score,
+                "calculated_at": now,
+                "expires_at": expires_at,
+            }
+            for offer, score in zip(offers, scores)
+        ])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_user_profile_offer_cache",
+            set_={
+                "compatibility_score": stmt.excluded.compatibility_score,
+                "calculated_at": stmt.excluded.calculated_at,
+                "expires_at": stmt.excluded.expires_at,
+            }
+        )
+        await db.execute(stmt)
+        await db.commit()
     
-    def _offer_to_dict(self, offer: JobOffer) -> Dict:
-        """Convertit une offre en dict pour AI"""
-        return {
-            "title": offer.job_title,
-            "description": offer.description or "",
-            "requirements": offer.requirements or "",
-            "company": offer.company_name,
-            "location": offer.location
-        }
     async def search_hybrid(
         self,
         db: AsyncSession,
@@ -0,0 +1,120 @@
+"""
+Tâches Celery de la file `embeddings`
+
+Exécutées par un worker dédié qui garde le modèle chargé (EMBEDDING_MODE=eager) :
+- encode_texts : inférence déléguée par les processus en EMBEDDING_MODE=remote
+- embed_job_offers : embeddings des offres qui viennent d'être scrapées
+  (mis en file par SearchService au lieu de bloquer l'ingestion)
+- backfill_embeddings : rattrapage par lots des lignes `embedding IS NULL`
+  (Celery Beat toutes les EMBEDDING_BACKFILL_INTERVAL_MINUTES minutes)
+"""
+from typing import Any, Dict, List, Optional
+
+from celery.utils.log import get_task_logger
+
+from app.celery_config import celery_app, run_async, run_resumable_batches
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.embedding_backfill import embedding_backfill
+from app.services.embedding_service import EmbeddingService
+
+logger = get_task_logger(__name__)
+
+
+@celery_app.task(
+    name='app.tasks.embedding_tasks.encode_texts',
+    acks_late=False  # résultat attendu de façon synchrone : pas de rejeu après perte du worker
+)
+def encode_texts(texts: List[str]) -> List[List[float]]:
+    """
+    Encode des textes avec le modèle du worker.
+    
+    Le cache est consulté par l'appelant ; ici, inférence seule.
+    
+    Args:
+        texts: Textes à encoder (non vides)
+    
+    Returns:
+        Liste d'embeddings (listes de floats)
+    """
+    return EmbeddingService.encode_local(texts)
+
+
+@celery_app.task(
+    bind=True,
+    name='app.tasks.embedding_tasks.embed_job_offers',
+    max_retries=3,
+    default_retry_delay=60
+)
+def embed_job_offers(self, offer_ids: List[str]) -> Dict[str, Any]:
+    """
+    Génère les embeddings d'offres précises (nouvelles offres scrapées).
+    
+    Idempotent : les offres qui ont déjà un embedding sont ignorées. En cas
+    d'échec définitif, le backfill périodique les rattrape.
+    
+    Args:
+        offer_ids: IDs des offres insérées
+    """
+    async def _run():
+        async with AsyncSessionLocal() as db:
+            processed = await embedding_backfill.embed_job_offers(db, offer_ids)
+        logger.info(f"✅ Embeddings: {processed}/{len(offer_ids)} offre(s) encodée(s)")
+        return {"requested": len(offer_ids), "processed": processed}
+    
+    try:
+        return run_async(_run())
+    except Exception as e:
+        logger.error(f"❌ Erreur embeddings offres: {str(e)}")
+        raise self.retry(exc=e)
+
+
+@celery_app.task(
+    bind=True,
+    name='app.tasks.embedding_tasks.backfill_embeddings',
+    max_retries=3,
+    default_retry_delay=120
+)
+def backfill_embeddings(
+    self,
+    table: str = "job_offers",
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Encode par lots les lignes sans embedding d'une table (job_offers ou profiles).
+    
+    Chaque exécution traite au plus max_batches lots depuis le checkpoint Redis,
+    puis se remet en file si la table n'est pas terminée : les exécutions
+    restent courtes et un worker arrêté reprend au dernier lot validé.
+    
+    Returns:
+        Dict avec processed, batches, done et le backlog restant
+    """
+    batch_size = batch_size or settings.EMBEDDING_BACKFILL_BATCH_SIZE
+    max_batches = max_batches or settings.EMBEDDING_BACKFILL_MAX_BATCHES
+    
+    async def _run_batches():
+        stats = {"table": table, "processed": 0, "batches": 0, "done": False}
+        async with AsyncSessionLocal() as db:
+            while stats["batches"] < max_batches:
+                batch = await embedding_backfill.run_batch(db, table, batch_size)
+                stats["batches"] += 1
+                stats["processed"] += batch["processed"]
+                if batch["done"]:
+                    stats["done"] = True
+                    break
+            stats["backlog"] = (await embedding_backfill.backlog(db))[table]
+        logger.info(f"✅ Backfill {table}: {stats['processed']} ligne(s), "
+                    f"{stats['batches']} lot(s), reste {stats['backlog']}")
+        return stats
+    
+    stats = run_resumable_batches(
+        self,
+        embedding_backfill.checkpoints,
+        table,
+        lock_ttl=settings.EMBEDDING_BACKFILL_INTERVAL_MINUTES * 60,
+        run_batches=_run_batches,
+        requeue_kwargs={"table": table, "batch_size": batch_size, "max_batches": max_batches}
+    )
+    return stats if stats is not None else {"table": table, "skipped": True}
@@ -0,0 +1,86 @@
+"""
+Tâches Celery de la file `maintenance`
+
+Purges par lots des lignes expirées (services/batched_delete.py), lancées par
+Celery Beat toutes les PURGE_INTERVAL_MINUTES minutes :
+- search_results_cache : résultats de recherche expirés
+- user_feed_cache : scores de feed expirés
+- job_offers_default : offres conservées par la rétention qui ne sont plus
+  référencées (mise en file par cleanup_old_job_offers)
+"""
+from typing import Any, Dict, Optional
+
+from celery.utils.log import get_task_logger
+
+from app.celery_config import celery_app, run_resumable_batches
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.services.batched_delete import batched_delete
+from app.services.job_offer_partitions import job_offer_partitions
+from app.services.search_cache_service import EXPIRED_SEARCH_CACHE
+from app.services.search_service import EXPIRED_FEED_CACHE
+
+logger = get_task_logger(__name__)
+
+
+async def _purge_job(db, job: str):
+    """PurgeJob correspondant à un nom de purge"""
+    if job == EXPIRED_SEARCH_CACHE.name:
+        return EXPIRED_SEARCH_CACHE
+    if job == EXPIRED_FEED_CACHE.name:
+        return EXPIRED_FEED_CACHE
+    if job == job_offer_partitions.DEFAULT_PARTITION:
+        return await job_offer_partitions.residue_purge_job(db)
+    raise ValueError(f"Purge inconnue: {job}")
+
+
+@celery_app.task(
+    bind=True,
+    name='app.tasks.maintenance_tasks.purge_expired',
+    max_retries=3,
+    default_retry_delay=120
+)
+def purge_expired(
+    self,
+    job: str,
+    batch_size: Optional[int] = None,
+    max_batches: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Supprime par lots les lignes expirées d'une table.
+    
+    Chaque exécution traite au plus max_batches lots depuis le checkpoint Redis
+    (PROGRESS publié après chaque lot), puis se remet en file si la purge n'est
+    pas terminée : les exécutions restent courtes et un worker arrêté reprend
+    au dernier lot validé.
+    
+    Args:
+        job: search_results_cache, user_feed_cache ou job_offers_default
+    
+    Returns:
+        Dict avec deleted, batches et done
+    """
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    max_batches = max_batches or settings.PURGE_MAX_BATCHES
+    
+    def _progress(stats: Dict):
+        self.update_state(state="PROGRESS", meta=stats)
+    
+    async def _run_batches():
+        async with AsyncSessionLocal() as db:
+            purge = await _purge_job(db, job)
+            stats = await batched_delete.run(
+                db, purge, batch_size=batch_size, max_batches=max_batches, progress=_progress
+            )
+        logger.info(f"✅ Purge {job}: {stats['deleted']} ligne(s), {stats['batches']} lot(s)")
+        return stats
+    
+    stats = run_resumable_batches(
+        self,
+        batched_delete.checkpoints,
+        job,
+        lock_ttl=settings.PURGE_INTERVAL_MINUTES * 60,
+        run_batches=_run_batches,
+        requeue_kwargs={"job": job, "batch_size": batch_size, "max_batches": max_batches}
+    )
+    return stats if stats is not None else {"job": job, "skipped": True}
@@ -4,21 +4,21 @@ Tâches Celery pour le scraping périodique
 Ces tâches sont exécutées automatiquement par Celery Beat :
 - scrape_all_watched_companies : Toutes les 4h
 - scrape_all_custom_sources : Toutes les 4h (décalé)
-- cleanup_old_job_offers : Tous les jours à 3h
+- cleanup_old_job_offers : Tous les jours à 3h (partitions de job_offers)
+- refresh_remoteok_snapshot : Toutes les REMOTEOK_SNAPSHOT_REFRESH_MINUTES minutes
 """
-import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
 from uuid import UUID
 from celery.utils.log import get_task_logger
-from sqlalchemy import select, delete, and_
+from sqlalchemy import select, and_
 
-from app.celery_config import celery_app
+from app.celery_config import celery_app, run_async
 from app.database import AsyncSessionLocal
 from app.models.watched_company import WatchedCompany
 from app.models.custom_source import CustomSource
-from app.models.job_offer import JobOffer
 from app.services.company_watch_service import CompanyWatchService
+from app.services.job_offer_partitions import job_offer_partitions
 
 logger = get_task_logger(__name__)
 
@@ -110,7 +110,7 @@ def scrape_all_watched_companies(self) -> Dict[str, Any]:
         return stats
     
     try:
-        return asyncio.run(_run())
+        return run_async(_run())
     except Exception as e:
         logger.error(f"❌ Erreur task: {str(e)}")
         raise self.retry(exc=e)
@@ -185,7 +185,7 @@ def scrape_all_custom_sources(self) -> Dict[str, Any]:
         return stats
     
     try:
-        return asyncio.run(_run())
+        return run_async(_run())
     except Exception as e:
         logger.error(f"❌ Erreur task: {str(e)}")
         raise self.retry(exc=e)
@@ -198,12 +198,16 @@ def scrape_all_custom_sources(self) -> Dict[str, Any]:
 )
 def cleanup_old_job_offers(self) -> Dict[str, Any]:
     """
-    Nettoie les offres d'emploi de plus de 30 jours.
+    Maintient les partitions mensuelles de job_offers.
     
-    Garde en DB uniquement les offres récentes pour éviter la surcharge.
+    1. Crée les partitions des JOB_OFFER_PARTITIONS_AHEAD prochains mois
+    2. Retire (DROP ou DETACH) les partitions plus vieilles que
+       JOB_OFFER_RETENTION_DAYS, en conservant les offres référencées par
+       une candidature ou un document (voir services/job_offer_partitions.py)
+    3. Met en file la purge par lots des offres conservées devenues orphelines
     
     Returns:
-        Dict avec nombre d'offres supprimées
+        Dict avec partitions créées / retirées et nombre d'offres supprimées
     """
     async def _run():
         logger.info("🧹 Démarrage nettoyage anciennes offres...")
@@ -215,17 +219,19 @@ def cleanup_old_job_offers(self) -> Dict[str, Any]:
         
         try:
             async with AsyncSessionLocal() as db:
-                # Supprimer offres > 30 jours
-                thirty_days_ago = datetime.now() - timedelta(days=30)
+                stats["partitions_created"] = await job_offer_partitions.ensure_partitions(db)
                 
-                delete_stmt = delete(JobOffer).where(
-                    JobOffer.scraped_at < thirty_days_ago
-                )
-                
-                result = await db.execute(delete_stmt)
-                await db.commit()
-                
-                stats["offers_deleted"] = result.rowcount
+                retention = await job_offer_partitions.apply_retention(db)
+                stats["partitions_retired"] = [partition["partition"] for partition in retention["partitions"]]
+                stats["offers_retained"] = retention["offers_retained"]
+                stats["offers_deleted"] = retention["offers_removed"]
+            
+            # Offres conservées qui ne sont plus référencées : purge par lots (file maintenance)
+            celery_app.send_task(
+                'app.tasks.maintenance_tasks.purge_expired',
+                kwargs={'job': job_offer_partitions.DEFAULT_PARTITION},
+                queue='maintenance'
+            )
                 
         except Exception as e:
             error_msg = f"Erreur nettoyage offres: {str(e)}"
@@ -234,12 +240,15 @@ def cleanup_old_job_offers(self) -> Dict[str, Any]:
             raise
         
         stats["completed_at"] = datetime.now().isoformat()
-        logger.info(f"✅ Nettoyage terminé: {stats['offers_deleted']} offre(s) supprimée(s)")
+        logger.info(
+            f"✅ Nettoyage terminé: {len(stats['partitions_retired'])} partition(s) retirée(s), "
+            f"{stats['offers_deleted']} offre(s) supprimée(s), {stats['offers_retained']} conservée(s)"
+        )
         
         return stats
     
     try:
-        return asyncio.run(_run())
+        return run_async(_run())
     except Exception as e:
         logger.error(f"❌ Erreur task: {str(e)}")
         raise self.retry(exc=e)
@@ -291,7 +300,7 @@ def scrape_single_company(self, company_name: str, user_id: str = None) -> Dict[
             }
     
     try:
-        return asyncio.run(_run())
+        return run_async(_run())
     except Exception as e:
         logger.error(f"Erreur scraping {company_name}: {str(e)}")
         raise self.retry(exc=e)
@@ -428,7 +437,45 @@ def search_jobs_async(
             raise
     
     try:
-        return asyncio.run(_run())
+        return run_async(_run())
     except Exception as e:
         logger.error(f"❌ Erreur task search_jobs_async: {str(e)}")
         raise self.retry(exc=e)
+
+
+@celery_app.task(
+    bind=True,
+    name='app.tasks.scraping_tasks.refresh_remoteok_snapshot',
+    max_retries=1
+)
+def refresh_remoteok_snapshot(self) -> Dict[str, Any]:
+    """
+    Rafraîchit le snapshot partagé du flux RemoteOK (requête conditionnelle).
+    
+    Les recherches RemoteOK sont ensuite servies depuis ce snapshot (Redis +
+    mémoire) sans retélécharger le flux.
+    
+    Returns:
+        Dict avec changed (contenu modifié ou 304), nombre d'offres et âge
+    """
+    async def _run():
+        from app.services.scrapers.remoteok_snapshot import remoteok_snapshot
+        
+        # Reprendre l'ETag du dernier snapshot partagé pour la requête conditionnelle
+        await remoteok_snapshot._load_from_redis()
+        changed = await remoteok_snapshot.refresh()
+        
+        stats = {
+            "changed": changed,
+            "jobs": len(remoteok_snapshot.jobs),
+            "age_seconds": remoteok_snapshot.age_seconds,
+            "refreshed_at": datetime.now().isoformat()
+        }
+        logger.info(f"✅ Snapshot RemoteOK: {stats['jobs']} offres (modifié: {changed})")
+        return stats
+    
+    try:
+        return run_async(_run())
+    except Exception as e:
+        logger.error(f"❌ Erreur rafraîchissement snapshot RemoteOK: {str(e)}")
+        raise self.retry(exc=e, countdown=60)
@@ -1,74 +1,54 @@
 """
 Script pour générer les embeddings des profils et offres existants
 À exécuter après l'ajout de la colonne embedding
+
+Même traitement que la tâche Celery backfill_embeddings (file "embeddings") :
+lots de --batch-size lignes encodées en un appel puis écrites en un UPDATE
+groupé, avec checkpoint Redis (une exécution interrompue reprend au dernier lot).
+
+Usage:
+  python generate_embeddings.py
+  python generate_embeddings.py --table job_offers --batch-size 512 --no-test
 """
+import argparse
 import asyncio
+import time
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.database import engine
+from app.database import engine, AsyncSessionLocal
 from app.models.profile import Profile
 from app.models.job_offer import JobOffer
-from app.services.embedding_service import EmbeddingService
+from app.services.embedding_backfill import embedding_backfill
 
 
-async def generate_all_embeddings():
-    """Génère les embeddings pour tous les profils et offres existants"""
+async def generate_all_embeddings(tables, batch_size: int):
+    """Génère par lots les embeddings manquants des tables demandées"""
     
     print("=" * 70)
     print("🔄 GÉNÉRATION DES EMBEDDINGS POUR LES DONNÉES EXISTANTES")
     print("=" * 70)
     
-    async with engine.begin() as conn:
-        # Pour PostgreSQL avec asyncpg
-        from sqlalchemy.ext.asyncio import AsyncSession
-        session = AsyncSession(bind=conn, expire_on_commit=False)
-        
-        # 1. Profils
-        print("\n1️⃣ Génération des embeddings pour les profils...")
-        result = await session.execute(
-            select(Profile).where(Profile.embedding == None)
-        )
-        profiles = result.scalars().all()
-        
-        print(f"   Trouvé {len(profiles)} profils sans embedding")
-        
-        for i, profile in enumerate(profiles, 1):
-            try:
-                # Charger les relations
-                await session.refresh(profile, ['experiences', 'skills'])
-                
-                # Générer l'embedding
-                embedding = EmbeddingService.generate_profile_embedding(profile)
-                profile.embedding = embedding
-                
-                print(f"   ✅ [{i}/{len(profiles)}] Profil {profile.id} - {profile.title}")
-            except Exception as e:
-                print(f"   ❌ [{i}/{len(profiles)}] Erreur pour profil {profile.id}: {e}")
-        
-        await session.commit()
-        print(f"   ✅ {len(profiles)} profils mis à jour")
-        
-        # 2. Offres d'emploi
-        print("\n2️⃣ Génération des embeddings pour les offres...")
-        result = await session.execute(
-            select(JobOffer).where(JobOffer.embedding == None)
-        )
-        job_offers = result.scalars().all()
-        
-        print(f"   Trouvé {len(job_offers)} offres sans embedding")
-        
-        for i, job_offer in enumerate(job_offers, 1):
-            try:
-                # Générer l'embedding
-                embedding = EmbeddingService.generate_job_offer_embedding(job_offer)
-                job_offer.embedding = embedding
-                
-                print(f"   ✅ [{i}/{len(job_offers)}] Offre {job_offer.id} - {job_offer.job_title}")
-            except Exception as e:
-                print(f"   ❌ [{i}/{len(job_offers)}] Erreur pour offre {job_offer.id}: {e}")
-        
-        await session.commit()
-        print(f"   ✅ {len(job_offers)} offres mises à jour")
+    async with AsyncSessionLocal() as session:
+        backlog = await embedding_backfill.backlog(session)
+        
+        for i, table in enumerate(tables, 1):
+            print(f"\n{i}️⃣ Génération des embeddings: {table} ({backlog[table]} sans embedding)")
+            total = 0
+            start = time.perf_counter()
+            while True:
+                try:
+                    batch = await embedding_backfill.run_batch(session, table, batch_size)
+                except Exception as e:
+                    await session.rollback()
+                    print(f"   ❌ Erreur sur un lot ({e}), relancer le script pour reprendre")
+                    break
+                total += batch["processed"]
+                if batch["processed"]:
+                    rate = total / max(time.perf_counter() - start, 1e-6)
+                    print(f"   ✅ {total}/{backlog[table]} ({rate:.0f} lignes/s)")
+                if batch["done"]:
+                    break
+            print(f"   ✅ {total} ligne(s) mise(s) à jour")
     
     print("\n" + "=" * 70)
     print("✅ GÉNÉRATION TERMINÉE")
@@ -124,11 +104,23 @@ async def test_similarity_search():
     print("=" * 70)
 
 
-if __name__ == "__main__":
-    print("\n🚀 Démarrage...\n")
-    
+async def main(args):
     # Générer les embeddings
-    asyncio.run(generate_all_embeddings())
+    await generate_all_embeddings(args.tables, args.batch_size)
     
     # Tester la recherche
-    asyncio.run(test_similarity_search())
+    if not args.no_test:
+        await test_similarity_search()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill des embeddings manquants")
+    parser.add_argument("--table", dest="tables", action="append", choices=["profiles", "job_offers"],
+                        help="Table à traiter (répétable, défaut: profiles et job_offers)")
+    parser.add_argument("--batch-size", type=int, default=256, help="Lignes par lot")
+    parser.add_argument("--no-test", action="store_true", help="Ne pas lancer le test de similarité")
+    args = parser.parse_args()
+    args.tables = args.tables or ["profiles", "job_offers"]
+    
+    print("\n🚀 Démarrage...\n")
+    asyncio.run(main(args))
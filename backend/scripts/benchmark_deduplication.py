@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la déduplication d'offres : ancienne boucle O(n²) vs OfferDeduplicator
+Usage:
+  python scripts/benchmark_deduplication.py
+  python scripts/benchmark_deduplication.py --sizes 100 1000 10000 --legacy-max 1000
+  OR via Docker:
+  docker compose exec backend python scripts/benchmark_deduplication.py
+
+Les offres sont synthétiques (titres, entreprises, ~25% de quasi-doublons :
+fautes de frappe, casse, suffixes juridiques). Au-delà de --legacy-max offres,
+l'ancienne implémentation n'est pas exécutée (temps extrapolé en n²).
+"""
+
+import argparse
+import random
+import sys
+import os
+import time
+from difflib import SequenceMatcher
+from typing import Dict, List
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.services.offer_deduplicator import OfferDeduplicator
+
+
+TITLE_WORDS = [
+    "senior", "junior", "lead", "staff", "principal", "python", "java", "react",
+    "node.js", "data", "machine learning", "devops", "cloud", "backend", "frontend",
+    "fullstack", "mobile", "security", "platform", "developer", "engineer",
+    "scientist", "analyst", "architect", "manager", "consultant", "sre",
+]
+COMPANY_SUFFIXES = ["", " Inc", " SAS", " Ltd", " GmbH"]
+
+
+def legacy_deduplicate(offers: List[Dict], threshold: float = 0.9) -> List[Dict]:
+    """Copie de l'ancienne implémentation de SearchService.deduplicate_offers"""
+    seen_urls = set()
+    seen_signatures = set()
+    deduplicated = []
+    
+    for offer in offers:
+        url = offer.get("source_url", "")
+        if url and url in seen_urls:
+            continue
+        
+        title = offer.get("job_title", "").lower().strip()
+        company = offer.get("company_name", "").lower().strip()
+        signature = f"{title}|{company}"
+        
+        is_duplicate = False
+        for existing_sig in seen_signatures:
+            similarity = SequenceMatcher(None, signature, existing_sig).ratio()
+            if similarity >= threshold:
+                is_duplicate = True
+                break
+        
+        if not is_duplicate:
+            deduplicated.append(offer)
+            if url:
+                seen_urls.add(url)
+            seen_signatures.add(signature)
+    
+    return deduplicated
+
+
+def _typo(text: str, rng: random.Random) -> str:
+    """Introduit une petite variation (substitution, suppression ou casse)"""
+    if not text:
+        return text
+    chars = list(text)
+    i = rng.randrange(len(chars))
+    choice = rng.random()
+    if choice < 0.4:
+        chars[i] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    elif choice < 0.7:
+        del chars[i]
+    else:
+        return text.upper() if rng.random() < 0.5 else text.title()
+    return "".join(chars)
+
+
+def _base_company(name: str) -> str:
+    """Nom d'entreprise sans forme juridique ajoutée par le générateur"""
+    for suffix in COMPANY_SUFFIXES:
+        if suffix and name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def generate_offers(n: int, seed: int = 42) -> List[Dict]:
+    """Offres synthétiques avec ~25% de quasi-doublons et ~5% d'URL dupliquées"""
+    rng = random.Random(seed)
+    syllables = ["ka", "lo", "mi", "tra", "vex", "zen", "qua", "ri", "do", "sol", "bri", "nex"]
+    companies = [
+        "".join(rng.sample(syllables, 3)).capitalize() + " " + rng.choice(["Labs", "Tech", "Systems", "Group"])
+        for _ in range(max(10, n // 20))
+    ]
+    offers = []
+    for i in range(n):
+        if offers and rng.random() < 0.25:
+            base = rng.choice(offers)
+            offer = dict(base)
+            offer["job_title"] = _typo(base["job_title"], rng)
+            offer["company_name"] = _base_company(base["company_name"]) + rng.choice(COMPANY_SUFFIXES)
+            offer["source_url"] = base["source_url"] if rng.random() < 0.2 else f"https://example.com/jobs/{i}"
+        else:
+            offer = {
+                "job_title": " ".join(rng.sample(TITLE_WORDS, rng.randint(2, 4))).title(),
+                "company_name": rng.choice(companies),
+                "source_url": f"https://example.com/jobs/{i}",
+            }
+        offers.append(offer)
+    return offers
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(sizes: List[int], legacy_max: int):
+    print(f"{'offres':>8} | {'ancienne (s)':>13} | {'nouvelle (s)':>12} | {'gain':>8} | "
+          f"{'retenues anc.':>13} | {'retenues nouv.':>14} | {'comparaisons':>12}")
+    print("-" * 100)
+    legacy_reference = None  # (n, durée) pour extrapoler
+    
+    for n in sizes:
+        offers = generate_offers(n)
+        
+        deduplicator = OfferDeduplicator(threshold=0.9)
+        new_result, new_time = _timed(deduplicator.deduplicate, offers)
+        
+        if n <= legacy_max:
+            legacy_result, legacy_time = _timed(legacy_deduplicate, offers)
+            legacy_reference = (n, legacy_time)
+            legacy_label = f"{legacy_time:13.3f}"
+            legacy_kept = str(len(legacy_result))
+        elif legacy_reference:
+            ref_n, ref_time = legacy_reference
+            legacy_time = ref_time * (n / ref_n) ** 2
+            legacy_label = f"~{legacy_time:12.1f}"
+            legacy_kept = "n/a"
+        else:
+            legacy_time = None
+            legacy_label = f"{'n/a':>13}"
+            legacy_kept = "n/a"
+        
+        speedup = f"x{legacy_time / new_time:7.1f}" if legacy_time and new_time else f"{'n/a':>8}"
+        print(f"{n:>8} | {legacy_label} | {new_time:12.3f} | {speedup} | "
+              f"{legacy_kept:>13} | {len(new_result):>14} | {deduplicator.last_stats['comparisons']:>12}")
+    
+    print()
+    print("Note : l'ancienne boucle compare toutes les entreprises entre elles ; la nouvelle")
+    print("ne compare que les offres d'une même entreprise normalisée (blocking), d'où de")
+    print("légers écarts possibles sur le nombre d'offres retenues.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark déduplication d'offres")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Tailles de lots à mesurer")
+    parser.add_argument("--legacy-max", type=int, default=1000,
+                        help="Taille max pour exécuter l'ancienne implémentation (O(n²))")
+    args = parser.parse_args()
+    
+    run(args.sizes, args.legacy_max)
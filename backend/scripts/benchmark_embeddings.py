@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark des backends d'embeddings : torch vs onnx (fp32) vs onnx-int8
+Usage:
+  python scripts/benchmark_embeddings.py
+  python scripts/benchmark_embeddings.py --backends torch onnx-int8 --requests 500 --threads 2
+  OR via Docker:
+  docker compose exec backend python scripts/benchmark_embeddings.py
+
+Chaque backend est mesuré dans un sous-processus séparé (RSS non pollué par
+les autres modèles) :
+- chargement du modèle (s) et RSS après chargement (Mo)
+- latence d'un texte seul (p50 / p99, ms) : chemin d'une requête API
+- débit en batch (textes/s) : chemin des backfills
+Les onnx* nécessitent scripts/export_onnx_model.py au préalable.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+
+TEXTS = [
+    "Développeur Python Senior - FastAPI, PostgreSQL, Docker, Kubernetes - CDI Paris, télétravail partiel",
+    "Data Scientist: machine learning, pandas, scikit-learn, SQL. Expérience 3 ans minimum.",
+    "Frontend engineer React / TypeScript, design systems, accessibility, fully remote",
+    "Ingénieur DevOps AWS Terraform CI/CD GitLab, astreintes, Lyon",
+    "Backend engineer Go gRPC Kafka, payment infrastructure, high throughput systems",
+]
+
+
+def _rss_mb() -> float:
+    # ru_maxrss est en Ko sous Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_child(backend: str, requests: int, batch_size: int, batches: int):
+    """Mesures d'un backend (exécuté dans un sous-processus)"""
+    from app.config import settings
+    from app.services.embedding_backends import load_backend
+    from app.services.embedding_service import EmbeddingService
+    
+    name = "onnx" if backend.startswith("onnx") else backend
+    settings.EMBEDDING_ONNX_QUANTIZED = backend == "onnx-int8"
+    
+    start = time.perf_counter()
+    model = load_backend(EmbeddingService.MODEL_NAME, name)
+    model.encode(TEXTS[:1])  # warm-up
+    load_seconds = time.perf_counter() - start
+    rss_loaded = _rss_mb()
+    
+    latencies = []
+    for i in range(requests):
+        text = f"{TEXTS[i % len(TEXTS)]} #{i}"
+        t0 = time.perf_counter()
+        model.encode([text])
+        latencies.append((time.perf_counter() - t0) * 1000)
+    
+    batch = [f"{TEXTS[i % len(TEXTS)]} #{i}" for i in range(batch_size)]
+    t0 = time.perf_counter()
+    for _ in range(batches):
+        model.encode(batch)
+    throughput = batch_size * batches / (time.perf_counter() - t0)
+    
+    print(json.dumps({
+        "backend": backend,
+        "load_s": load_seconds,
+        "rss_mb": rss_loaded,
+        "peak_rss_mb": _rss_mb(),
+        "p50_ms": _percentile(latencies, 50),
+        "p99_ms": _percentile(latencies, 99),
+        "throughput": throughput,
+    }))
+
+
+def run(backends, requests: int, batch_size: int, batches: int, threads: int):
+    env = dict(os.environ)
+    if threads:
+        env["EMBEDDING_NUM_THREADS"] = str(threads)
+    
+    print(f"{'backend':>10} | {'chargement (s)':>14} | {'RSS (Mo)':>9} | {'pic RSS (Mo)':>12} | "
+          f"{'p50 (ms)':>9} | {'p99 (ms)':>9} | {'débit (textes/s)':>16}")
+    print("-" * 100)
+    for backend in backends:
+        command = [
+            sys.executable, __file__, "--child", backend,
+            "--requests", str(requests), "--batch-size", str(batch_size), "--batches", str(batches),
+        ]
+        completed = subprocess.run(command, capture_output=True, text=True, env=env)
+        if completed.returncode != 0:
+            error = (completed.stderr.strip().splitlines() or ["erreur inconnue"])[-1]
+            print(f"{backend:>10} | ❌ {error}")
+            continue
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        print(f"{backend:>10} | {result['load_s']:14.2f} | {result['rss_mb']:9.0f} | "
+              f"{result['peak_rss_mb']:12.0f} | {result['p50_ms']:9.1f} | {result['p99_ms']:9.1f} | "
+              f"{result['throughput']:16.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark des backends d'embeddings")
+    parser.add_argument("--backends", nargs="+", default=["torch", "onnx", "onnx-int8"],
+                        choices=["torch", "onnx", "onnx-int8"], help="Backends à mesurer")
+    parser.add_argument("--requests", type=int, default=200, help="Requêtes unitaires (latence)")
+    parser.add_argument("--batch-size", type=int, default=32, help="Taille des batches (débit)")
+    parser.add_argument("--batches", type=int, default=20, help="Nombre de batches (débit)")
+    parser.add_argument("--threads", type=int, default=0,
+                        help="EMBEDDING_NUM_THREADS pour tous les backends (0 = défaut)")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.child:
+        run_child(args.child, args.requests, args.batch_size, args.batches)
+    else:
+        run(args.backends, args.requests, args.batch_size, args.batches, args.threads)
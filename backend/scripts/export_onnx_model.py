@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Export du modèle d'embeddings en ONNX (+ quantification int8) pour EMBEDDING_BACKEND=onnx
+Usage:
+  python scripts/export_onnx_model.py
+  python scripts/export_onnx_model.py --output /app/storage/models/all-MiniLM-L6-v2-onnx --no-quantize
+  OR via Docker:
+  docker compose exec backend python scripts/export_onnx_model.py
+
+Produit dans le dossier de sortie :
+- model.onnx       : graphe fp32 (sortie = états cachés des tokens)
+- model_int8.onnx  : quantification dynamique int8 des poids (MatMul/Gemm)
+- tokenizer.json + fichiers du tokenizer
+
+Puis vérifie la fidélité : similarité cosinus entre les vecteurs PyTorch
+(SentenceTransformer) et ceux de chaque graphe ONNX, sur des textes d'offres
+et de profils représentatifs. L'export échoue si la similarité minimale est
+sous --min-similarity.
+"""
+
+import argparse
+import sys
+import os
+
+import numpy as np
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.config import settings
+from app.services.embedding_service import EmbeddingService
+
+
+SAMPLE_TEXTS = [
+    "Poste: Développeur Python Senior Entreprise: Acme Description: API REST FastAPI, PostgreSQL, Docker",
+    "Poste: Data Scientist Entreprise: DataCorp Technologies: python, pandas, scikit-learn, machine learning",
+    "Profil: Ingénieur DevOps Kubernetes, Terraform, AWS, CI/CD GitLab. Compétences: docker, ansible",
+    "Frontend engineer React / TypeScript, design systems, accessibility, remote-friendly team",
+    "Stage - Assistant chef de projet marketing digital, SEO, Google Analytics, Paris",
+    "Senior backend engineer (Go, gRPC, Kafka) building payment infrastructure at scale",
+    "Infirmier(ère) diplômé(e) d'État - CDI - horaires de jour - Lyon",
+    "c++ c# node.js .NET embedded systems firmware RTOS",
+]
+
+
+def export(model_name: str, output_dir: str, opset: int):
+    """Exporte le transformer (sans pooling) en ONNX avec axes dynamiques"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    
+    os.makedirs(output_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    model.eval()
+    
+    dummy = tokenizer(["export onnx"], return_tensors="pt")
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    
+    model_path = os.path.join(output_dir, "model.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (dummy["input_ids"], dummy["attention_mask"], dummy["token_type_ids"]),
+            model_path,
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset,
+        )
+    tokenizer.save_pretrained(output_dir)
+    print(f"✅ Graphe fp32 exporté: {model_path}")
+    return model_path
+
+
+def quantize(model_path: str) -> str:
+    """Quantification dynamique int8 (poids int8, activations quantifiées à la volée)"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    
+    quantized_path = os.path.join(os.path.dirname(model_path), "model_int8.onnx")
+    quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+    print(f"✅ Graphe int8 exporté: {quantized_path}")
+    return quantized_path
+
+
+def check_fidelity(model_name: str, min_similarity: float, quantized: bool) -> bool:
+    """Compare les vecteurs ONNX aux vecteurs PyTorch (similarité cosinus par texte)"""
+    from app.services.embedding_backends import load_backend
+    
+    reference = load_backend(model_name, "torch").encode(SAMPLE_TEXTS)
+    reference = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    
+    variants = [False, True] if quantized else [False]
+    ok = True
+    for variant in variants:
+        settings.EMBEDDING_ONNX_QUANTIZED = variant
+        vectors = load_backend(model_name, "onnx").encode(SAMPLE_TEXTS)
+        similarities = np.sum(reference * vectors, axis=1)
+        label = "onnx-int8" if variant else "onnx"
+        status = "✅" if similarities.min() >= min_similarity else "❌"
+        print(f"{status} {label:10} cosinus vs torch: min={similarities.min():.4f} "
+              f"moyenne={similarities.mean():.4f}")
+        ok = ok and similarities.min() >= min_similarity
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export ONNX du modèle d'embeddings")
+    parser.add_argument("--model", default=EmbeddingService.MODEL_NAME, help="Modèle Hugging Face")
+    parser.add_argument("--output", default=settings.EMBEDDING_ONNX_DIR, help="Dossier de sortie")
+    parser.add_argument("--opset", type=int, default=14, help="Version d'opset ONNX")
+    parser.add_argument("--no-quantize", action="store_true", help="Ne pas produire le graphe int8")
+    parser.add_argument("--min-similarity", type=float, default=0.98,
+                        help="Similarité cosinus minimale exigée vs PyTorch")
+    args = parser.parse_args()
+    
+    settings.EMBEDDING_ONNX_DIR = args.output
+    model_path = export(args.model, args.output, args.opset)
+    if not args.no_quantize:
+        quantize(model_path)
+    
+    if not check_fidelity(args.model, args.min_similarity, quantized=not args.no_quantize):
+        print(f"❌ Fidélité insuffisante (< {args.min_similarity}), ne pas activer EMBEDDING_BACKEND=onnx")
+        sys.exit(1)
+    print("✅ Fidélité vérifiée : EMBEDDING_BACKEND=onnx utilisable")
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Mesure du rappel et de la latence des index vectoriels : float32 vs halfvec vs binaire
+Usage:
+  python scripts/measure_vector_recall.py
+  python scripts/measure_vector_recall.py --modes float half binary --queries 100 --k 20 --rerank-factor 8
+  OR via Docker:
+  docker compose exec backend python scripts/measure_vector_recall.py
+
+Pour chaque mode (VECTOR_SEARCH_MODE), sur des vecteurs de requête réels
+(embeddings de profils, complétés par des embeddings d'offres) :
+- recall@K par rapport à la recherche exacte (parcours complet, sans index)
+- latence p50 / p99 de la requête (ms)
+- taille de l'index HNSW correspondant (Mo)
+À lancer avant de changer VECTOR_SEARCH_MODE en production.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+from sqlalchemy import func, select, text
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models.job_offer import JobOffer
+from app.models.profile import Profile
+from app.services.analysis_service import AnalysisService
+
+
+INDEXES = {
+    "float": "job_offer_embedding_idx",
+    "half": "job_offer_embedding_half_idx",
+    "binary": "job_offer_embedding_bit_idx",
+}
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def _query_vectors(session, count: int):
+    """Embeddings de profils, complétés par des offres tirées au hasard"""
+    result = await session.execute(
+        select(Profile.embedding).where(Profile.embedding.isnot(None)).limit(count)
+    )
+    vectors = [row[0] for row in result.all()]
+    if len(vectors) < count:
+        result = await session.execute(
+            select(JobOffer.embedding)
+            .where(JobOffer.embedding.isnot(None))
+            .order_by(func.random())
+            .limit(count - len(vectors))
+        )
+        vectors.extend(row[0] for row in result.all())
+    return vectors
+
+
+async def _index_size_mb(session, index_name: str):
+    result = await session.execute(
+        text("SELECT pg_relation_size(to_regclass(:name))"), {"name": index_name}
+    )
+    size = result.scalar()
+    return size / (1024 * 1024) if size is not None else None
+
+
+async def run(modes, queries: int, k: int):
+    filters = [JobOffer.embedding.isnot(None)]
+    
+    async with AsyncSessionLocal() as session:
+        vectors = await _query_vectors(session, queries)
+        if not vectors:
+            print("❌ Aucun embedding en base (lancer generate_embeddings.py)")
+            return
+        
+        # Vérité terrain : recherche exacte
+        truth = []
+        for vector in vectors:
+            result = await session.execute(AnalysisService.exact_query(vector, filters, k))
+            truth.append({row[0] for row in result.all()})
+        await session.rollback()
+        
+        print(f"{len(vectors)} requêtes, K={k}, re-classement x{settings.VECTOR_RERANK_FACTOR}")
+        print(f"{'mode':>7} | {'recall@K':>9} | {'p50 (ms)':>9} | {'p99 (ms)':>9} | {'index (Mo)':>10}")
+        print("-" * 60)
+        for mode in modes:
+            size = await _index_size_mb(session, INDEXES[mode])
+            fetch = k if mode == "float" else k * settings.VECTOR_RERANK_FACTOR
+            ef_search = AnalysisService._ef_search(fetch, filtered=False)
+            
+            recalls, latencies = [], []
+            try:
+                for vector, expected in zip(vectors, truth):
+                    await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+                    t0 = time.perf_counter()
+                    result = await session.execute(AnalysisService.ann_query(vector, filters, k, mode))
+                    found = {row[0] for row in result.all()}
+                    latencies.append((time.perf_counter() - t0) * 1000)
+                    recalls.append(len(found & expected) / max(1, len(expected)))
+                    await session.rollback()
+            except Exception as e:
+                await session.rollback()
+                print(f"{mode:>7} | ❌ {e.__class__.__name__}: {str(e).splitlines()[0]}")
+                continue
+            
+            size_label = f"{size:10.1f}" if size is not None else f"{'absent':>10}"
+            print(f"{mode:>7} | {sum(recalls) / len(recalls):9.3f} | {_percentile(latencies, 50):9.1f} | "
+                  f"{_percentile(latencies, 99):9.1f} | {size_label}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rappel / latence des index vectoriels")
+    parser.add_argument("--modes", nargs="+", default=["float", "half", "binary"],
+                        choices=list(INDEXES), help="Modes à mesurer")
+    parser.add_argument("--queries", type=int, default=50, help="Nombre de vecteurs de requête")
+    parser.add_argument("--k", type=int, default=10, help="Taille du top-K")
+    parser.add_argument("--rerank-factor", type=int, default=None,
+                        help="VECTOR_RERANK_FACTOR pour les modes quantifiés (défaut: configuration)")
+    args = parser.parse_args()
+    
+    if args.rerank_factor:
+        settings.VECTOR_RERANK_FACTOR = args.rerank_factor
+    asyncio.run(run(args.modes, args.queries, args.k))
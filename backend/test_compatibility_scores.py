@@ -0,0 +1,72 @@
+"""
+Test de cohérence des scores de compatibilité
+
+Le score d'une offre calculé seul (AnalysisService.compatibility_details,
+utilisé par calculate_compatibility_score) doit être identique à celui du
+calcul groupé du feed (score_offers_batch), y compris pour une offre dont les
+mots-clés sont répétés. Embeddings fournis : le modèle n'est pas chargé.
+
+Usage:
+  python test_compatibility_scores.py
+  OR via Docker:
+  docker compose exec backend python test_compatibility_scores.py
+"""
+import asyncio
+import sys
+from types import SimpleNamespace
+
+from app.services.analysis_service import AnalysisService
+
+
+def _profile():
+    return SimpleNamespace(
+        title="Développeur Python",
+        summary="Backend et data",
+        embedding=[0.1, 0.3, -0.2, 0.5],
+        skills=[SimpleNamespace(name="Python"), SimpleNamespace(name="Docker"), SimpleNamespace(name="SQL")],
+    )
+
+
+def _offer(keywords):
+    return SimpleNamespace(
+        job_title="Développeur Backend",
+        company_name="Acme",
+        description="API Python",
+        embedding=[0.2, 0.1, -0.1, 0.4],
+        extracted_keywords=keywords,
+    )
+
+
+def test_single_and_batch_scores_match():
+    """Mots-clés répétés (et de casse différente) : même score seul et en lot"""
+    keywords = ["Python", "python", "PYTHON", "Kubernetes", "Docker", "docker", "Go"]
+    offer = _offer(keywords)
+    
+    batch_score = asyncio.run(AnalysisService.score_offers_batch(_profile(), [offer]))[0]
+    details = asyncio.run(AnalysisService.compatibility_details(_profile(), offer))
+    
+    assert batch_score == details["score"], f"lot {batch_score} != seul {details['score']}"
+    assert details["total_job_keywords"] == 4  # python, kubernetes, docker, go
+    assert details["skills_match_ratio"] == 0.5
+    print(f"✅ Score identique seul et en lot ({batch_score})")
+
+
+def test_offer_without_keywords():
+    """Offre sans mots-clés : seul le score sémantique compte, identique dans les deux calculs"""
+    offer = _offer([])
+    
+    batch_score = asyncio.run(AnalysisService.score_offers_batch(_profile(), [offer]))[0]
+    details = asyncio.run(AnalysisService.compatibility_details(_profile(), offer))
+    
+    assert batch_score == details["score"]
+    assert details["score_breakdown"]["skills_match"] == 0
+    print(f"✅ Offre sans mots-clés : score identique ({batch_score})")
+
+
+if __name__ == "__main__":
+    try:
+        test_single_and_batch_scores_match()
+        test_offer_without_keywords()
+    except AssertionError as e:
+        print(f"❌ Test échoué: {e}")
+        sys.exit(1)
@@ -0,0 +1,92 @@
+"""
+Test des curseurs de pagination (app.core.pagination)
+
+Un curseur dont une valeur n'a pas le type de sa clé de tri (texte à la place
+d'une date ou d'un UUID) doit lever InvalidCursor (→ 400) dès le décodage, au
+lieu d'échouer dans asyncpg (→ 500). Aucune base de données nécessaire.
+
+Usage:
+  python test_pagination.py
+  OR via Docker:
+  docker compose exec backend python test_pagination.py
+"""
+import base64
+import json
+import sys
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_paginate
+from app.models.job_offer import JobOffer
+from app.services.job_offer_service import JobOfferService
+
+SORT_KEYS = (JobOffer.created_at, JobOffer.id)
+
+
+def _forge(items) -> str:
+    payload = json.dumps(items, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _rejected(cursor: str, sort_keys=SORT_KEYS) -> bool:
+    try:
+        keyset_paginate(select(JobOffer.id), sort_keys, cursor, 20)
+    except InvalidCursor:
+        return True
+    return False
+
+
+def test_valid_cursor_round_trip():
+    """Un curseur produit par encode_cursor est relu à l'identique"""
+    values = [datetime(2026, 1, 15, 9, 30, tzinfo=timezone.utc), uuid.uuid4()]
+    decoded = decode_cursor(encode_cursor(values), [datetime, uuid.UUID])
+    
+    assert decoded == values
+    assert not _rejected(encode_cursor(values))
+    print("✅ Curseur valide relu à l'identique")
+
+
+def test_type_confused_cursor_is_rejected():
+    """Texte ou nombre à la place d'une date / d'un UUID : InvalidCursor"""
+    offer_id = str(uuid.uuid4())
+    
+    assert _rejected(_forge([["raw", "2026-01-15"], ["uuid", offer_id]]))
+    assert _rejected(_forge([["dt", "2026-01-15T09:30:00+00:00"], ["raw", offer_id]]))
+    assert _rejected(_forge([["raw", 42], ["raw", True]]))
+    assert _rejected(_forge([["uuid", offer_id], ["dt", "2026-01-15T09:30:00+00:00"]]))
+    print("✅ Curseur de type incohérent rejeté (InvalidCursor)")
+
+
+def test_rank_cursor_is_checked():
+    """Recherche plein texte : le score ts_rank du curseur doit être numérique"""
+    _, rank = JobOfferService.full_text_filter("python")
+    sort_keys = (rank, JobOffer.created_at, JobOffer.id)
+    created_at = ["dt", "2026-01-15T09:30:00+00:00"]
+    offer_id = ["uuid", str(uuid.uuid4())]
+    
+    assert not _rejected(_forge([["raw", 0.25], created_at, offer_id]), sort_keys)
+    assert not _rejected(_forge([["raw", 0], created_at, offer_id]), sort_keys)
+    assert _rejected(_forge([["raw", "0.25"], created_at, offer_id]), sort_keys)
+    assert _rejected(_forge([["raw", [1]], created_at, offer_id]), sort_keys)
+    print("✅ Score ts_rank du curseur vérifié")
+
+
+def test_malformed_cursor_is_rejected():
+    """Jeton tronqué ou de mauvaise longueur : InvalidCursor"""
+    assert _rejected("not-base64!")
+    assert _rejected(_forge([["uuid", str(uuid.uuid4())]]))
+    assert _rejected(_forge([["dt", "hier"], ["uuid", "x"]]))
+    print("✅ Curseur illisible rejeté (InvalidCursor)")
+
+
+if __name__ == "__main__":
+    try:
+        test_valid_cursor_round_trip()
+        test_type_confused_cursor_is_rejected()
+        test_rank_cursor_is_checked()
+        test_malformed_cursor_is_rejected()
+    except AssertionError as e:
+        print(f"❌ Test échoué: {e}")
+        sys.exit(1)
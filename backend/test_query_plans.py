@@ -0,0 +1,171 @@
+"""
+Test de non-régression des plans d'exécution des requêtes chaudes
+
+Insère un jeu de données (utilisateur + offres) dans une transaction annulée
+à la fin, met à jour les statistiques (ANALYZE) puis vérifie par EXPLAIN que
+chaque requête chaude passe par son index au lieu d'un parcours séquentiel
+de job_offers.
+
+job_offers étant partitionnée, les index des plans sont ceux des partitions
+(rattachés à l'index de job_offers attendu) ; les requêtes de feed et de
+veille entreprise ne doivent pas lire job_offers_default.
+
+Usage:
+  python test_query_plans.py
+  python test_query_plans.py --offers 50000
+  OR via Docker:
+  docker compose exec backend python test_query_plans.py
+
+Code de sortie 1 si un plan a régressé (utilisable en CI).
+"""
+import argparse
+import asyncio
+import hashlib
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import desc, select, text
+
+from app.core.fuzzy_match import fuzzy_match
+from app.core.pagination import keyset_paginate
+from app.core.query_plan import explain, plan_nodes
+from app.database import AsyncSessionLocal
+from app.models.job_offer import JobOffer
+
+
+async def seed(session, user_id: uuid.UUID, offers: int):
+    """Utilisateur + offres réparties sur 31 jours (nettoyage quotidien), 500 entreprises, 10 villes"""
+    await session.execute(
+        text(
+            "INSERT INTO users (id, email, hashed_password, role, is_active) "
+            "VALUES (:id, :email, 'x', 'user', true)"
+        ),
+        {"id": user_id, "email": f"plans-{user_id}@test.local"}
+    )
+    await session.execute(
+        text("""
+            INSERT INTO job_offers (
+                id, user_id, source_url, source_platform, company_name, job_title,
+                location, description, scraped_at, created_at
+            )
+            SELECT
+                gen_random_uuid(), :user_id,
+                'https://jobs.test.local/offer/' || i, 'test',
+                'Entreprise ' || substr(md5((i % 500)::text), 1, 12), 'Développeur Python ' || i,
+                (ARRAY['Paris', 'Lyon', 'Marseille', 'Toulouse', 'Nantes',
+                       'Lille', 'Bordeaux', 'Rennes', 'Nice', 'Remote'])[1 + i % 10],
+                'Offre de test ' || i,
+                now() - random() * interval '31 days',
+                now() - random() * interval '31 days'
+            FROM generate_series(1, :offers) AS i
+        """),
+        {"user_id": user_id, "offers": offers}
+    )
+    await session.execute(text("ANALYZE job_offers"))
+
+
+async def partition_indexes(session) -> dict:
+    """Index de partition -> index de job_offers dont il dépend"""
+    result = await session.execute(text("""
+        SELECT child.relname, parent.relname FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        WHERE child.relkind = 'i'
+    """))
+    return dict(result.all())
+
+
+def hot_queries(user_id: uuid.UUID):
+    """(nom, requête, index acceptés, partition par défaut exclue) des requêtes chaudes de l'application"""
+    now = datetime.now(timezone.utc)
+    company = f"Entreprise {hashlib.md5(b'42').hexdigest()[:12]}"
+    return [
+        (
+            "Dédoublonnage par URL (ingestion)",
+            select(JobOffer.id).where(JobOffer.source_url == "https://jobs.test.local/offer/42"),
+            {"ix_job_offers_source_url"},
+            False,
+        ),
+        (
+            "Feed : offres récentes (get_feed)",
+            select(JobOffer.id)
+            .where(JobOffer.scraped_at >= now - timedelta(days=7), JobOffer.scraped_at <= now)
+            .order_by(desc(JobOffer.scraped_at))
+            .limit(200),
+            {"ix_job_offers_scraped_at"},
+            True,
+        ),
+        (
+            "Veille entreprise (get_company_offers)",
+            select(JobOffer.id)
+            .where(
+                fuzzy_match(JobOffer.company_name, company),
+                JobOffer.scraped_at.between(now - timedelta(days=30), now)
+            )
+            .order_by(desc(JobOffer.scraped_at))
+            .limit(50),
+            {"ix_job_offers_company_name_trgm", "ix_job_offers_scraped_at"},
+            True,
+        ),
+        (
+            "Liste des offres d'un utilisateur (get_user_job_offers)",
+            keyset_paginate(
+                select(JobOffer.id).where(JobOffer.user_id == user_id),
+                (JobOffer.created_at, JobOffer.id), None, 20
+            ),
+            {"ix_job_offers_user_created_id"},
+            False,
+        ),
+    ]
+
+
+async def test_query_plans(offers: int) -> bool:
+    print("=" * 70)
+    print("🧪 PLANS D'EXÉCUTION DES REQUÊTES CHAUDES")
+    print("=" * 70)
+    
+    user_id = uuid.uuid4()
+    ok = True
+    async with AsyncSessionLocal() as session:
+        try:
+            print(f"\n🌱 Jeu de données: {offers} offres (transaction annulée à la fin)")
+            await seed(session, user_id, offers)
+            
+            parents = await partition_indexes(session)
+            
+            for name, query, expected, prunes_default in hot_queries(user_id):
+                plan = await explain(session, query)
+                nodes = list(plan_nodes(plan))
+                used = {parents.get(node["Index Name"], node["Index Name"]) for node in nodes if "Index Name" in node}
+                relations = {node["Relation Name"] for node in nodes if "Relation Name" in node}
+                seq_scans = [
+                    node["Relation Name"] for node in nodes
+                    if node["Node Type"] == "Seq Scan" and node["Relation Name"].startswith("job_offers")
+                ]
+                default_read = prunes_default and "job_offers_default" in relations
+                
+                if used & expected and not seq_scans and not default_read:
+                    print(f"✅ {name}: {', '.join(sorted(used & expected))}")
+                else:
+                    ok = False
+                    print(f"❌ {name}: index attendu {' ou '.join(sorted(expected))}")
+                    print(f"   index utilisés: {', '.join(sorted(used)) or 'aucun'}, "
+                          f"parcours séquentiels: {', '.join(seq_scans) or 'aucun'}")
+                    if default_read:
+                        print("   job_offers_default lue (élagage des partitions inactif)")
+        finally:
+            await session.rollback()
+    
+    print("\n" + "=" * 70)
+    print("✅ TOUS LES PLANS UTILISENT LEURS INDEX" if ok else "❌ RÉGRESSION DE PLAN DÉTECTÉE")
+    print("=" * 70)
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Vérifie les plans des requêtes chaudes")
+    parser.add_argument("--offers", type=int, default=20000, help="Nombre d'offres insérées")
+    args = parser.parse_args()
+    
+    sys.exit(0 if asyncio.run(test_query_plans(args.offers)) else 1)
@@ -0,0 +1,63 @@
+"""
+Test des sources en erreur lors d'un scraping multi-sources
+
+Une source dont le scraper lève une exception doit apparaître dans
+ScrapeResults.failed (résultat partiel) au lieu d'une liste vide silencieuse.
+Aucun accès réseau : les sources sont simulées.
+
+Usage:
+  python test_scrape_failures.py
+  OR via Docker:
+  docker compose exec backend python test_scrape_failures.py
+"""
+import asyncio
+import sys
+
+from app.services.scraping_service import ScrapingService
+
+
+async def _ok():
+    return [{"title": "Développeur Python", "company": "Acme", "url": "https://jobs.test.local/1"}]
+
+
+async def _failing():
+    raise RuntimeError("API status 429")
+
+
+def test_failing_source_is_reported():
+    """Une source qui lève est marquée en erreur, les autres sources sont conservées"""
+    results = asyncio.run(ScrapingService()._scrape_concurrently(
+        [("ok", _ok), ("broken", _failing)],
+        max_concurrency=2,
+        source_timeout=5,
+        total_timeout=10
+    ))
+    
+    assert list(results.keys()) == ["ok", "broken"]
+    assert len(results["ok"]) == 1
+    assert results["broken"] == []
+    assert "broken" in results.failed and "429" in results.failed["broken"]
+    assert "ok" not in results.failed
+    assert results.timed_out == []
+    assert results.is_partial
+    print("✅ Source en erreur signalée dans failed, résultat partiel")
+
+
+def test_complete_scrape_is_not_partial():
+    """Sans erreur ni dépassement de délai, le résultat est complet"""
+    results = asyncio.run(ScrapingService()._scrape_concurrently(
+        [("ok", _ok)], max_concurrency=1, source_timeout=5, total_timeout=10
+    ))
+    
+    assert results.failed == {}
+    assert not results.is_partial
+    print("✅ Scraping complet : aucune source en erreur")
+
+
+if __name__ == "__main__":
+    try:
+        test_failing_source_is_reported()
+        test_complete_scrape_is_not_partial()
+    except AssertionError as e:
+        print(f"❌ Test échoué: {e}")
+        sys.exit(1)
@@ -0,0 +1,98 @@
+"""
+Test du cache partagé des recherches (SearchService.search_with_scraping)
+
+Une source en erreur pendant le scraping ne doit pas être écrite dans le cache
+partagé : sa liste vide masquerait la source à tous les utilisateurs pendant
+toute la durée du cache. Préférences, scraping, cache et sauvegarde en DB sont
+simulés : aucun accès réseau ni base de données.
+
+Usage:
+  python test_search_cache.py
+  OR via Docker:
+  docker compose exec backend python test_search_cache.py
+"""
+import asyncio
+import sys
+from types import SimpleNamespace
+
+from app.services.scraping_service import ScrapeResults
+from app.services.search_service import SearchService
+
+
+class FakeCache:
+    """Cache vide qui enregistre les appels à save_sources"""
+    
+    def __init__(self):
+        self.saved = []
+    
+    def generate_cache_key(self, keywords, location, source, limit_per_source):
+        return f"{keywords}|{location}|{source}|{limit_per_source}"
+    
+    async def get_many(self, db, cache_keys, max_age=None):
+        return {}
+    
+    async def save_sources(self, db, keywords, location, limit_per_source, results, execution_time_seconds, ttl_hours):
+        self.saved.append(results)
+
+
+def _search_service(raw_results: ScrapeResults) -> SearchService:
+    service = SearchService()
+    service.cache_service = FakeCache()
+    
+    async def _preferences(db, user_id):
+        return SimpleNamespace(
+            enabled_sources=["remoteok", "adzuna"], priority_sources=[], use_cache=True, cache_ttl_hours=24
+        )
+    
+    async def _scrape(sources, keywords, location, limit_per_source):
+        return raw_results
+    
+    async def _save(db, offers, user_id=None):
+        return {"inserted": 0, "skipped": len(offers)}
+    
+    service._get_user_preferences = _preferences
+    service._scrape_single_flight = _scrape
+    service._save_offers_to_db = _save
+    return service
+
+
+def test_failing_source_is_not_cached():
+    """Seules les sources qui ont répondu sont passées à save_sources"""
+    raw_results = ScrapeResults({
+        "remoteok": [{"title": "Développeur Python", "company": "Acme", "url": "https://jobs.test.local/1"}],
+        "adzuna": [],
+    })
+    raw_results.failed["adzuna"] = "RateLimitExceeded: adzuna"
+    service = _search_service(raw_results)
+    
+    response = asyncio.run(service.search_with_scraping(db=None, keywords="python", user_id="user-1"))
+    
+    assert len(service.cache_service.saved) == 1
+    saved = service.cache_service.saved[0]
+    assert "remoteok" in saved and len(saved["remoteok"]) == 1
+    assert "adzuna" not in saved
+    assert response["failed_sources"] == ["adzuna"]
+    print("✅ Source en erreur non écrite dans le cache partagé")
+
+
+def test_timed_out_source_is_not_cached():
+    """Une source hors délai n'est pas non plus mise en cache"""
+    raw_results = ScrapeResults({"remoteok": [], "adzuna": []})
+    raw_results.timed_out.append("remoteok")
+    service = _search_service(raw_results)
+    
+    asyncio.run(service.search_with_scraping(db=None, keywords="python", user_id="user-1"))
+    
+    saved = service.cache_service.saved[0]
+    assert "remoteok" not in saved
+    assert saved["adzuna"] == []  # a répondu sans offre : résultat valide, mis en cache
+    print("✅ Source hors délai non écrite dans le cache partagé")
+
+
+if __name__ == "__main__":
+    try:
+        test_failing_source_is_not_cached()
+        test_timed_out_source_is_not_cached()
+    except AssertionError as e:
+        print(f"❌ Test échoué: {e}")
+        sys.exit(1)
@@ -7,6 +7,9 @@ CREATE EXTENSION IF NOT EXISTS vector;
 -- Créer l'extension pour UUID
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 
+-- Index trigrammes (filtres entreprise / lieu)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Message de confirmation
 DO $$
 BEGIN